@@ -20,7 +20,7 @@ def is_number(n):
     return re.match(r'\s*[0-9]+', n) is not None
 
 def is_ts(n):
-    return re.match(r'\s*[0-9.]+', n) is not None or n == "SUMMARY"
+    return re.match(r'\s*[0-9.]+', n) is not None or n.startswith("SUMMARY")
 
 def is_unit(n):
     return re.match(r'(% )?[a-zA-Z]*( <)?', n) is not None
@@ -81,30 +81,133 @@ def check_format(fmt, row):
         return r
     return False
 
-fmt_cache = formats[0]
-
-def parse_csv_row(row, error_exit=False):
-    if len(row) == 0:
-        return None
-    global fmt_cache
-    r = check_format(fmt_cache, row)
-    if r:
+def format_index(fmt):
+    """Return the index of each Row field in a row in format fmt, or None."""
+    ind = [None] * 7
+    for i, j in enumerate(fmt):
+        if j in fmtmaps:
+            ind[fmtmaps[j]] = i
+    return ind
+
+def compile_format(fmt):
+    """Return a function that extracts a Row from a row in format fmt, without checking."""
+    ind = format_index(fmt)
+    return eval("lambda r: _make((%s,))" % ", ".join(["None" if x is None else "r[%d]" % x
+                                                       for x in ind]),
+                {"_make": Row._make})
+
+# number of consecutive rows with the same format and length before it is locked
+LOCK_ROWS = 20
+VAL_START = frozenset("-0123456789.<")
+
+class RowParser(object):
+    """Parse the rows of a perf/toplev CSV file.
+       After lock_rows rows were detected with the same format and number of
+       fields the format is locked. Then rows with that number of fields
+       are only checked for a plausible time stamp and value, and the fields
+       are extracted directly. Other rows use the full format detection.
+       lock_rows None never locks."""
+
+    def __init__(self, lock_rows=LOCK_ROWS):
+        self.lock_rows = lock_rows
+        self.fmt = formats[0]
+        self.nfields = None
+        self.matched = 0
+        self.extract = None
+        self.val_index = None
+
+    def detect(self, row):
+        r = check_format(self.fmt, row)
+        if r:
+            fmt = self.fmt
+        else:
+            for fmt in formats:
+                r = check_format(fmt, row)
+                if r:
+                    break
+            if not r:
+                return None
+        if fmt is not self.fmt or (self.extract is None and len(row) != self.nfields):
+            self.fmt = fmt
+            self.nfields = len(row)
+            self.matched = 1
+            self.extract = None
+        elif self.extract is None:
+            self.matched += 1
+            if self.lock_rows is not None and self.matched >= self.lock_rows:
+                self.extract = compile_format(fmt)
+                self.val_index = fmt.index(is_val)
         return r
-    for fmt in formats:
-        r = check_format(fmt, row)
+
+    def parse(self, row, error_exit=False, quiet=False):
+        if len(row) == self.nfields and self.extract is not None:
+            ts = row[0]
+            if (ts[-1:].isdigit() or ts == "SUMMARY") and ts[:1] != "#" and (
+                    row[self.val_index][:1] in VAL_START):
+                return self.extract(row)
+        if len(row) == 0:
+            return None
+        r = self.detect(row)
         if r:
-            fmt_cache = fmt
             return r
-    if row[0].startswith("#"):    # comment
+        if row[0].startswith("#"):    # comment
+            return None
+        if ".csv" in row[0]:          # fake-perf output
+            return None
+        if "Timestamp" in row[0]:
+            return None
+        if not quiet:
+            print("PARSE-ERROR", row, file=sys.stderr)
+        if error_exit:
+            sys.exit(1)
         return None
-    if ".csv" in row[0]:          # fake-perf output
-        return None
-    if "Timestamp" in row[0]:
-        return None
-    print("PARSE-ERROR", row, file=sys.stderr)
-    if error_exit:
-        sys.exit(1)
-    return None
+
+    def parse_columns(self, rows, error_exit=False, quiet=False):
+        """Parse an iterable of rows, like a csv.reader for a file or a chunk.
+           Returns a Row of lists with the values of all parsed rows.
+           Runs of rows in the locked format are collected unchanged and
+           transposed into the columns at once, without making Rows."""
+        cols = [[] for _ in Row._fields]
+        batch = []
+        append = batch.append
+
+        def flush():
+            if not batch:
+                return
+            fields = list(zip(*batch))
+            for col, i in zip(cols, format_index(self.fmt)):
+                col.extend(fields[i] if i is not None else [None] * len(batch))
+            del batch[:]
+
+        # rows with nfields -1 never match
+        nfields, vi = -1, None
+        for row in rows:
+            if len(row) == nfields:
+                ts = row[0]
+                if (ts[-1:].isdigit() or ts == "SUMMARY") and ts[:1] != "#" and (
+                        row[vi][:1] in VAL_START):
+                    append(row)
+                    continue
+            # the full detection can change the locked format
+            flush()
+            r = self.parse(row, error_exit, quiet)
+            if r is not None:
+                for col, v in zip(cols, r):
+                    col.append(v)
+            if self.extract is not None:
+                nfields, vi = self.nfields, self.val_index
+            else:
+                nfields = -1
+        flush()
+        return Row._make(cols)
+
+parser = RowParser()
+
+def parse_csv_row(row, error_exit=False, quiet=False):
+    return parser.parse(row, error_exit, quiet)
+
+def parse_csv_columns(rows, error_exit=False, quiet=False):
+    return parser.parse_columns(rows, error_exit, quiet)
 
 if __name__ == '__main__':
     def check(l, fields):
@@ -121,3 +224,16 @@ if __name__ == '__main__':
             "ev": 2,
             "val": 3,
             "unit": 4 })
+
+    # the locked format gives the same rows as the full detection
+    rows = [l.split(",") for l in [
+        '0.100997872,CPU0,4612809,,inst_retired_any_0,3491526,2.88',
+        '0.100997872,CPU1,<not counted>,,inst_retired_any_0,0,100.00',
+        'SUMMARY,CPU1,4612809,,inst_retired_any_0,3491526,2.88',
+        '# comment,,,,,,'] * LOCK_ROWS]
+    locked = RowParser()
+    unlocked = RowParser(lock_rows=None)
+    for row in rows:
+        assert locked.parse(row) == unlocked.parse(row)
+    assert locked.extract is not None
+    assert locked.parse_columns(rows).ev == [r[4] for r in rows if r[0][0] != "#"]
@@ -0,0 +1,59 @@
+# streaming downsampling of time series for plotting
+from __future__ import print_function
+
+def default_max_points(plt):
+    # a minimum and maximum for every pixel of the default figure width
+    fig = plt.rcParams['figure.figsize']
+    return int(fig[0] * plt.rcParams['figure.dpi'] * 2)
+
+class Downsample(object):
+    """Min/max preserving decimation of a time series while it is read.
+       The points are collected in buckets of size samples, each keeping
+       its minimum and maximum point. When there are more than max_points / 2
+       buckets, neighboring buckets are merged and size doubles, so the
+       memory use stays limited to max_points. max_points 0 keeps all points."""
+
+    def __init__(self, max_points):
+        self.max_buckets = max(max_points // 2, 1) if max_points else None
+        self.size = 1
+        self.count = 0
+        # buckets of [(t, minimum), (t, maximum)]
+        self.buckets = []
+
+    def add(self, t, v):
+        if self.count % self.size == 0:
+            if self.max_buckets and len(self.buckets) >= self.max_buckets:
+                self.merge()
+            self.buckets.append([(t, v), (t, v)])
+        else:
+            b = self.buckets[-1]
+            if v < b[0][1] or b[0][1] != b[0][1]:
+                b[0] = (t, v)
+            if v > b[1][1] or b[1][1] != b[1][1]:
+                b[1] = (t, v)
+        self.count += 1
+
+    def merge(self):
+        buckets = []
+        for i in range(0, len(self.buckets) - 1, 2):
+            a, b = self.buckets[i], self.buckets[i + 1]
+            mn = b[0] if b[0][1] < a[0][1] or a[0][1] != a[0][1] else a[0]
+            mx = b[1] if b[1][1] > a[1][1] or a[1][1] != a[1][1] else a[1]
+            buckets.append([mn, mx])
+        if len(self.buckets) % 2:
+            buckets.append(self.buckets[-1])
+        self.buckets = buckets
+        self.size *= 2
+
+    def points(self):
+        """Return lists of the time stamps and values in time order."""
+        ts = []
+        vals = []
+        for mn, mx in self.buckets:
+            for p in (mn,) if mn == mx else sorted((mn, mx)):
+                ts.append(p[0])
+                vals.append(p[1])
+        return ts, vals
+
+def in_window(t, start, end):
+    return (start is None or t >= start) and (end is None or t <= end)
@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 # print currently running events on cpu (default 0)
 # event-rmap [cpu-num]
+# event-rmap --monitor [-I interval] [--json]
+# print the changes of the running events on all CPUs
 # xxx no extra modi for now, racy with multi plexing
 from __future__ import print_function
 import sys
+import argparse
+import csv
+import json
+import time
+from collections import defaultdict
 import msr
 import ocperf
 from pmudef import (MSR_PEBS_ENABLE, MSR_EVNTSEL, EVENTSEL_ENABLE, EVMASK,
@@ -17,76 +24,177 @@ fixednames = (
     "cpu_clk_unhalted.ref_tsc"
 )
 
-cpu = 0
-if len(sys.argv) > 1:
-    cpu = int(sys.argv[1])
+NUM_COUNTERS = 8
+
+# read for every CPU, followed by the event selects
+STATE_MSRS = [MSR_PEBS_ENABLE, MSR_IA32_FIXED_CTR_CTRL]
+EVNTSELS = [MSR_EVNTSEL + i for i in range(NUM_COUNTERS)]
+
+ap = argparse.ArgumentParser(description='Print the events currently programmed into the PMU.')
+ap.add_argument('cpu', type=int, nargs='?', default=0, help='CPU to print (default 0)')
+ap.add_argument('--monitor', '-m', action='store_true',
+                help='Poll all CPUs and print every change of the programmed events')
+ap.add_argument('--interval', '-I', type=float, default=1.0, help='Poll interval in seconds for --monitor')
+ap.add_argument('--count', '-c', type=int, help='Stop --monitor after COUNT polls')
+ap.add_argument('--json', action='store_true', help='Print changes as JSON lines instead of CSV')
+ap.add_argument('--threads', type=int, default=8, help='Read the MSRs of the CPUs with THREADS threads')
+ap.add_argument('--output', '-o', type=argparse.FileType('w'), default=sys.stdout,
+                help='Output file for --monitor')
+ap.add_argument('--verbose', '-v', action='store_true', help='Print the poll times for --monitor')
+args = ap.parse_args()
+
+class Decoder(object):
+    """Decode event select values to event names, using reverse maps
+       of the event list that are computed once."""
+
+    def __init__(self, emap):
+        self.codes = emap.codes if emap else {}
+        # events with an extra MSR, by code and MSR value
+        self.extra = {}
+        # partial matches by event number
+        self.partial = defaultdict(list)
+        if emap:
+            for ev in emap.events.values():
+                if ev.msr:
+                    self.extra[(ev.val, ev.msrval)] = ev
+            for j in sorted(self.codes.keys()):
+                self.partial[j & 0xff].append("%s[%x]" % (self.codes[j].name, j))
+        self.cache = {}
+
+    def decode(self, evsel, read_extra):
+        """Return the name for the masked event select evsel. read_extra(msr) reads an extra MSR."""
+        if not self.codes:
+            return "r%04x" % (evsel & 0xffff)
+        ev = self.codes.get(evsel)
+        if ev is None:
+            if evsel not in self.cache:
+                name = " ".join(self.partial[evsel & 0xff])
+                self.cache[evsel] = "[no exact match] " + name if name else "r%x" % (evsel)
+            return self.cache[evsel]
+        if not ev.msr:
+            return ev.name
+        try:
+            extra = read_extra(ev.msr)
+        except OSError:
+            return "Cannot read extra MSR %x for %s" % (ev.msr, ev.name)
+        match = self.extra.get((evsel, extra))
+        if match:
+            return "%s msr:%x" % (match.name, extra)
+        return "no exact match for %s, msr %x value %x" % (ev.name, ev.msr, extra)
+
+def qualifiers(evsel, precise):
+    q = []
+    if evsel & EVENTSEL_CMASK:
+        q.append("cmask=%x" % (evsel >> 24))
+    if evsel & EVENTSEL_EDGE:
+        q.append("edge=1")
+    if evsel & EVENTSEL_ANY:
+        q.append("any=1")
+    if evsel & EVENTSEL_INV:
+        q.append("inv=1")
+    if evsel & EVENTSEL_PC:
+        q.append("pc=1")
+    if precise:
+        q.append("precise=1")
+    return q
+
+def raw_counters(vals):
+    """Yield counter, raw value, enabled, precise for all counters in the
+       state vals, as read for STATE_MSRS + EVNTSELS."""
+    pebs_enable = vals[0] or 0
+    for i, evsel in enumerate(vals[len(STATE_MSRS):]):
+        if evsel is None:
+            break
+        yield str(i), evsel, evsel & EVENTSEL_ENABLE, pebs_enable & (1 << i)
+    fixed = vals[1] or 0
+    for i in range(len(fixednames)):
+        ctrl = (fixed >> (i * 4)) & 0xf
+        yield "fixed%d" % i, ctrl, ctrl & 3, 0
+
+def print_cpu(cpu, decoder):
+    msrs = msr.MsrSet([cpu])
+    vals = msrs.readmsrs(STATE_MSRS + EVNTSELS, cpu)
+    found = 0
+    for i, evsel in enumerate(vals[len(STATE_MSRS):]):
+        if evsel is None:
+            break
+        found += 1
+        if evsel & EVENTSEL_ENABLE:
+            masked = evsel & EVMASK
+            q = qualifiers(masked, (vals[0] or 0) & (1 << i))
+            print("%d: %016x: %s" % (i, evsel, decoder.decode(masked, lambda m: msrs.read(m, cpu))) +
+                  "".join(" " + x for x in q))
+    if found == 0:
+        print("Cannot read any MSRs")
+
+    fixed = vals[1]
+    if fixed is None:
+        print("Cannot read fixed counter MSR")
+        fixed = 0
+    for i in range(0, 2):
+        if fixed & (1 << (i*4)):
+            print("fixed %d: %s" % (i, fixednames[i]))
+
+def monitor(decoder):
+    msrs = msr.MsrSet(threads=args.threads)
+    # only read the event selects that exist, found on the first poll
+    cpu_msrs = {cpu: STATE_MSRS + EVNTSELS for cpu in msrs.cpus}
+    prev = {}
+    start = time.time()
+    fields = ("timestamp", "cpu", "counter", "value", "event", "qualifiers")
+    if not args.json:
+        out = csv.writer(args.output, lineterminator='\n')
+        out.writerow(["Timestamp", "CPU", "Counter", "Value", "Event", "Qualifiers"])
+    n = 0
+    while True:
+        poll = time.time()
+        state = dict(zip(msrs.cpus, msrs.map(lambda cpu: msrs.readmsrs(cpu_msrs[cpu], cpu))))
+        ts = "%.3f" % (poll - start)
+        for cpu in msrs.cpus:
+            vals = state[cpu]
+            old = prev.get(cpu)
+            if vals == old:
+                continue
+            if old is None and None in vals[len(STATE_MSRS):]:
+                cpu_msrs[cpu] = cpu_msrs[cpu][:vals.index(None, len(STATE_MSRS))]
+                vals = vals[:len(cpu_msrs[cpu])]
+            prev[cpu] = vals
+            oldc = {c[0]: c[1:] for c in raw_counters(old)} if old else {}
+            for counter, v, enabled, precise in raw_counters(vals):
+                o = oldc.get(counter)
+                if o is None and not enabled:
+                    continue
+                if o is not None and o[0] == v and o[2] == precise:
+                    continue
+                event, q = "", []
+                if enabled and counter.startswith("fixed"):
+                    event = fixednames[int(counter[5:])]
+                elif enabled:
+                    masked = v & EVMASK
+                    event = decoder.decode(masked, lambda m, cpu=cpu: msrs.read(m, cpu))
+                    q = qualifiers(masked, precise)
+                row = (ts, cpu, counter, "%x" % v, event, " ".join(q))
+                if args.json:
+                    args.output.write(json.dumps(dict(zip(fields, row))) + "\n")
+                else:
+                    out.writerow(row)
+        args.output.flush()
+        if args.verbose:
+            print("poll %.2fms" % ((time.time() - poll) * 1000.), file=sys.stderr)
+        n += 1
+        if args.count and n >= args.count:
+            break
+        time.sleep(max(args.interval - (time.time() - poll), 0))
+    msrs.close()
 
 emap = ocperf.find_emap()
 if not emap:
     print("Unknown CPU or cannot find CPU event table")
-found = 0
-try:
-    pebs_enable = msr.readmsr(MSR_PEBS_ENABLE, cpu)
-except OSError:
-    pebs_enable = 0
-for i in range(0, 8):
+decoder = Decoder(emap)
+if args.monitor:
     try:
-        evsel = msr.readmsr(MSR_EVNTSEL + i, cpu)
-    except OSError:
-        break
-    found += 1
-    if evsel & EVENTSEL_ENABLE:
-        print("%d: %016x: " % (i, evsel), end="")
-        evsel &= EVMASK
-        if emap is None:
-            name = "r%04x", evsel & 0xffff
-        elif evsel in emap.codes:
-            ev = emap.codes[evsel]
-            if ev.msr:
-                try:
-                    extra = msr.readmsr(ev.msr)
-                except OSError:
-                    print("Cannot read extra MSR %x for %s" % (ev.msr, ev.name))
-                    continue
-                for j in emap.codes.keys():
-                    if j == evsel and extra == emap.codes[j].msrvalue:
-                        print(j.name, "msr:%x" % (extra), end="")
-                        break
-                else:
-                    print("no exact match for %s, msr %x value %x" % (ev.name,
-                                                                      ev.msr, ev.msrvalue), end="")
-            else:
-                print(ev.name, end="")
-        else:
-            name = ""
-            for j in emap.codes.keys():
-                if j & 0xff == evsel & 0xff:
-                    name += "%s[%x] " % (emap.codes[j].name, j)
-            if name:
-                print("[no exact match] " + name, end=" ")
-            else:
-                print("r%x" % (evsel), end=" ")
-        if evsel & EVENTSEL_CMASK:
-            print("cmask=%x" % (evsel >> 24), end=" ")
-        if evsel & EVENTSEL_EDGE:
-            print("edge=1", end=" ")
-        if evsel & EVENTSEL_ANY:
-            print("any=1", end=" ")
-        if evsel & EVENTSEL_INV:
-            print("inv=1", end=" ")
-        if evsel & EVENTSEL_PC:
-            print("pc=1", end=" ")
-        if pebs_enable & (1 << i):
-            print("precise=1", end=" ")
-        print()
-if found == 0:
-    print("Cannot read any MSRs")
-
-try:
-    fixed = msr.readmsr(MSR_IA32_FIXED_CTR_CTRL)
-except OSError:
-    print("Cannot read fixed counter MSR")
-    fixed = 0
-for i in range(0, 2):
-    if fixed & (1 << (i*4)):
-        print("fixed %d: %s" % (i, fixednames[i]))
+        monitor(decoder)
+    except KeyboardInterrupt:
+        pass
+else:
+    print_cpu(args.cpu, decoder)
@@ -25,11 +25,6 @@
 from __future__ import print_function
 import sys
 import re
-try:
-    from urllib.request import urlopen
-    from urllib.error import URLError
-except ImportError:
-    from urllib2 import urlopen, URLError
 import os
 import string
 from fnmatch import fnmatch
@@ -95,7 +90,17 @@ def getdir():
 
 NUM_TRIES = 3
 
+# urllib pulls in http/email/ssl, only import it when actually downloading
+def urllib_funcs():
+    try:
+        from urllib.request import urlopen
+        from urllib.error import URLError
+    except ImportError:
+        from urllib2 import urlopen, URLError
+    return urlopen, URLError
+
 def getfile(url, dirfn, fn):
+    urlopen, _ = urllib_funcs()
     tries = 0
     print("Downloading", url, "to", fn)
     while True:
@@ -130,6 +135,7 @@ def cpu_without_step(match):
 allowed_chars = string.ascii_letters + '_-.' + string.digits
 def parse_map_file(match, key=None, link=True, onlyprint=False,
                    acceptfile=False, hybridkey=None):
+    _, URLError = urllib_funcs()
     match2 = cpu_without_step(match)
     files = []
     dirfn = getdir()
@@ -1,13 +1,28 @@
 #!/usr/bin/env python3
 # merge multiple --perf-output files. requires header
+# The files are expected to be sorted by time stamp, as toplev writes them.
+# They are merged one time stamp at a time, so only the rows of the current
+# time stamp are kept in memory. Other files need --unsorted, which keeps
+# all rows and can partition the events over multiple processes with --jobs.
+# The output is always sorted by time stamp.
 from __future__ import print_function
 import csv
 import argparse
+import heapq
+import multiprocessing
+import os
+import tempfile
+import zlib
 from collections import OrderedDict, Counter
 import sys
+import tl_io
 
 ap = argparse.ArgumentParser()
-ap.add_argument('csvfiles', nargs='+', type=argparse.FileType('r'))
+ap.add_argument('csvfiles', nargs='+', help='perf output files. Can be compressed with .gz, .xz, .zst')
+ap.add_argument('--unsorted', action='store_true',
+                help='Input files are not sorted by time stamp. Keeps all rows in memory')
+ap.add_argument('--jobs', '-j', type=int, default=1,
+                help='With --unsorted partition the events over JOBS processes')
 args = ap.parse_args()
 
 def genkey(c, hdr, count):
@@ -19,38 +34,223 @@ def genkey(c, hdr, count):
     k.append(c[hdr['Event']])
     return tuple(k)
 
-d = OrderedDict()
 hdr = None
 hdrl = None
-prev = Counter()
-for fh in args.csvfiles:
-    csvf = csv.reader(fh, delimiter=';')
-    for c in csvf:
+
+def read_rows(fn):
+    global hdr, hdrl
+    fh = tl_io.flex_open_r(fn)
+    for c in csv.reader(fh, delimiter=';'):
+        if not c:
+            continue
         if hdr is None:
             hdrl = c
             hdr = dict([(y,x) for x,y in enumerate(c)])
             continue
         if c[0] in ("Timestamp", "Location", "Value"):
             continue
-        pkey = (fh, c[hdr['Timestamp']] if 'Timestamp' in hdr else None, c[hdr['Event']])
+        yield c
+    fh.close()
+
+def timestamp(c):
+    return c[hdr['Timestamp']] if 'Timestamp' in hdr else None
+
+def read_groups(fn):
+    """Yield time stamp, rows for the consecutive rows with the same time stamp."""
+    ts = None
+    rows = []
+    for c in read_rows(fn):
+        t = timestamp(c)
+        if rows and t != ts:
+            yield ts, rows
+            rows = []
+        ts = t
+        rows.append(c)
+    if rows:
+        yield ts, rows
+
+def ts_order(ts):
+    # numbers in order, then the SUMMARY rows
+    try:
+        return (0, float(ts))
+    except (TypeError, ValueError):
+        return (1, ts or "")
+
+def merge_rows(d, prev, fnum, rows):
+    """Add rows from file fnum to d. Value and Run-Time are summed, Enabled averaged."""
+    for c in rows:
+        pkey = (fnum, timestamp(c), c[hdr['Event']])
         prev[pkey] += 1
         key = genkey(c, hdr, prev[pkey])
         try:
-            if key in d:
-                o = d[key]
-                o[hdr['Run-Time']] += float(c[hdr['Run-Time']])
-                o[hdr['Enabled']] = (float(o[hdr['Enabled']]) + o[hdr['Enabled']]) / 2
-                o[hdr['Value']] += float(c[hdr['Value']])
-            else:
-                d[key] = c
-                o = d[key]
-                o[hdr['Value']] = float(c[hdr['Value']])
-                o[hdr['Enabled']] = float(c[hdr['Enabled']])
-                o[hdr['Run-Time']] = float(c[hdr['Run-Time']])
+            value = float(c[hdr['Value']])
+            enabled = float(c[hdr['Enabled']])
+            runtime = float(c[hdr['Run-Time']])
         except ValueError as e:
             print("cannot parse", c, e, file=sys.stderr)
+            continue
+        if key in d:
+            o = d[key]
+            o[1] += 1
+            o = o[0]
+            o[hdr['Run-Time']] += runtime
+            o[hdr['Enabled']] += (enabled - o[hdr['Enabled']]) / d[key][1]
+            o[hdr['Value']] += value
+        else:
+            c[hdr['Value']] = value
+            c[hdr['Enabled']] = enabled
+            c[hdr['Run-Time']] = runtime
+            d[key] = [c, 1]
+
+def write_rows(csvf, d):
+    for j in d.values():
+        csvf.writerow(j[0])
+
+def time_sorted(d, seqs):
+    """Return merged rows of d with their sequence numbers, sorted by time stamp.
+       Rows with the same time stamp stay in the order they were first seen."""
+    return sorted(zip(seqs, [j[0] for j in d.values()]),
+                  key=lambda x: (ts_order(timestamp(x[1])), x[0]))
+
+def merge_sorted(csvf):
+    """k-way merge of the time stamp groups of all files."""
+    groups = [read_groups(fn) for fn in args.csvfiles]
+    heap = []
+    last = [None] * len(groups)
+
+    def advance(fnum):
+        g = next(groups[fnum], None)
+        if g is None:
+            return
+        order = ts_order(g[0])
+        if last[fnum] is not None and order <= last[fnum]:
+            sys.exit("%s is not sorted by time stamp at %s. Use --unsorted" % (
+                args.csvfiles[fnum], g[0]))
+        last[fnum] = order
+        heapq.heappush(heap, (order, fnum, g[1]))
+
+    for fnum in range(len(groups)):
+        advance(fnum)
+    if hdr is None:
+        return
+    csvf.writerow(hdrl)
+    while heap:
+        order = heap[0][0]
+        cur = []
+        while heap and heap[0][0] == order:
+            cur.append(heapq.heappop(heap)[1:])
+        d = OrderedDict()
+        prev = Counter()
+        for fnum, rows in cur:
+            merge_rows(d, prev, fnum, rows)
+            advance(fnum)
+        write_rows(csvf, d)
+
+def merge_all(rows):
+    """Merge rows of file number, sequence number, row. Return the merged rows
+       and the sequence numbers of their first rows."""
+    d = OrderedDict()
+    prev = Counter()
+    seqs = []
+    for fnum, seq, c in rows:
+        n = len(d)
+        merge_rows(d, prev, fnum, [c])
+        if len(d) > n:
+            seqs.append(seq)
+    return d, seqs
+
+def all_rows():
+    seq = 0
+    for fnum, fn in enumerate(args.csvfiles):
+        for c in read_rows(fn):
+            yield fnum, seq, c
+            seq += 1
+
+def partition():
+    """Split the rows of all files by event over args.jobs temporary files.
+       Each row is prefixed with its file and sequence number. The lines
+       are only split at ; here, the workers parse them."""
+    global hdr, hdrl
+    names = []
+    files = []
+    for _ in range(args.jobs):
+        fd, name = tempfile.mkstemp(prefix="interval-merge")
+        names.append(name)
+        files.append(os.fdopen(fd, "w"))
+    seq = 0
+    for fnum, fn in enumerate(args.csvfiles):
+        fh = tl_io.flex_open_r(fn)
+        for l in fh:
+            if not l.strip():
+                continue
+            c = l.rstrip("\n").split(";")
+            if hdr is None:
+                hdrl = next(csv.reader([l], delimiter=';'))
+                hdr = dict([(y,x) for x,y in enumerate(hdrl)])
+                continue
+            if c[0] in ("Timestamp", "Location", "Value"):
+                continue
+            f = files[zlib.crc32(c[hdr['Event']].encode()) % args.jobs]
+            f.write("%d;%d;%s" % (fnum, seq, l if l.endswith("\n") else l + "\n"))
+            seq += 1
+        fh.close()
+    for f in files:
+        f.close()
+    return names
+
+def open_partition(name, mode):
+    # the csv module wants binary files on python 2
+    if sys.version_info.major == 2:
+        return open(name, mode + "b")
+    return open(name, mode, newline="")
+
+def read_partition(name):
+    with open_partition(name, "r") as f:
+        for c in csv.reader(f, delimiter=';'):
+            yield int(c[0]), int(c[1]), c[2:]
+
+def merge_partition(name):
+    """Merge the events of a partition file. Replace it with the merged rows
+       sorted by time stamp, prefixed with their sequence numbers."""
+    d, seqs = merge_all(read_partition(name))
+    with open_partition(name, "w") as f:
+        csvf = csv.writer(f, delimiter=';')
+        for seq, c in time_sorted(d, seqs):
+            csvf.writerow([seq] + c)
+
+def read_merged(name):
+    """Yield sort key and line of the merged rows of a partition."""
+    tsi = hdr.get('Timestamp')
+    with open_partition(name, "r") as f:
+        for l in f:
+            seq, l = l.split(";", 1)
+            ts = l.split(";", tsi + 1)[tsi] if tsi is not None else None
+            yield (ts_order(ts), int(seq)), l
+
+def merge_unsorted(csvf):
+    if args.jobs <= 1:
+        d, seqs = merge_all(all_rows())
+        if hdr is not None:
+            csvf.writerow(hdrl)
+        for _, c in time_sorted(d, seqs):
+            csvf.writerow(c)
+        return
+    # read and partition the input only once, in the parent
+    names = partition()
+    if hdr is not None:
+        pool = multiprocessing.Pool(args.jobs)
+        pool.map(merge_partition, names)
+        pool.close()
+        csvf.writerow(hdrl)
+        # k-way merge of the sorted partitions, in the same order as with one job
+        sys.stdout.flush()
+        for _, l in heapq.merge(*[read_merged(n) for n in names]):
+            sys.stdout.write(l)
+    for name in names:
+        os.remove(name)
 
 csvf = csv.writer(sys.stdout, delimiter=';')
-csvf.writerow(hdrl)
-for j in d.values():
-    csvf.writerow(j)
+if args.unsorted:
+    merge_unsorted(csvf)
+else:
+    merge_sorted(csvf)
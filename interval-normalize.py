@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 # convert perf stat -Ixxx -x, / toplev -Ixxx -x, output to normalized output
-# this version buffers all data in memory, so it can use a lot of memory.
 # t1,ev1,num1
 # t1,ev2,num1
 # t2,ev1,num3
@@ -9,76 +8,102 @@
 # t1,num1,num2
 # t2,num3,,
 # when the input has CPU generate separate lines for each CPU (may need post filtering)
+#
+# The header needs all events, so files (including .gz/.xz/.zst) are read twice:
+# first to collect the columns, then to output the rows one timestamp at a time.
+# Pipes are spilled to a temporary file instead. With --prefix the columns
+# are fixed after the first intervals and the rows are output immediately.
 from __future__ import print_function
 import sys
+import os
+import stat
 import csv
 import argparse
 import collections
+import tempfile
 import csv_formats
+import tl_io
 
 ap = argparse.ArgumentParser(description=
 'Normalize CSV data from perf or toplev. All values are printed on a single line.')
-ap.add_argument('inputfile', type=argparse.FileType('r'), default=sys.stdin, nargs='?')
+ap.add_argument('inputfile', nargs='?', help='Input file (default stdin). Can be compressed with .gz, .xz, .zst')
 ap.add_argument('--output', '-o', type=argparse.FileType('w'), default=sys.stdout, nargs='?')
 ap.add_argument('--cpu', nargs='?', help='Only output for this cpu')
 ap.add_argument('--na', nargs='?', help='Value to use if data is not available', default="")
 ap.add_argument('--error-exit', action='store_true', help='Force error exit on parse error')
 ap.add_argument('--normalize-cpu', action='store_true', help='Normalize CPUs into unique columns too')
+ap.add_argument('--prefix', type=int, help='Determine the columns from the first PREFIX intervals '
+                'and output each interval as soon as it is complete')
+ap.add_argument('--late-spill', type=argparse.FileType('w'),
+                help='With --prefix write the values of events not in the columns to this file '
+                '(as timestamp,cpu,event,value)')
 args = ap.parse_args()
 
-printed_header = False
-timestamp = None
-
 events = collections.OrderedDict()
-out = []
-times = []
-cpus = []
-rc = csv.reader(args.inputfile)
-res = []
-writer = csv.writer(args.output, lineterminator='\n')
-lastcpu = None
 cpu = None
-lineno = 1
-for row in rc:
-    if len(row) > 0 and (row[0] == "Timestamp" or row[0].startswith("#")):
-        lineno += 1
-        continue
-    r = csv_formats.parse_csv_row(row, error_exit=args.error_exit)
-    if r is None:
-        print("at line %d" % lineno, file=sys.stderr)
-        lineno += 1
-        continue
-    ts, cpu, ev, val = r.ts, r.cpu, r.ev, r.val
+writer = csv.writer(args.output, lineterminator='\n')
 
-    if ts != timestamp or (cpu != lastcpu and not args.normalize_cpu):
-        if timestamp:
-            if args.cpu and cpu != args.cpu:
-                continue
-            # delay in case we didn't see all headers
-            # only need to do that for toplev, directly output for perf?
-            # could limit buffering to save memory?
-            out.append(res)
-            times.append(timestamp)
-            cpus.append(cpu)
+def open_input():
+    if args.inputfile is None or args.inputfile == "-":
+        return sys.stdin
+    return tl_io.flex_open_r(args.inputfile)
+
+def rereadable(f):
+    if f is not sys.stdin:
+        return True
+    try:
+        return stat.S_ISREG(os.fstat(f.fileno()).st_mode)
+    except (OSError, ValueError):
+        return False
+
+def reopen(f):
+    if f is sys.stdin:
+        f.seek(0)
+        return f
+    f.close()
+    return open_input()
+
+def read_intervals(f, quiet=False):
+    """Yield timestamp, cpu, values for every interval (and CPU unless
+       --normalize-cpu). The values are indexed by the position of the
+       event in events."""
+    global cpu
+    timestamp = None
+    lastcpu = None
+    res = []
+    lineno = 1
+    for row in csv.reader(f):
+        if len(row) > 0 and (row[0] == "Timestamp" or row[0].startswith("#")):
+            lineno += 1
+            continue
+        r = csv_formats.parse_csv_row(row, error_exit=args.error_exit, quiet=quiet)
+        if r is None:
+            if not quiet:
+                print("at line %d" % lineno, file=sys.stderr)
+            lineno += 1
+            continue
+        ts, cpu, ev, val = r.ts, r.cpu, r.ev, r.val
+
+        if ts != timestamp or (cpu != lastcpu and not args.normalize_cpu):
+            if timestamp and not (args.cpu and lastcpu != args.cpu):
+                yield timestamp, lastcpu, res
             res = []
-        timestamp = ts
-        lastcpu = cpu
-
-    if cpu is not None and args.normalize_cpu:
-        ev = cpu + " " + ev
-
-    # use a list for row storage to keep memory requirements down
-    if ev not in events:
-        events[ev] = len(res)
-    ind = events[ev]
-    if ind >= len(res):
-        res += [None] * ((ind + 1) - len(res))
-    res[ind] = val
-    lineno += 1
-if res and not (args.cpu and cpu != args.cpu):
-    out.append(res)
-    times.append(timestamp)
-    cpus.append(cpu)
+            timestamp = ts
+            lastcpu = cpu
+
+        if cpu is not None and args.normalize_cpu:
+            ev = cpu + " " + ev
+
+        # use a list for row storage to keep memory requirements down
+        if ev not in events:
+            events[ev] = len(events)
+        ind = events[ev]
+        if ind >= len(res):
+            res += [None] * ((ind + 1) - len(res))
+        res[ind] = val
+        lineno += 1
+    if res and not (args.cpu and lastcpu != args.cpu):
+        yield timestamp, lastcpu, res
 
 def resolve(row, ind):
     if ind >= len(row):
@@ -95,9 +120,72 @@ def cpulist():
         return ["CPU"]
     return []
 
-keys = events.keys()
-writer.writerow(["Timestamp"] + cpulist() + list(keys))
-for row, ts, cpunum in zip(out, times, cpus):
-    writer.writerow([ts] +
-                ([cpunum] if (cpu is not None and not args.normalize_cpu) else []) +
-                ([resolve(row, events[x]) for x in keys]))
+def write_header(width):
+    writer.writerow(["Timestamp"] + cpulist() + list(events.keys())[:width])
+
+def write_row(ts, cpunum, vals):
+    writer.writerow([ts] + ([cpunum] if cpulist() else []) + vals)
+
+def normalize_twopass(f):
+    for _ in read_intervals(f):
+        pass
+    f = reopen(f)
+    width = len(events)
+    write_header(width)
+    for ts, cpunum, res in read_intervals(f, quiet=True):
+        write_row(ts, cpunum, [resolve(res, i) for i in range(width)])
+
+def normalize_spill(f):
+    # rows only have the events seen so far, the missing ones are added at the end
+    with tempfile.TemporaryFile(mode="w+") as spill:
+        wr = csv.writer(spill, lineterminator='\n')
+        for ts, cpunum, res in read_intervals(f):
+            wr.writerow([ts, cpunum] + [resolve(res, i) for i in range(len(res))])
+        spill.seek(0)
+        width = len(events)
+        write_header(width)
+        for r in csv.reader(spill):
+            write_row(r[0], r[1], r[2:] + [args.na] * (width - len(r) + 2))
+
+def normalize_prefix(f):
+    prefix = []
+    width = None
+    names = []
+    late = collections.Counter()
+    lw = csv.writer(args.late_spill, lineterminator='\n') if args.late_spill else None
+    for ts, cpunum, res in read_intervals(f):
+        if width is None:
+            prefix.append((ts, cpunum, res))
+            if len(prefix) < args.prefix:
+                continue
+            width = len(events)
+            write_header(width)
+            for p in prefix:
+                write_row(p[0], p[1], [resolve(p[2], i) for i in range(width)])
+            prefix = []
+            continue
+        write_row(ts, cpunum, [resolve(res, i) for i in range(width)])
+        for ind in range(width, len(res)):
+            if res[ind] is None:
+                continue
+            if len(names) < len(events):
+                names = list(events.keys())
+            late[names[ind]] += 1
+            if lw:
+                lw.writerow([ts, cpunum, names[ind], res[ind]])
+    if width is None:
+        width = len(events)
+        write_header(width)
+        for p in prefix:
+            write_row(p[0], p[1], [resolve(p[2], i) for i in range(width)])
+    if late and not lw:
+        print("%d values of events not in the first %d intervals dropped: %s" % (
+            sum(late.values()), args.prefix, " ".join(sorted(late.keys()))), file=sys.stderr)
+
+f = open_input()
+if args.prefix:
+    normalize_prefix(f)
+elif rereadable(f):
+    normalize_twopass(f)
+else:
+    normalize_spill(f)
@@ -18,6 +18,7 @@ if os.getenv("DISPLAY") is None:
     matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import csv_formats
+import downsample
 import gen_level
 import tl_io
 
@@ -37,7 +38,13 @@ p.add_argument('-a', '--add', help='add extra plot with metrics (comma separated
 p.add_argument('file', help='CSV file to plot (otherwise using stdin). Can be .gz,.xz,.zstd', nargs='?')
 p.add_argument('--output', '-o', help='Output to file. Otherwise show.',
                nargs='?')
+p.add_argument('--max-points', type=int, help='Downsample each plot line to at most N points, '
+               'keeping minimums and maximums. 0 for all points. Default is twice the figure width in pixels')
+p.add_argument('--start', type=float, help='Only plot from time stamp START (seconds)')
+p.add_argument('--end', type=float, help='Only plot until time stamp END (seconds)')
 args = p.parse_args()
+if args.max_points is None:
+    args.max_points = downsample.default_max_points(plt)
 
 adds = set(args.add.split(","))
 
@@ -67,8 +74,7 @@ else:
     inf = sys.stdin
 
 rc = csv.reader(inf)
-timestamps = {}
-value = {}
+series = {}
 
 def isnum(x):
     return re.match(r'[0-9.]+', x)
@@ -92,7 +98,10 @@ for row in rc:
     if r is None:
         continue
     ts, cpu, event, val = r.ts, r.cpu, r.ev, r.val
-    if ts == "SUMMARY" or skip_event(event, r.unit):
+    if ts.startswith("SUMMARY") or skip_event(event, r.unit):
+        continue
+    t = float(ts)
+    if not downsample.in_window(t, args.start, args.end):
         continue
     if event not in assigned:
         level = gen_level.get_level(event)
@@ -100,13 +109,12 @@ for row in rc:
         cur_colors[level] = cur_colors[level][1:]
         if len(cur_colors[level]) == 0:
             cur_colors[level] = all_colors
-        value[event] = []
-        timestamps[event] = []
-    timestamps[event].append(float(ts))
+        series[event] = downsample.Downsample(args.max_points)
     try:
-        value[event].append(float(val.replace("%","")))
+        v = float(val.replace("%",""))
     except ValueError:
-        value[event].append(0.0)
+        v = 0.0
+    series[event].add(t, v)
 
 k = set(assigned.keys()) - adds
 levels = set(map(gen_level.get_level, k)) | adds
@@ -127,10 +135,11 @@ for l in levels:
         print(j, gen_level.get_level(j), l)
         if gen_level.get_level(j) == l or j == l:
             t.append(j)
+            timestamps, value = series[j].points()
             if 'style' not in globals():
-                ax.plot(timestamps[j], value[j], assigned[j])
+                ax.plot(timestamps, value, assigned[j])
             else:
-                ax.plot(timestamps[j], value[j])
+                ax.plot(timestamps, value)
     leg = ax.legend(t, loc='upper left')
     leg.get_frame().set_alpha(0.5)
     n += 1
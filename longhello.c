@@ -0,0 +1,1003 @@
+#include <stdio.h>
+void func0(void) { int i; for(i=0;i<10;i++) printf("Hello 0\n"); }
+void func1(void) { int i; for(i=0;i<10;i++) printf("Hello 1\n"); }
+void func2(void) { int i; for(i=0;i<10;i++) printf("Hello 2\n"); }
+void func3(void) { int i; for(i=0;i<10;i++) printf("Hello 3\n"); }
+void func4(void) { int i; for(i=0;i<10;i++) printf("Hello 4\n"); }
+void func5(void) { int i; for(i=0;i<10;i++) printf("Hello 5\n"); }
+void func6(void) { int i; for(i=0;i<10;i++) printf("Hello 6\n"); }
+void func7(void) { int i; for(i=0;i<10;i++) printf("Hello 7\n"); }
+void func8(void) { int i; for(i=0;i<10;i++) printf("Hello 8\n"); }
+void func9(void) { int i; for(i=0;i<10;i++) printf("Hello 9\n"); }
+void func10(void) { int i; for(i=0;i<10;i++) printf("Hello 10\n"); }
+void func11(void) { int i; for(i=0;i<10;i++) printf("Hello 11\n"); }
+void func12(void) { int i; for(i=0;i<10;i++) printf("Hello 12\n"); }
+void func13(void) { int i; for(i=0;i<10;i++) printf("Hello 13\n"); }
+void func14(void) { int i; for(i=0;i<10;i++) printf("Hello 14\n"); }
+void func15(void) { int i; for(i=0;i<10;i++) printf("Hello 15\n"); }
+void func16(void) { int i; for(i=0;i<10;i++) printf("Hello 16\n"); }
+void func17(void) { int i; for(i=0;i<10;i++) printf("Hello 17\n"); }
+void func18(void) { int i; for(i=0;i<10;i++) printf("Hello 18\n"); }
+void func19(void) { int i; for(i=0;i<10;i++) printf("Hello 19\n"); }
+void func20(void) { int i; for(i=0;i<10;i++) printf("Hello 20\n"); }
+void func21(void) { int i; for(i=0;i<10;i++) printf("Hello 21\n"); }
+void func22(void) { int i; for(i=0;i<10;i++) printf("Hello 22\n"); }
+void func23(void) { int i; for(i=0;i<10;i++) printf("Hello 23\n"); }
+void func24(void) { int i; for(i=0;i<10;i++) printf("Hello 24\n"); }
+void func25(void) { int i; for(i=0;i<10;i++) printf("Hello 25\n"); }
+void func26(void) { int i; for(i=0;i<10;i++) printf("Hello 26\n"); }
+void func27(void) { int i; for(i=0;i<10;i++) printf("Hello 27\n"); }
+void func28(void) { int i; for(i=0;i<10;i++) printf("Hello 28\n"); }
+void func29(void) { int i; for(i=0;i<10;i++) printf("Hello 29\n"); }
+void func30(void) { int i; for(i=0;i<10;i++) printf("Hello 30\n"); }
+void func31(void) { int i; for(i=0;i<10;i++) printf("Hello 31\n"); }
+void func32(void) { int i; for(i=0;i<10;i++) printf("Hello 32\n"); }
+void func33(void) { int i; for(i=0;i<10;i++) printf("Hello 33\n"); }
+void func34(void) { int i; for(i=0;i<10;i++) printf("Hello 34\n"); }
+void func35(void) { int i; for(i=0;i<10;i++) printf("Hello 35\n"); }
+void func36(void) { int i; for(i=0;i<10;i++) printf("Hello 36\n"); }
+void func37(void) { int i; for(i=0;i<10;i++) printf("Hello 37\n"); }
+void func38(void) { int i; for(i=0;i<10;i++) printf("Hello 38\n"); }
+void func39(void) { int i; for(i=0;i<10;i++) printf("Hello 39\n"); }
+void func40(void) { int i; for(i=0;i<10;i++) printf("Hello 40\n"); }
+void func41(void) { int i; for(i=0;i<10;i++) printf("Hello 41\n"); }
+void func42(void) { int i; for(i=0;i<10;i++) printf("Hello 42\n"); }
+void func43(void) { int i; for(i=0;i<10;i++) printf("Hello 43\n"); }
+void func44(void) { int i; for(i=0;i<10;i++) printf("Hello 44\n"); }
+void func45(void) { int i; for(i=0;i<10;i++) printf("Hello 45\n"); }
+void func46(void) { int i; for(i=0;i<10;i++) printf("Hello 46\n"); }
+void func47(void) { int i; for(i=0;i<10;i++) printf("Hello 47\n"); }
+void func48(void) { int i; for(i=0;i<10;i++) printf("Hello 48\n"); }
+void func49(void) { int i; for(i=0;i<10;i++) printf("Hello 49\n"); }
+void func50(void) { int i; for(i=0;i<10;i++) printf("Hello 50\n"); }
+void func51(void) { int i; for(i=0;i<10;i++) printf("Hello 51\n"); }
+void func52(void) { int i; for(i=0;i<10;i++) printf("Hello 52\n"); }
+void func53(void) { int i; for(i=0;i<10;i++) printf("Hello 53\n"); }
+void func54(void) { int i; for(i=0;i<10;i++) printf("Hello 54\n"); }
+void func55(void) { int i; for(i=0;i<10;i++) printf("Hello 55\n"); }
+void func56(void) { int i; for(i=0;i<10;i++) printf("Hello 56\n"); }
+void func57(void) { int i; for(i=0;i<10;i++) printf("Hello 57\n"); }
+void func58(void) { int i; for(i=0;i<10;i++) printf("Hello 58\n"); }
+void func59(void) { int i; for(i=0;i<10;i++) printf("Hello 59\n"); }
+void func60(void) { int i; for(i=0;i<10;i++) printf("Hello 60\n"); }
+void func61(void) { int i; for(i=0;i<10;i++) printf("Hello 61\n"); }
+void func62(void) { int i; for(i=0;i<10;i++) printf("Hello 62\n"); }
+void func63(void) { int i; for(i=0;i<10;i++) printf("Hello 63\n"); }
+void func64(void) { int i; for(i=0;i<10;i++) printf("Hello 64\n"); }
+void func65(void) { int i; for(i=0;i<10;i++) printf("Hello 65\n"); }
+void func66(void) { int i; for(i=0;i<10;i++) printf("Hello 66\n"); }
+void func67(void) { int i; for(i=0;i<10;i++) printf("Hello 67\n"); }
+void func68(void) { int i; for(i=0;i<10;i++) printf("Hello 68\n"); }
+void func69(void) { int i; for(i=0;i<10;i++) printf("Hello 69\n"); }
+void func70(void) { int i; for(i=0;i<10;i++) printf("Hello 70\n"); }
+void func71(void) { int i; for(i=0;i<10;i++) printf("Hello 71\n"); }
+void func72(void) { int i; for(i=0;i<10;i++) printf("Hello 72\n"); }
+void func73(void) { int i; for(i=0;i<10;i++) printf("Hello 73\n"); }
+void func74(void) { int i; for(i=0;i<10;i++) printf("Hello 74\n"); }
+void func75(void) { int i; for(i=0;i<10;i++) printf("Hello 75\n"); }
+void func76(void) { int i; for(i=0;i<10;i++) printf("Hello 76\n"); }
+void func77(void) { int i; for(i=0;i<10;i++) printf("Hello 77\n"); }
+void func78(void) { int i; for(i=0;i<10;i++) printf("Hello 78\n"); }
+void func79(void) { int i; for(i=0;i<10;i++) printf("Hello 79\n"); }
+void func80(void) { int i; for(i=0;i<10;i++) printf("Hello 80\n"); }
+void func81(void) { int i; for(i=0;i<10;i++) printf("Hello 81\n"); }
+void func82(void) { int i; for(i=0;i<10;i++) printf("Hello 82\n"); }
+void func83(void) { int i; for(i=0;i<10;i++) printf("Hello 83\n"); }
+void func84(void) { int i; for(i=0;i<10;i++) printf("Hello 84\n"); }
+void func85(void) { int i; for(i=0;i<10;i++) printf("Hello 85\n"); }
+void func86(void) { int i; for(i=0;i<10;i++) printf("Hello 86\n"); }
+void func87(void) { int i; for(i=0;i<10;i++) printf("Hello 87\n"); }
+void func88(void) { int i; for(i=0;i<10;i++) printf("Hello 88\n"); }
+void func89(void) { int i; for(i=0;i<10;i++) printf("Hello 89\n"); }
+void func90(void) { int i; for(i=0;i<10;i++) printf("Hello 90\n"); }
+void func91(void) { int i; for(i=0;i<10;i++) printf("Hello 91\n"); }
+void func92(void) { int i; for(i=0;i<10;i++) printf("Hello 92\n"); }
+void func93(void) { int i; for(i=0;i<10;i++) printf("Hello 93\n"); }
+void func94(void) { int i; for(i=0;i<10;i++) printf("Hello 94\n"); }
+void func95(void) { int i; for(i=0;i<10;i++) printf("Hello 95\n"); }
+void func96(void) { int i; for(i=0;i<10;i++) printf("Hello 96\n"); }
+void func97(void) { int i; for(i=0;i<10;i++) printf("Hello 97\n"); }
+void func98(void) { int i; for(i=0;i<10;i++) printf("Hello 98\n"); }
+void func99(void) { int i; for(i=0;i<10;i++) printf("Hello 99\n"); }
+void func100(void) { int i; for(i=0;i<10;i++) printf("Hello 100\n"); }
+void func101(void) { int i; for(i=0;i<10;i++) printf("Hello 101\n"); }
+void func102(void) { int i; for(i=0;i<10;i++) printf("Hello 102\n"); }
+void func103(void) { int i; for(i=0;i<10;i++) printf("Hello 103\n"); }
+void func104(void) { int i; for(i=0;i<10;i++) printf("Hello 104\n"); }
+void func105(void) { int i; for(i=0;i<10;i++) printf("Hello 105\n"); }
+void func106(void) { int i; for(i=0;i<10;i++) printf("Hello 106\n"); }
+void func107(void) { int i; for(i=0;i<10;i++) printf("Hello 107\n"); }
+void func108(void) { int i; for(i=0;i<10;i++) printf("Hello 108\n"); }
+void func109(void) { int i; for(i=0;i<10;i++) printf("Hello 109\n"); }
+void func110(void) { int i; for(i=0;i<10;i++) printf("Hello 110\n"); }
+void func111(void) { int i; for(i=0;i<10;i++) printf("Hello 111\n"); }
+void func112(void) { int i; for(i=0;i<10;i++) printf("Hello 112\n"); }
+void func113(void) { int i; for(i=0;i<10;i++) printf("Hello 113\n"); }
+void func114(void) { int i; for(i=0;i<10;i++) printf("Hello 114\n"); }
+void func115(void) { int i; for(i=0;i<10;i++) printf("Hello 115\n"); }
+void func116(void) { int i; for(i=0;i<10;i++) printf("Hello 116\n"); }
+void func117(void) { int i; for(i=0;i<10;i++) printf("Hello 117\n"); }
+void func118(void) { int i; for(i=0;i<10;i++) printf("Hello 118\n"); }
+void func119(void) { int i; for(i=0;i<10;i++) printf("Hello 119\n"); }
+void func120(void) { int i; for(i=0;i<10;i++) printf("Hello 120\n"); }
+void func121(void) { int i; for(i=0;i<10;i++) printf("Hello 121\n"); }
+void func122(void) { int i; for(i=0;i<10;i++) printf("Hello 122\n"); }
+void func123(void) { int i; for(i=0;i<10;i++) printf("Hello 123\n"); }
+void func124(void) { int i; for(i=0;i<10;i++) printf("Hello 124\n"); }
+void func125(void) { int i; for(i=0;i<10;i++) printf("Hello 125\n"); }
+void func126(void) { int i; for(i=0;i<10;i++) printf("Hello 126\n"); }
+void func127(void) { int i; for(i=0;i<10;i++) printf("Hello 127\n"); }
+void func128(void) { int i; for(i=0;i<10;i++) printf("Hello 128\n"); }
+void func129(void) { int i; for(i=0;i<10;i++) printf("Hello 129\n"); }
+void func130(void) { int i; for(i=0;i<10;i++) printf("Hello 130\n"); }
+void func131(void) { int i; for(i=0;i<10;i++) printf("Hello 131\n"); }
+void func132(void) { int i; for(i=0;i<10;i++) printf("Hello 132\n"); }
+void func133(void) { int i; for(i=0;i<10;i++) printf("Hello 133\n"); }
+void func134(void) { int i; for(i=0;i<10;i++) printf("Hello 134\n"); }
+void func135(void) { int i; for(i=0;i<10;i++) printf("Hello 135\n"); }
+void func136(void) { int i; for(i=0;i<10;i++) printf("Hello 136\n"); }
+void func137(void) { int i; for(i=0;i<10;i++) printf("Hello 137\n"); }
+void func138(void) { int i; for(i=0;i<10;i++) printf("Hello 138\n"); }
+void func139(void) { int i; for(i=0;i<10;i++) printf("Hello 139\n"); }
+void func140(void) { int i; for(i=0;i<10;i++) printf("Hello 140\n"); }
+void func141(void) { int i; for(i=0;i<10;i++) printf("Hello 141\n"); }
+void func142(void) { int i; for(i=0;i<10;i++) printf("Hello 142\n"); }
+void func143(void) { int i; for(i=0;i<10;i++) printf("Hello 143\n"); }
+void func144(void) { int i; for(i=0;i<10;i++) printf("Hello 144\n"); }
+void func145(void) { int i; for(i=0;i<10;i++) printf("Hello 145\n"); }
+void func146(void) { int i; for(i=0;i<10;i++) printf("Hello 146\n"); }
+void func147(void) { int i; for(i=0;i<10;i++) printf("Hello 147\n"); }
+void func148(void) { int i; for(i=0;i<10;i++) printf("Hello 148\n"); }
+void func149(void) { int i; for(i=0;i<10;i++) printf("Hello 149\n"); }
+void func150(void) { int i; for(i=0;i<10;i++) printf("Hello 150\n"); }
+void func151(void) { int i; for(i=0;i<10;i++) printf("Hello 151\n"); }
+void func152(void) { int i; for(i=0;i<10;i++) printf("Hello 152\n"); }
+void func153(void) { int i; for(i=0;i<10;i++) printf("Hello 153\n"); }
+void func154(void) { int i; for(i=0;i<10;i++) printf("Hello 154\n"); }
+void func155(void) { int i; for(i=0;i<10;i++) printf("Hello 155\n"); }
+void func156(void) { int i; for(i=0;i<10;i++) printf("Hello 156\n"); }
+void func157(void) { int i; for(i=0;i<10;i++) printf("Hello 157\n"); }
+void func158(void) { int i; for(i=0;i<10;i++) printf("Hello 158\n"); }
+void func159(void) { int i; for(i=0;i<10;i++) printf("Hello 159\n"); }
+void func160(void) { int i; for(i=0;i<10;i++) printf("Hello 160\n"); }
+void func161(void) { int i; for(i=0;i<10;i++) printf("Hello 161\n"); }
+void func162(void) { int i; for(i=0;i<10;i++) printf("Hello 162\n"); }
+void func163(void) { int i; for(i=0;i<10;i++) printf("Hello 163\n"); }
+void func164(void) { int i; for(i=0;i<10;i++) printf("Hello 164\n"); }
+void func165(void) { int i; for(i=0;i<10;i++) printf("Hello 165\n"); }
+void func166(void) { int i; for(i=0;i<10;i++) printf("Hello 166\n"); }
+void func167(void) { int i; for(i=0;i<10;i++) printf("Hello 167\n"); }
+void func168(void) { int i; for(i=0;i<10;i++) printf("Hello 168\n"); }
+void func169(void) { int i; for(i=0;i<10;i++) printf("Hello 169\n"); }
+void func170(void) { int i; for(i=0;i<10;i++) printf("Hello 170\n"); }
+void func171(void) { int i; for(i=0;i<10;i++) printf("Hello 171\n"); }
+void func172(void) { int i; for(i=0;i<10;i++) printf("Hello 172\n"); }
+void func173(void) { int i; for(i=0;i<10;i++) printf("Hello 173\n"); }
+void func174(void) { int i; for(i=0;i<10;i++) printf("Hello 174\n"); }
+void func175(void) { int i; for(i=0;i<10;i++) printf("Hello 175\n"); }
+void func176(void) { int i; for(i=0;i<10;i++) printf("Hello 176\n"); }
+void func177(void) { int i; for(i=0;i<10;i++) printf("Hello 177\n"); }
+void func178(void) { int i; for(i=0;i<10;i++) printf("Hello 178\n"); }
+void func179(void) { int i; for(i=0;i<10;i++) printf("Hello 179\n"); }
+void func180(void) { int i; for(i=0;i<10;i++) printf("Hello 180\n"); }
+void func181(void) { int i; for(i=0;i<10;i++) printf("Hello 181\n"); }
+void func182(void) { int i; for(i=0;i<10;i++) printf("Hello 182\n"); }
+void func183(void) { int i; for(i=0;i<10;i++) printf("Hello 183\n"); }
+void func184(void) { int i; for(i=0;i<10;i++) printf("Hello 184\n"); }
+void func185(void) { int i; for(i=0;i<10;i++) printf("Hello 185\n"); }
+void func186(void) { int i; for(i=0;i<10;i++) printf("Hello 186\n"); }
+void func187(void) { int i; for(i=0;i<10;i++) printf("Hello 187\n"); }
+void func188(void) { int i; for(i=0;i<10;i++) printf("Hello 188\n"); }
+void func189(void) { int i; for(i=0;i<10;i++) printf("Hello 189\n"); }
+void func190(void) { int i; for(i=0;i<10;i++) printf("Hello 190\n"); }
+void func191(void) { int i; for(i=0;i<10;i++) printf("Hello 191\n"); }
+void func192(void) { int i; for(i=0;i<10;i++) printf("Hello 192\n"); }
+void func193(void) { int i; for(i=0;i<10;i++) printf("Hello 193\n"); }
+void func194(void) { int i; for(i=0;i<10;i++) printf("Hello 194\n"); }
+void func195(void) { int i; for(i=0;i<10;i++) printf("Hello 195\n"); }
+void func196(void) { int i; for(i=0;i<10;i++) printf("Hello 196\n"); }
+void func197(void) { int i; for(i=0;i<10;i++) printf("Hello 197\n"); }
+void func198(void) { int i; for(i=0;i<10;i++) printf("Hello 198\n"); }
+void func199(void) { int i; for(i=0;i<10;i++) printf("Hello 199\n"); }
+void func200(void) { int i; for(i=0;i<10;i++) printf("Hello 200\n"); }
+void func201(void) { int i; for(i=0;i<10;i++) printf("Hello 201\n"); }
+void func202(void) { int i; for(i=0;i<10;i++) printf("Hello 202\n"); }
+void func203(void) { int i; for(i=0;i<10;i++) printf("Hello 203\n"); }
+void func204(void) { int i; for(i=0;i<10;i++) printf("Hello 204\n"); }
+void func205(void) { int i; for(i=0;i<10;i++) printf("Hello 205\n"); }
+void func206(void) { int i; for(i=0;i<10;i++) printf("Hello 206\n"); }
+void func207(void) { int i; for(i=0;i<10;i++) printf("Hello 207\n"); }
+void func208(void) { int i; for(i=0;i<10;i++) printf("Hello 208\n"); }
+void func209(void) { int i; for(i=0;i<10;i++) printf("Hello 209\n"); }
+void func210(void) { int i; for(i=0;i<10;i++) printf("Hello 210\n"); }
+void func211(void) { int i; for(i=0;i<10;i++) printf("Hello 211\n"); }
+void func212(void) { int i; for(i=0;i<10;i++) printf("Hello 212\n"); }
+void func213(void) { int i; for(i=0;i<10;i++) printf("Hello 213\n"); }
+void func214(void) { int i; for(i=0;i<10;i++) printf("Hello 214\n"); }
+void func215(void) { int i; for(i=0;i<10;i++) printf("Hello 215\n"); }
+void func216(void) { int i; for(i=0;i<10;i++) printf("Hello 216\n"); }
+void func217(void) { int i; for(i=0;i<10;i++) printf("Hello 217\n"); }
+void func218(void) { int i; for(i=0;i<10;i++) printf("Hello 218\n"); }
+void func219(void) { int i; for(i=0;i<10;i++) printf("Hello 219\n"); }
+void func220(void) { int i; for(i=0;i<10;i++) printf("Hello 220\n"); }
+void func221(void) { int i; for(i=0;i<10;i++) printf("Hello 221\n"); }
+void func222(void) { int i; for(i=0;i<10;i++) printf("Hello 222\n"); }
+void func223(void) { int i; for(i=0;i<10;i++) printf("Hello 223\n"); }
+void func224(void) { int i; for(i=0;i<10;i++) printf("Hello 224\n"); }
+void func225(void) { int i; for(i=0;i<10;i++) printf("Hello 225\n"); }
+void func226(void) { int i; for(i=0;i<10;i++) printf("Hello 226\n"); }
+void func227(void) { int i; for(i=0;i<10;i++) printf("Hello 227\n"); }
+void func228(void) { int i; for(i=0;i<10;i++) printf("Hello 228\n"); }
+void func229(void) { int i; for(i=0;i<10;i++) printf("Hello 229\n"); }
+void func230(void) { int i; for(i=0;i<10;i++) printf("Hello 230\n"); }
+void func231(void) { int i; for(i=0;i<10;i++) printf("Hello 231\n"); }
+void func232(void) { int i; for(i=0;i<10;i++) printf("Hello 232\n"); }
+void func233(void) { int i; for(i=0;i<10;i++) printf("Hello 233\n"); }
+void func234(void) { int i; for(i=0;i<10;i++) printf("Hello 234\n"); }
+void func235(void) { int i; for(i=0;i<10;i++) printf("Hello 235\n"); }
+void func236(void) { int i; for(i=0;i<10;i++) printf("Hello 236\n"); }
+void func237(void) { int i; for(i=0;i<10;i++) printf("Hello 237\n"); }
+void func238(void) { int i; for(i=0;i<10;i++) printf("Hello 238\n"); }
+void func239(void) { int i; for(i=0;i<10;i++) printf("Hello 239\n"); }
+void func240(void) { int i; for(i=0;i<10;i++) printf("Hello 240\n"); }
+void func241(void) { int i; for(i=0;i<10;i++) printf("Hello 241\n"); }
+void func242(void) { int i; for(i=0;i<10;i++) printf("Hello 242\n"); }
+void func243(void) { int i; for(i=0;i<10;i++) printf("Hello 243\n"); }
+void func244(void) { int i; for(i=0;i<10;i++) printf("Hello 244\n"); }
+void func245(void) { int i; for(i=0;i<10;i++) printf("Hello 245\n"); }
+void func246(void) { int i; for(i=0;i<10;i++) printf("Hello 246\n"); }
+void func247(void) { int i; for(i=0;i<10;i++) printf("Hello 247\n"); }
+void func248(void) { int i; for(i=0;i<10;i++) printf("Hello 248\n"); }
+void func249(void) { int i; for(i=0;i<10;i++) printf("Hello 249\n"); }
+void func250(void) { int i; for(i=0;i<10;i++) printf("Hello 250\n"); }
+void func251(void) { int i; for(i=0;i<10;i++) printf("Hello 251\n"); }
+void func252(void) { int i; for(i=0;i<10;i++) printf("Hello 252\n"); }
+void func253(void) { int i; for(i=0;i<10;i++) printf("Hello 253\n"); }
+void func254(void) { int i; for(i=0;i<10;i++) printf("Hello 254\n"); }
+void func255(void) { int i; for(i=0;i<10;i++) printf("Hello 255\n"); }
+void func256(void) { int i; for(i=0;i<10;i++) printf("Hello 256\n"); }
+void func257(void) { int i; for(i=0;i<10;i++) printf("Hello 257\n"); }
+void func258(void) { int i; for(i=0;i<10;i++) printf("Hello 258\n"); }
+void func259(void) { int i; for(i=0;i<10;i++) printf("Hello 259\n"); }
+void func260(void) { int i; for(i=0;i<10;i++) printf("Hello 260\n"); }
+void func261(void) { int i; for(i=0;i<10;i++) printf("Hello 261\n"); }
+void func262(void) { int i; for(i=0;i<10;i++) printf("Hello 262\n"); }
+void func263(void) { int i; for(i=0;i<10;i++) printf("Hello 263\n"); }
+void func264(void) { int i; for(i=0;i<10;i++) printf("Hello 264\n"); }
+void func265(void) { int i; for(i=0;i<10;i++) printf("Hello 265\n"); }
+void func266(void) { int i; for(i=0;i<10;i++) printf("Hello 266\n"); }
+void func267(void) { int i; for(i=0;i<10;i++) printf("Hello 267\n"); }
+void func268(void) { int i; for(i=0;i<10;i++) printf("Hello 268\n"); }
+void func269(void) { int i; for(i=0;i<10;i++) printf("Hello 269\n"); }
+void func270(void) { int i; for(i=0;i<10;i++) printf("Hello 270\n"); }
+void func271(void) { int i; for(i=0;i<10;i++) printf("Hello 271\n"); }
+void func272(void) { int i; for(i=0;i<10;i++) printf("Hello 272\n"); }
+void func273(void) { int i; for(i=0;i<10;i++) printf("Hello 273\n"); }
+void func274(void) { int i; for(i=0;i<10;i++) printf("Hello 274\n"); }
+void func275(void) { int i; for(i=0;i<10;i++) printf("Hello 275\n"); }
+void func276(void) { int i; for(i=0;i<10;i++) printf("Hello 276\n"); }
+void func277(void) { int i; for(i=0;i<10;i++) printf("Hello 277\n"); }
+void func278(void) { int i; for(i=0;i<10;i++) printf("Hello 278\n"); }
+void func279(void) { int i; for(i=0;i<10;i++) printf("Hello 279\n"); }
+void func280(void) { int i; for(i=0;i<10;i++) printf("Hello 280\n"); }
+void func281(void) { int i; for(i=0;i<10;i++) printf("Hello 281\n"); }
+void func282(void) { int i; for(i=0;i<10;i++) printf("Hello 282\n"); }
+void func283(void) { int i; for(i=0;i<10;i++) printf("Hello 283\n"); }
+void func284(void) { int i; for(i=0;i<10;i++) printf("Hello 284\n"); }
+void func285(void) { int i; for(i=0;i<10;i++) printf("Hello 285\n"); }
+void func286(void) { int i; for(i=0;i<10;i++) printf("Hello 286\n"); }
+void func287(void) { int i; for(i=0;i<10;i++) printf("Hello 287\n"); }
+void func288(void) { int i; for(i=0;i<10;i++) printf("Hello 288\n"); }
+void func289(void) { int i; for(i=0;i<10;i++) printf("Hello 289\n"); }
+void func290(void) { int i; for(i=0;i<10;i++) printf("Hello 290\n"); }
+void func291(void) { int i; for(i=0;i<10;i++) printf("Hello 291\n"); }
+void func292(void) { int i; for(i=0;i<10;i++) printf("Hello 292\n"); }
+void func293(void) { int i; for(i=0;i<10;i++) printf("Hello 293\n"); }
+void func294(void) { int i; for(i=0;i<10;i++) printf("Hello 294\n"); }
+void func295(void) { int i; for(i=0;i<10;i++) printf("Hello 295\n"); }
+void func296(void) { int i; for(i=0;i<10;i++) printf("Hello 296\n"); }
+void func297(void) { int i; for(i=0;i<10;i++) printf("Hello 297\n"); }
+void func298(void) { int i; for(i=0;i<10;i++) printf("Hello 298\n"); }
+void func299(void) { int i; for(i=0;i<10;i++) printf("Hello 299\n"); }
+void func300(void) { int i; for(i=0;i<10;i++) printf("Hello 300\n"); }
+void func301(void) { int i; for(i=0;i<10;i++) printf("Hello 301\n"); }
+void func302(void) { int i; for(i=0;i<10;i++) printf("Hello 302\n"); }
+void func303(void) { int i; for(i=0;i<10;i++) printf("Hello 303\n"); }
+void func304(void) { int i; for(i=0;i<10;i++) printf("Hello 304\n"); }
+void func305(void) { int i; for(i=0;i<10;i++) printf("Hello 305\n"); }
+void func306(void) { int i; for(i=0;i<10;i++) printf("Hello 306\n"); }
+void func307(void) { int i; for(i=0;i<10;i++) printf("Hello 307\n"); }
+void func308(void) { int i; for(i=0;i<10;i++) printf("Hello 308\n"); }
+void func309(void) { int i; for(i=0;i<10;i++) printf("Hello 309\n"); }
+void func310(void) { int i; for(i=0;i<10;i++) printf("Hello 310\n"); }
+void func311(void) { int i; for(i=0;i<10;i++) printf("Hello 311\n"); }
+void func312(void) { int i; for(i=0;i<10;i++) printf("Hello 312\n"); }
+void func313(void) { int i; for(i=0;i<10;i++) printf("Hello 313\n"); }
+void func314(void) { int i; for(i=0;i<10;i++) printf("Hello 314\n"); }
+void func315(void) { int i; for(i=0;i<10;i++) printf("Hello 315\n"); }
+void func316(void) { int i; for(i=0;i<10;i++) printf("Hello 316\n"); }
+void func317(void) { int i; for(i=0;i<10;i++) printf("Hello 317\n"); }
+void func318(void) { int i; for(i=0;i<10;i++) printf("Hello 318\n"); }
+void func319(void) { int i; for(i=0;i<10;i++) printf("Hello 319\n"); }
+void func320(void) { int i; for(i=0;i<10;i++) printf("Hello 320\n"); }
+void func321(void) { int i; for(i=0;i<10;i++) printf("Hello 321\n"); }
+void func322(void) { int i; for(i=0;i<10;i++) printf("Hello 322\n"); }
+void func323(void) { int i; for(i=0;i<10;i++) printf("Hello 323\n"); }
+void func324(void) { int i; for(i=0;i<10;i++) printf("Hello 324\n"); }
+void func325(void) { int i; for(i=0;i<10;i++) printf("Hello 325\n"); }
+void func326(void) { int i; for(i=0;i<10;i++) printf("Hello 326\n"); }
+void func327(void) { int i; for(i=0;i<10;i++) printf("Hello 327\n"); }
+void func328(void) { int i; for(i=0;i<10;i++) printf("Hello 328\n"); }
+void func329(void) { int i; for(i=0;i<10;i++) printf("Hello 329\n"); }
+void func330(void) { int i; for(i=0;i<10;i++) printf("Hello 330\n"); }
+void func331(void) { int i; for(i=0;i<10;i++) printf("Hello 331\n"); }
+void func332(void) { int i; for(i=0;i<10;i++) printf("Hello 332\n"); }
+void func333(void) { int i; for(i=0;i<10;i++) printf("Hello 333\n"); }
+void func334(void) { int i; for(i=0;i<10;i++) printf("Hello 334\n"); }
+void func335(void) { int i; for(i=0;i<10;i++) printf("Hello 335\n"); }
+void func336(void) { int i; for(i=0;i<10;i++) printf("Hello 336\n"); }
+void func337(void) { int i; for(i=0;i<10;i++) printf("Hello 337\n"); }
+void func338(void) { int i; for(i=0;i<10;i++) printf("Hello 338\n"); }
+void func339(void) { int i; for(i=0;i<10;i++) printf("Hello 339\n"); }
+void func340(void) { int i; for(i=0;i<10;i++) printf("Hello 340\n"); }
+void func341(void) { int i; for(i=0;i<10;i++) printf("Hello 341\n"); }
+void func342(void) { int i; for(i=0;i<10;i++) printf("Hello 342\n"); }
+void func343(void) { int i; for(i=0;i<10;i++) printf("Hello 343\n"); }
+void func344(void) { int i; for(i=0;i<10;i++) printf("Hello 344\n"); }
+void func345(void) { int i; for(i=0;i<10;i++) printf("Hello 345\n"); }
+void func346(void) { int i; for(i=0;i<10;i++) printf("Hello 346\n"); }
+void func347(void) { int i; for(i=0;i<10;i++) printf("Hello 347\n"); }
+void func348(void) { int i; for(i=0;i<10;i++) printf("Hello 348\n"); }
+void func349(void) { int i; for(i=0;i<10;i++) printf("Hello 349\n"); }
+void func350(void) { int i; for(i=0;i<10;i++) printf("Hello 350\n"); }
+void func351(void) { int i; for(i=0;i<10;i++) printf("Hello 351\n"); }
+void func352(void) { int i; for(i=0;i<10;i++) printf("Hello 352\n"); }
+void func353(void) { int i; for(i=0;i<10;i++) printf("Hello 353\n"); }
+void func354(void) { int i; for(i=0;i<10;i++) printf("Hello 354\n"); }
+void func355(void) { int i; for(i=0;i<10;i++) printf("Hello 355\n"); }
+void func356(void) { int i; for(i=0;i<10;i++) printf("Hello 356\n"); }
+void func357(void) { int i; for(i=0;i<10;i++) printf("Hello 357\n"); }
+void func358(void) { int i; for(i=0;i<10;i++) printf("Hello 358\n"); }
+void func359(void) { int i; for(i=0;i<10;i++) printf("Hello 359\n"); }
+void func360(void) { int i; for(i=0;i<10;i++) printf("Hello 360\n"); }
+void func361(void) { int i; for(i=0;i<10;i++) printf("Hello 361\n"); }
+void func362(void) { int i; for(i=0;i<10;i++) printf("Hello 362\n"); }
+void func363(void) { int i; for(i=0;i<10;i++) printf("Hello 363\n"); }
+void func364(void) { int i; for(i=0;i<10;i++) printf("Hello 364\n"); }
+void func365(void) { int i; for(i=0;i<10;i++) printf("Hello 365\n"); }
+void func366(void) { int i; for(i=0;i<10;i++) printf("Hello 366\n"); }
+void func367(void) { int i; for(i=0;i<10;i++) printf("Hello 367\n"); }
+void func368(void) { int i; for(i=0;i<10;i++) printf("Hello 368\n"); }
+void func369(void) { int i; for(i=0;i<10;i++) printf("Hello 369\n"); }
+void func370(void) { int i; for(i=0;i<10;i++) printf("Hello 370\n"); }
+void func371(void) { int i; for(i=0;i<10;i++) printf("Hello 371\n"); }
+void func372(void) { int i; for(i=0;i<10;i++) printf("Hello 372\n"); }
+void func373(void) { int i; for(i=0;i<10;i++) printf("Hello 373\n"); }
+void func374(void) { int i; for(i=0;i<10;i++) printf("Hello 374\n"); }
+void func375(void) { int i; for(i=0;i<10;i++) printf("Hello 375\n"); }
+void func376(void) { int i; for(i=0;i<10;i++) printf("Hello 376\n"); }
+void func377(void) { int i; for(i=0;i<10;i++) printf("Hello 377\n"); }
+void func378(void) { int i; for(i=0;i<10;i++) printf("Hello 378\n"); }
+void func379(void) { int i; for(i=0;i<10;i++) printf("Hello 379\n"); }
+void func380(void) { int i; for(i=0;i<10;i++) printf("Hello 380\n"); }
+void func381(void) { int i; for(i=0;i<10;i++) printf("Hello 381\n"); }
+void func382(void) { int i; for(i=0;i<10;i++) printf("Hello 382\n"); }
+void func383(void) { int i; for(i=0;i<10;i++) printf("Hello 383\n"); }
+void func384(void) { int i; for(i=0;i<10;i++) printf("Hello 384\n"); }
+void func385(void) { int i; for(i=0;i<10;i++) printf("Hello 385\n"); }
+void func386(void) { int i; for(i=0;i<10;i++) printf("Hello 386\n"); }
+void func387(void) { int i; for(i=0;i<10;i++) printf("Hello 387\n"); }
+void func388(void) { int i; for(i=0;i<10;i++) printf("Hello 388\n"); }
+void func389(void) { int i; for(i=0;i<10;i++) printf("Hello 389\n"); }
+void func390(void) { int i; for(i=0;i<10;i++) printf("Hello 390\n"); }
+void func391(void) { int i; for(i=0;i<10;i++) printf("Hello 391\n"); }
+void func392(void) { int i; for(i=0;i<10;i++) printf("Hello 392\n"); }
+void func393(void) { int i; for(i=0;i<10;i++) printf("Hello 393\n"); }
+void func394(void) { int i; for(i=0;i<10;i++) printf("Hello 394\n"); }
+void func395(void) { int i; for(i=0;i<10;i++) printf("Hello 395\n"); }
+void func396(void) { int i; for(i=0;i<10;i++) printf("Hello 396\n"); }
+void func397(void) { int i; for(i=0;i<10;i++) printf("Hello 397\n"); }
+void func398(void) { int i; for(i=0;i<10;i++) printf("Hello 398\n"); }
+void func399(void) { int i; for(i=0;i<10;i++) printf("Hello 399\n"); }
+void func400(void) { int i; for(i=0;i<10;i++) printf("Hello 400\n"); }
+void func401(void) { int i; for(i=0;i<10;i++) printf("Hello 401\n"); }
+void func402(void) { int i; for(i=0;i<10;i++) printf("Hello 402\n"); }
+void func403(void) { int i; for(i=0;i<10;i++) printf("Hello 403\n"); }
+void func404(void) { int i; for(i=0;i<10;i++) printf("Hello 404\n"); }
+void func405(void) { int i; for(i=0;i<10;i++) printf("Hello 405\n"); }
+void func406(void) { int i; for(i=0;i<10;i++) printf("Hello 406\n"); }
+void func407(void) { int i; for(i=0;i<10;i++) printf("Hello 407\n"); }
+void func408(void) { int i; for(i=0;i<10;i++) printf("Hello 408\n"); }
+void func409(void) { int i; for(i=0;i<10;i++) printf("Hello 409\n"); }
+void func410(void) { int i; for(i=0;i<10;i++) printf("Hello 410\n"); }
+void func411(void) { int i; for(i=0;i<10;i++) printf("Hello 411\n"); }
+void func412(void) { int i; for(i=0;i<10;i++) printf("Hello 412\n"); }
+void func413(void) { int i; for(i=0;i<10;i++) printf("Hello 413\n"); }
+void func414(void) { int i; for(i=0;i<10;i++) printf("Hello 414\n"); }
+void func415(void) { int i; for(i=0;i<10;i++) printf("Hello 415\n"); }
+void func416(void) { int i; for(i=0;i<10;i++) printf("Hello 416\n"); }
+void func417(void) { int i; for(i=0;i<10;i++) printf("Hello 417\n"); }
+void func418(void) { int i; for(i=0;i<10;i++) printf("Hello 418\n"); }
+void func419(void) { int i; for(i=0;i<10;i++) printf("Hello 419\n"); }
+void func420(void) { int i; for(i=0;i<10;i++) printf("Hello 420\n"); }
+void func421(void) { int i; for(i=0;i<10;i++) printf("Hello 421\n"); }
+void func422(void) { int i; for(i=0;i<10;i++) printf("Hello 422\n"); }
+void func423(void) { int i; for(i=0;i<10;i++) printf("Hello 423\n"); }
+void func424(void) { int i; for(i=0;i<10;i++) printf("Hello 424\n"); }
+void func425(void) { int i; for(i=0;i<10;i++) printf("Hello 425\n"); }
+void func426(void) { int i; for(i=0;i<10;i++) printf("Hello 426\n"); }
+void func427(void) { int i; for(i=0;i<10;i++) printf("Hello 427\n"); }
+void func428(void) { int i; for(i=0;i<10;i++) printf("Hello 428\n"); }
+void func429(void) { int i; for(i=0;i<10;i++) printf("Hello 429\n"); }
+void func430(void) { int i; for(i=0;i<10;i++) printf("Hello 430\n"); }
+void func431(void) { int i; for(i=0;i<10;i++) printf("Hello 431\n"); }
+void func432(void) { int i; for(i=0;i<10;i++) printf("Hello 432\n"); }
+void func433(void) { int i; for(i=0;i<10;i++) printf("Hello 433\n"); }
+void func434(void) { int i; for(i=0;i<10;i++) printf("Hello 434\n"); }
+void func435(void) { int i; for(i=0;i<10;i++) printf("Hello 435\n"); }
+void func436(void) { int i; for(i=0;i<10;i++) printf("Hello 436\n"); }
+void func437(void) { int i; for(i=0;i<10;i++) printf("Hello 437\n"); }
+void func438(void) { int i; for(i=0;i<10;i++) printf("Hello 438\n"); }
+void func439(void) { int i; for(i=0;i<10;i++) printf("Hello 439\n"); }
+void func440(void) { int i; for(i=0;i<10;i++) printf("Hello 440\n"); }
+void func441(void) { int i; for(i=0;i<10;i++) printf("Hello 441\n"); }
+void func442(void) { int i; for(i=0;i<10;i++) printf("Hello 442\n"); }
+void func443(void) { int i; for(i=0;i<10;i++) printf("Hello 443\n"); }
+void func444(void) { int i; for(i=0;i<10;i++) printf("Hello 444\n"); }
+void func445(void) { int i; for(i=0;i<10;i++) printf("Hello 445\n"); }
+void func446(void) { int i; for(i=0;i<10;i++) printf("Hello 446\n"); }
+void func447(void) { int i; for(i=0;i<10;i++) printf("Hello 447\n"); }
+void func448(void) { int i; for(i=0;i<10;i++) printf("Hello 448\n"); }
+void func449(void) { int i; for(i=0;i<10;i++) printf("Hello 449\n"); }
+void func450(void) { int i; for(i=0;i<10;i++) printf("Hello 450\n"); }
+void func451(void) { int i; for(i=0;i<10;i++) printf("Hello 451\n"); }
+void func452(void) { int i; for(i=0;i<10;i++) printf("Hello 452\n"); }
+void func453(void) { int i; for(i=0;i<10;i++) printf("Hello 453\n"); }
+void func454(void) { int i; for(i=0;i<10;i++) printf("Hello 454\n"); }
+void func455(void) { int i; for(i=0;i<10;i++) printf("Hello 455\n"); }
+void func456(void) { int i; for(i=0;i<10;i++) printf("Hello 456\n"); }
+void func457(void) { int i; for(i=0;i<10;i++) printf("Hello 457\n"); }
+void func458(void) { int i; for(i=0;i<10;i++) printf("Hello 458\n"); }
+void func459(void) { int i; for(i=0;i<10;i++) printf("Hello 459\n"); }
+void func460(void) { int i; for(i=0;i<10;i++) printf("Hello 460\n"); }
+void func461(void) { int i; for(i=0;i<10;i++) printf("Hello 461\n"); }
+void func462(void) { int i; for(i=0;i<10;i++) printf("Hello 462\n"); }
+void func463(void) { int i; for(i=0;i<10;i++) printf("Hello 463\n"); }
+void func464(void) { int i; for(i=0;i<10;i++) printf("Hello 464\n"); }
+void func465(void) { int i; for(i=0;i<10;i++) printf("Hello 465\n"); }
+void func466(void) { int i; for(i=0;i<10;i++) printf("Hello 466\n"); }
+void func467(void) { int i; for(i=0;i<10;i++) printf("Hello 467\n"); }
+void func468(void) { int i; for(i=0;i<10;i++) printf("Hello 468\n"); }
+void func469(void) { int i; for(i=0;i<10;i++) printf("Hello 469\n"); }
+void func470(void) { int i; for(i=0;i<10;i++) printf("Hello 470\n"); }
+void func471(void) { int i; for(i=0;i<10;i++) printf("Hello 471\n"); }
+void func472(void) { int i; for(i=0;i<10;i++) printf("Hello 472\n"); }
+void func473(void) { int i; for(i=0;i<10;i++) printf("Hello 473\n"); }
+void func474(void) { int i; for(i=0;i<10;i++) printf("Hello 474\n"); }
+void func475(void) { int i; for(i=0;i<10;i++) printf("Hello 475\n"); }
+void func476(void) { int i; for(i=0;i<10;i++) printf("Hello 476\n"); }
+void func477(void) { int i; for(i=0;i<10;i++) printf("Hello 477\n"); }
+void func478(void) { int i; for(i=0;i<10;i++) printf("Hello 478\n"); }
+void func479(void) { int i; for(i=0;i<10;i++) printf("Hello 479\n"); }
+void func480(void) { int i; for(i=0;i<10;i++) printf("Hello 480\n"); }
+void func481(void) { int i; for(i=0;i<10;i++) printf("Hello 481\n"); }
+void func482(void) { int i; for(i=0;i<10;i++) printf("Hello 482\n"); }
+void func483(void) { int i; for(i=0;i<10;i++) printf("Hello 483\n"); }
+void func484(void) { int i; for(i=0;i<10;i++) printf("Hello 484\n"); }
+void func485(void) { int i; for(i=0;i<10;i++) printf("Hello 485\n"); }
+void func486(void) { int i; for(i=0;i<10;i++) printf("Hello 486\n"); }
+void func487(void) { int i; for(i=0;i<10;i++) printf("Hello 487\n"); }
+void func488(void) { int i; for(i=0;i<10;i++) printf("Hello 488\n"); }
+void func489(void) { int i; for(i=0;i<10;i++) printf("Hello 489\n"); }
+void func490(void) { int i; for(i=0;i<10;i++) printf("Hello 490\n"); }
+void func491(void) { int i; for(i=0;i<10;i++) printf("Hello 491\n"); }
+void func492(void) { int i; for(i=0;i<10;i++) printf("Hello 492\n"); }
+void func493(void) { int i; for(i=0;i<10;i++) printf("Hello 493\n"); }
+void func494(void) { int i; for(i=0;i<10;i++) printf("Hello 494\n"); }
+void func495(void) { int i; for(i=0;i<10;i++) printf("Hello 495\n"); }
+void func496(void) { int i; for(i=0;i<10;i++) printf("Hello 496\n"); }
+void func497(void) { int i; for(i=0;i<10;i++) printf("Hello 497\n"); }
+void func498(void) { int i; for(i=0;i<10;i++) printf("Hello 498\n"); }
+void func499(void) { int i; for(i=0;i<10;i++) printf("Hello 499\n"); }
+int main(void) {
+    func0();
+    func1();
+    func2();
+    func3();
+    func4();
+    func5();
+    func6();
+    func7();
+    func8();
+    func9();
+    func10();
+    func11();
+    func12();
+    func13();
+    func14();
+    func15();
+    func16();
+    func17();
+    func18();
+    func19();
+    func20();
+    func21();
+    func22();
+    func23();
+    func24();
+    func25();
+    func26();
+    func27();
+    func28();
+    func29();
+    func30();
+    func31();
+    func32();
+    func33();
+    func34();
+    func35();
+    func36();
+    func37();
+    func38();
+    func39();
+    func40();
+    func41();
+    func42();
+    func43();
+    func44();
+    func45();
+    func46();
+    func47();
+    func48();
+    func49();
+    func50();
+    func51();
+    func52();
+    func53();
+    func54();
+    func55();
+    func56();
+    func57();
+    func58();
+    func59();
+    func60();
+    func61();
+    func62();
+    func63();
+    func64();
+    func65();
+    func66();
+    func67();
+    func68();
+    func69();
+    func70();
+    func71();
+    func72();
+    func73();
+    func74();
+    func75();
+    func76();
+    func77();
+    func78();
+    func79();
+    func80();
+    func81();
+    func82();
+    func83();
+    func84();
+    func85();
+    func86();
+    func87();
+    func88();
+    func89();
+    func90();
+    func91();
+    func92();
+    func93();
+    func94();
+    func95();
+    func96();
+    func97();
+    func98();
+    func99();
+    func100();
+    func101();
+    func102();
+    func103();
+    func104();
+    func105();
+    func106();
+    func107();
+    func108();
+    func109();
+    func110();
+    func111();
+    func112();
+    func113();
+    func114();
+    func115();
+    func116();
+    func117();
+    func118();
+    func119();
+    func120();
+    func121();
+    func122();
+    func123();
+    func124();
+    func125();
+    func126();
+    func127();
+    func128();
+    func129();
+    func130();
+    func131();
+    func132();
+    func133();
+    func134();
+    func135();
+    func136();
+    func137();
+    func138();
+    func139();
+    func140();
+    func141();
+    func142();
+    func143();
+    func144();
+    func145();
+    func146();
+    func147();
+    func148();
+    func149();
+    func150();
+    func151();
+    func152();
+    func153();
+    func154();
+    func155();
+    func156();
+    func157();
+    func158();
+    func159();
+    func160();
+    func161();
+    func162();
+    func163();
+    func164();
+    func165();
+    func166();
+    func167();
+    func168();
+    func169();
+    func170();
+    func171();
+    func172();
+    func173();
+    func174();
+    func175();
+    func176();
+    func177();
+    func178();
+    func179();
+    func180();
+    func181();
+    func182();
+    func183();
+    func184();
+    func185();
+    func186();
+    func187();
+    func188();
+    func189();
+    func190();
+    func191();
+    func192();
+    func193();
+    func194();
+    func195();
+    func196();
+    func197();
+    func198();
+    func199();
+    func200();
+    func201();
+    func202();
+    func203();
+    func204();
+    func205();
+    func206();
+    func207();
+    func208();
+    func209();
+    func210();
+    func211();
+    func212();
+    func213();
+    func214();
+    func215();
+    func216();
+    func217();
+    func218();
+    func219();
+    func220();
+    func221();
+    func222();
+    func223();
+    func224();
+    func225();
+    func226();
+    func227();
+    func228();
+    func229();
+    func230();
+    func231();
+    func232();
+    func233();
+    func234();
+    func235();
+    func236();
+    func237();
+    func238();
+    func239();
+    func240();
+    func241();
+    func242();
+    func243();
+    func244();
+    func245();
+    func246();
+    func247();
+    func248();
+    func249();
+    func250();
+    func251();
+    func252();
+    func253();
+    func254();
+    func255();
+    func256();
+    func257();
+    func258();
+    func259();
+    func260();
+    func261();
+    func262();
+    func263();
+    func264();
+    func265();
+    func266();
+    func267();
+    func268();
+    func269();
+    func270();
+    func271();
+    func272();
+    func273();
+    func274();
+    func275();
+    func276();
+    func277();
+    func278();
+    func279();
+    func280();
+    func281();
+    func282();
+    func283();
+    func284();
+    func285();
+    func286();
+    func287();
+    func288();
+    func289();
+    func290();
+    func291();
+    func292();
+    func293();
+    func294();
+    func295();
+    func296();
+    func297();
+    func298();
+    func299();
+    func300();
+    func301();
+    func302();
+    func303();
+    func304();
+    func305();
+    func306();
+    func307();
+    func308();
+    func309();
+    func310();
+    func311();
+    func312();
+    func313();
+    func314();
+    func315();
+    func316();
+    func317();
+    func318();
+    func319();
+    func320();
+    func321();
+    func322();
+    func323();
+    func324();
+    func325();
+    func326();
+    func327();
+    func328();
+    func329();
+    func330();
+    func331();
+    func332();
+    func333();
+    func334();
+    func335();
+    func336();
+    func337();
+    func338();
+    func339();
+    func340();
+    func341();
+    func342();
+    func343();
+    func344();
+    func345();
+    func346();
+    func347();
+    func348();
+    func349();
+    func350();
+    func351();
+    func352();
+    func353();
+    func354();
+    func355();
+    func356();
+    func357();
+    func358();
+    func359();
+    func360();
+    func361();
+    func362();
+    func363();
+    func364();
+    func365();
+    func366();
+    func367();
+    func368();
+    func369();
+    func370();
+    func371();
+    func372();
+    func373();
+    func374();
+    func375();
+    func376();
+    func377();
+    func378();
+    func379();
+    func380();
+    func381();
+    func382();
+    func383();
+    func384();
+    func385();
+    func386();
+    func387();
+    func388();
+    func389();
+    func390();
+    func391();
+    func392();
+    func393();
+    func394();
+    func395();
+    func396();
+    func397();
+    func398();
+    func399();
+    func400();
+    func401();
+    func402();
+    func403();
+    func404();
+    func405();
+    func406();
+    func407();
+    func408();
+    func409();
+    func410();
+    func411();
+    func412();
+    func413();
+    func414();
+    func415();
+    func416();
+    func417();
+    func418();
+    func419();
+    func420();
+    func421();
+    func422();
+    func423();
+    func424();
+    func425();
+    func426();
+    func427();
+    func428();
+    func429();
+    func430();
+    func431();
+    func432();
+    func433();
+    func434();
+    func435();
+    func436();
+    func437();
+    func438();
+    func439();
+    func440();
+    func441();
+    func442();
+    func443();
+    func444();
+    func445();
+    func446();
+    func447();
+    func448();
+    func449();
+    func450();
+    func451();
+    func452();
+    func453();
+    func454();
+    func455();
+    func456();
+    func457();
+    func458();
+    func459();
+    func460();
+    func461();
+    func462();
+    func463();
+    func464();
+    func465();
+    func466();
+    func467();
+    func468();
+    func469();
+    func470();
+    func471();
+    func472();
+    func473();
+    func474();
+    func475();
+    func476();
+    func477();
+    func478();
+    func479();
+    func480();
+    func481();
+    func482();
+    func483();
+    func484();
+    func485();
+    func486();
+    func487();
+    func488();
+    func489();
+    func490();
+    func491();
+    func492();
+    func493();
+    func494();
+    func495();
+    func496();
+    func497();
+    func498();
+    func499();
+}
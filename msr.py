@@ -1,43 +1,165 @@
 #!/usr/bin/env python3
 # library and tool to access Intel MSRs (model specific registers)
 # Author: Andi Kleen
+# DEV_CPU=... use a directory with regular files instead of /dev/cpu (for testing)
 from __future__ import print_function
+import errno
 import glob
 import struct
 import os
 
-def writemsr(msr, val):
-    n = glob.glob('/dev/cpu/[0-9]*/msr')
-    for c in n:
-        f = os.open(c, os.O_WRONLY)
-        os.lseek(f, msr, os.SEEK_SET)
-        os.write(f, struct.pack('Q', val))
-        os.close(f)
+DEV_CPU = os.getenv("DEV_CPU", "/dev/cpu")
+
+MSR = struct.Struct('Q')
+
+def msr_cpus():
+    """Return the numbers of all CPUs with a msr device."""
+    n = glob.glob(DEV_CPU + '/[0-9]*/msr')
     if not n:
         raise OSError("msr module not loaded (run modprobe msr)")
+    return sorted(int(os.path.basename(os.path.dirname(c))) for c in n)
 
-def readmsr(msr, cpu = 0):
-    f = os.open('/dev/cpu/%d/msr' % (cpu,), os.O_RDONLY)
-    os.lseek(f, msr, os.SEEK_SET)
-    val = struct.unpack('Q', os.read(f, 8))[0]
-    os.close(f)
-    return val
+def pread(fd, msr):
+    if hasattr(os, "pread"):
+        data = os.pread(fd, MSR.size, msr)
+    else:
+        os.lseek(fd, msr, os.SEEK_SET)
+        data = os.read(fd, MSR.size)
+    if len(data) < MSR.size:
+        raise OSError(errno.EIO, "Cannot read MSR %x" % msr)
+    return MSR.unpack(data)[0]
 
-def changebit(msr, bit, val):
-    n = glob.glob('/dev/cpu/[0-9]*/msr')
-    for c in n:
-        f = os.open(c, os.O_RDWR)
-        os.lseek(f, msr, os.SEEK_SET)
-        v = struct.unpack('Q', os.read(f, 8))[0]
+def pwrite(fd, msr, val):
+    if hasattr(os, "pwrite"):
+        os.pwrite(fd, MSR.pack(val), msr)
+    else:
+        os.lseek(fd, msr, os.SEEK_SET)
+        os.write(fd, MSR.pack(val))
+
+class MsrSet(object):
+    """Access MSRs on a set of CPUs (default all), keeping the msr device
+       files open between accesses. The files are opened on first use.
+       With threads > 1 the operations on all CPUs run in a thread pool
+       of that size, which helps on systems with many CPUs.
+       The CPUs are found when the set is created, so CPUs that come online
+       later need a new set, or rescan() for the shared set.
+       Use close() or a with statement to close the files."""
+
+    def __init__(self, cpus=None, write=False, threads=0):
+        self.cpus = msr_cpus() if cpus is None else list(cpus)
+        self.flags = os.O_RDWR if write else os.O_RDONLY
+        self.threads = threads
+        self.fds = {}
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        for f in self.fds.values():
+            os.close(f)
+        self.fds = {}
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+
+    def fd(self, cpu):
+        f = self.fds.get(cpu)
+        if f is None:
+            f = os.open('%s/%d/msr' % (DEV_CPU, cpu), self.flags)
+            self.fds[cpu] = f
+        return f
+
+    def read(self, msr, cpu):
+        return pread(self.fd(cpu), msr)
+
+    def write(self, msr, val, cpu):
+        pwrite(self.fd(cpu), msr, val)
+
+    def changebit(self, msr, bit, val, cpu):
+        v = self.read(msr, cpu)
         if val:
             v = v | (1 << bit)
         else:
             v = v & ~(1 << bit)
-        os.lseek(f, msr, os.SEEK_SET)
-        os.write(f, struct.pack('Q', v))
-        os.close(f)
-    if not n:
-        raise OSError("msr module not loaded (run modprobe msr)")
+        self.write(msr, v, cpu)
+
+    def map(self, func):
+        """Return [func(cpu) for cpu in cpus], run in the thread pool when enabled."""
+        if self.threads > 1 and len(self.cpus) > 1:
+            if self.pool is None:
+                from multiprocessing.pool import ThreadPool
+                self.pool = ThreadPool(min(self.threads, len(self.cpus)))
+            return self.pool.map(func, self.cpus)
+        return [func(c) for c in self.cpus]
+
+    def readmsrs(self, msrs, cpu):
+        """Read the list of msrs on cpu. MSRs that cannot be read are None."""
+        fd = self.fd(cpu)
+        if hasattr(os, "pread"):
+            # fast path when all can be read
+            try:
+                data = b"".join([os.pread(fd, MSR.size, m) for m in msrs])
+                if len(data) == MSR.size * len(msrs):
+                    return list(struct.unpack("%dQ" % len(msrs), data))
+            except OSError:
+                pass
+        vals = []
+        for msr in msrs:
+            try:
+                vals.append(self.read(msr, cpu))
+            except OSError:
+                vals.append(None)
+        return vals
+
+    def read_all(self, msrs):
+        """Read the list of msrs on all CPUs. Returns a dict cpu->list of values,
+           with None for the MSRs that cannot be read."""
+        return dict(zip(self.cpus, self.map(lambda cpu: self.readmsrs(msrs, cpu))))
+
+    def write_all(self, msr, val):
+        self.map(lambda cpu: self.write(msr, val, cpu))
+
+    def changebit_all(self, msr, bit, val):
+        self.map(lambda cpu: self.changebit(msr, bit, val, cpu))
+
+# shared by the functions below, to keep the files open between calls
+sets = {}
+
+def default_set(write):
+    s = sets.get(write)
+    if s is None:
+        s = sets[write] = MsrSet(write=write)
+    return s
+
+def rescan():
+    """Find the CPUs again on the next access, e.g. after CPUs came online."""
+    for s in sets.values():
+        s.close()
+    sets.clear()
+
+def on_all_cpus(func):
+    # a CPU that went offline since the set was created fails with
+    # ENXIO or ENOENT. Only then find the CPUs again and retry.
+    try:
+        func(default_set(True))
+    except OSError as e:
+        if e.errno not in (errno.ENXIO, errno.ENOENT):
+            raise
+        rescan()
+        func(default_set(True))
+
+def writemsr(msr, val):
+    on_all_cpus(lambda s: s.write_all(msr, val))
+
+def readmsr(msr, cpu = 0):
+    return pread(default_set(False).fd(cpu), msr)
+
+def changebit(msr, bit, val):
+    on_all_cpus(lambda s: s.changebit_all(msr, bit, val))
 
 if __name__ == '__main__':
     import argparse
@@ -48,7 +170,7 @@ if __name__ == '__main__':
         except ValueError:
             raise argparse.ArgumentError("Bad hex number %s" % (s))
 
-    if not os.path.exists("/dev/cpu/0/msr"):
+    if not os.path.exists(DEV_CPU + "/0/msr"):
         os.system("/sbin/modprobe msr")
 
     p = argparse.ArgumentParser(description='Access x86 model specific registers.')
@@ -57,12 +179,21 @@ if __name__ == '__main__':
     p.add_argument('--setbit', type=int, help='Bit number to set')
     p.add_argument('--clearbit', type=int, help='Bit number to clear')
     p.add_argument('--cpu', type=int, default=0, help='CPU to read on (writes always change all)')
+    p.add_argument('--all', action='store_true', help='Read on all CPUs')
+    p.add_argument('--threads', type=int, default=0, help='Access the CPUs with THREADS threads')
     args = p.parse_args()
-    if args.value is None and not args.setbit and not args.clearbit:
-        print("%x" % (readmsr(args.msr, args.cpu)))
-    elif args.setbit:
-        changebit(args.msr, args.setbit, 1)
-    elif args.clearbit:
-        changebit(args.msr, args.clearbit, 0)
+    if args.value is None and args.setbit is None and args.clearbit is None:
+        if args.all:
+            with MsrSet(threads=args.threads) as s:
+                for cpu, vals in sorted(s.read_all([args.msr]).items()):
+                    print("%d: %s" % (cpu, "%x" % vals[0] if vals[0] is not None else "-"))
+        else:
+            print("%x" % (readmsr(args.msr, args.cpu)))
     else:
-        writemsr(args.msr, args.value)
+        with MsrSet(write=True, threads=args.threads) as s:
+            if args.setbit is not None:
+                s.changebit_all(args.msr, args.setbit, 1)
+            elif args.clearbit is not None:
+                s.changebit_all(args.msr, args.clearbit, 0)
+            else:
+                s.write_all(args.msr, args.value)
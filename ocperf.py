@@ -45,6 +45,7 @@
 # Needed for uncore units. This is useful to generate perf command lines for other systems.
 #
 # OCVERBOSE=1 print which files are opened
+# EVENTMAP_NOCACHE=1 don't use the cache of decoded event lists in ~/.cache/pmu-events/cache
 #
 # Special arguments:
 # --no-period   Never add a period
@@ -66,6 +67,8 @@ else:
     from shlex import quote
 import itertools
 import glob
+import pickle
+import hashlib
 from pmudef import EVENTSEL_ANY, EVENTSEL_INV, EVMASK, extra_flags, EVENTSEL_UMASK2
 if sys.version_info.major == 3:
     import typing # noqa
@@ -143,6 +146,8 @@ class PerfVersion(object):
             version = ""
         if not isinstance(version, str):
             version = version.decode('utf-8')
+        self.perf = perf
+        self.string = version
         m = re.match(r"perf version (\d+)\.(\d+)\.", version)
         version = 412 # assume that no match is new enough
         if m:
@@ -272,7 +277,31 @@ def gen_name(n, sup):
         n += "_k"
     return n
 
-class Event(object):
+class LazyDescs(object):
+    """Descriptions of a cached event list. Only unpickled when first needed."""
+    def __init__(self, blob):
+        self.blob = blob
+        self.descs = None
+
+    def get(self, i):
+        if self.descs is None:
+            self.descs = pickle.loads(self.blob)
+            self.blob = None
+        return self.descs[i]
+
+    def __deepcopy__(self, memo):
+        return self
+
+class LazyDesc(object):
+    """Load the description of an event from the event list cache on demand."""
+    def __getattr__(self, name):
+        d = self.__dict__
+        if name == "desc" and "descs" in d:
+            self.desc = d["descs"].get(d["desc_index"])
+            return self.desc
+        raise AttributeError(name)
+
+class Event(LazyDesc):
     def __init__(self, name, val, desc):
         self.val = val
         self.name = name
@@ -405,7 +434,7 @@ def convert_uncore(flags, extra_map):
                 break
     return o
 
-class UncoreEvent(object):
+class UncoreEvent(LazyDesc):
     def __init__(self, name, row):
         self.name = name
         e = self
@@ -593,6 +622,83 @@ def update_ename(ev, name):
         ev.name = name
     return ev
 
+# bump when the decoded Event/UncoreEvent fields change
+EMAP_CACHE_VERSION = 1
+
+def emap_cache_name(name, kind):
+    h = hashlib.sha1(os.path.abspath(name).encode('utf-8')).hexdigest()[:12]
+    return "%s/cache/%s.%s-%s.pickle" % (event_download.getdir(), os.path.basename(name), kind, h)
+
+def file_sha1(name):
+    with open(name, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def emap_cache_put(cname, hdr, evblob, descblob):
+    import tempfile # only needed when the cache is (re)written
+    d = os.path.dirname(cname)
+    if not os.path.isdir(d):
+        os.makedirs(d)
+    fd, tmp = tempfile.mkstemp(dir=d)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((hdr, evblob, descblob), f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp, cname)
+    except (OSError, IOError):
+        os.remove(tmp)
+        raise
+
+def emap_cache_read(name, key, cls):
+    """Return the decoded events of event list name from the cache, or None
+       if not cached or out of date. The descriptions are loaded lazily."""
+    if os.getenv("EVENTMAP_NOCACHE"):
+        return None
+    # the cache is only an optimization, so ignore any problems with it
+    try:
+        st = os.stat(name)
+        cname = emap_cache_name(name, key[0])
+        with open(cname, "rb") as f:
+            hdr, evblob, descblob = pickle.load(f)
+        if hdr[:2] != (EMAP_CACHE_VERSION, key):
+            return None
+        if hdr[2:4] != (st.st_mtime, st.st_size):
+            # touched, but possibly not changed (e.g. downloaded again)
+            if hdr[4] != file_sha1(name):
+                return None
+            emap_cache_put(cname, hdr[:2] + (st.st_mtime, st.st_size, hdr[4]), evblob, descblob)
+        descs = LazyDescs(descblob)
+        events = []
+        for d in pickle.loads(evblob):
+            e = cls.__new__(cls)
+            d["descs"] = descs
+            e.__dict__ = d
+            events.append(e)
+    except Exception:
+        return None
+    if ocverbose:
+        print("cached", name, file=sys.stderr)
+    return events
+
+def emap_cache_write(name, key, events):
+    """Save the decoded events of event list name. The descriptions are pickled
+       separately so that they don't need to be unpickled for a simple lookup."""
+    if os.getenv("EVENTMAP_NOCACHE"):
+        return
+    try:
+        st = os.stat(name)
+        evl, descl = [], []
+        for i, e in enumerate(events):
+            d = dict(e.__dict__)
+            descl.append(d.pop("desc"))
+            d["desc_index"] = i
+            evl.append(d)
+        emap_cache_put(emap_cache_name(name, key[0]),
+                (EMAP_CACHE_VERSION, key, st.st_mtime, st.st_size, file_sha1(name)),
+                pickle.dumps(evl, pickle.HIGHEST_PROTOCOL),
+                pickle.dumps(descl, pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        if ocverbose:
+            print("cannot write event list cache for", name, file=sys.stderr)
+
 def json_open(name):
     if ocverbose:
         print("open", name, file=sys.stderr)
@@ -613,7 +719,6 @@ class EmapNativeJSON(object):
         self.events = {}
         self.perf_events = {}
         self.codes = {}
-        self.desc = {}
         self.pevents = {}
         self.latego = False
         self.uncore_events = {}
@@ -628,10 +733,19 @@ class EmapNativeJSON(object):
         if e.pname:
             self.pevents[e.pname] = e
         self.codes[e.val] = e
-        self.desc[e.name] = e.desc
         e.pmu = self.pmu
 
+    @property
+    def desc(self):
+        return {k: e.desc for k, e in self.events.items()}
+
     def read_table(self, r):
+        for e in self.decode_table(r):
+            self.add_event(e)
+
+    def decode_table(self, r):
+        """Decode a JSON event table into a list of Events."""
+        events = []
         for row in r:
             def get(x):
                 if isinstance(row[x], bool):
@@ -722,7 +836,8 @@ class EmapNativeJSON(object):
                 if val & flag:
                     e.newextra += ",%s=%d" % (name, (val & flag) >> ffs(flag), )
             e.period = int(get(u'SampleAfterValue')) if u'SampleAfterValue' in row else 0
-            self.add_event(e)
+            events.append(e)
+        return events
 
     def getevent(self, e, nocheck=False, extramsg=[]):
         """Retrieve an event with name e. Return Event object or None.
@@ -805,7 +920,7 @@ class EmapNativeJSON(object):
             wrap = textwrap.TextWrapper(initial_indent="     ",
                                         subsequent_indent="     ")
         for k in sorted(self.events.keys()):
-            print_event(k, self.desc[k], f, human, wrap, self.pmu)
+            print_event(k, self.events[k].desc, f, human, wrap, self.pmu)
         if uncore:
             for k in sorted(self.uncore_events.keys()):
                 print_event(k, self.uncore_events[k].desc, f, human, wrap)
@@ -814,13 +929,20 @@ class EmapNativeJSON(object):
         """Read JSON normal events table."""
         if name.find("JKT") >= 0 or name.find("Jaketown") >= 0:
             self.latego = True
-        try:
-            data = json_open(name)
-        except ValueError as e:
-            print("Cannot parse", name + ":", e.message, file=sys.stderr)
-            self.error = True
-            return
-        self.read_table(data)
+        # the decoding depends on the perf capabilities
+        key = ("core", version.offcore, version.ldlat)
+        events = emap_cache_read(name, key, Event)
+        if events is None:
+            try:
+                data = json_open(name)
+            except ValueError as e:
+                print("Cannot parse", name + ":", e.message, file=sys.stderr)
+                self.error = True
+                return
+            events = self.decode_table(data)
+            emap_cache_write(name, key, events)
+        for e in events:
+            self.add_event(e)
         if "topdown.slots" in self.events:
             self.add_topdown()
 
@@ -864,13 +986,19 @@ class EmapNativeJSON(object):
             create_event(*(a + b))
 
     def add_uncore(self, name, force=False):
-        data = json_open(name)
-        for row in data:
-            name = row['EventName'].lower()
-            try:
-                self.uncore_events[name] = UncoreEvent(name, row)
-            except UnicodeEncodeError:
-                pass
+        # the ncu mapping depends on the uncore boxes of the system
+        key = ("uncore", box_exists("clock"))
+        events = emap_cache_read(name, key, UncoreEvent)
+        if events is None:
+            events = []
+            for row in json_open(name):
+                try:
+                    events.append(UncoreEvent(row['EventName'].lower(), row))
+                except UnicodeEncodeError:
+                    pass
+            emap_cache_write(name, key, events)
+        for e in events:
+            self.uncore_events[e.name] = e
 
     def add_topdown(self):
         def td_event(name, pname, desc, counter):
@@ -9,6 +9,7 @@ import matplotlib
 if os.getenv("DISPLAY") is None:
     matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import downsample
 
 
 ap = argparse.ArgumentParser(usage='Plot already normalized CSV data')
@@ -16,32 +17,42 @@ ap.add_argument('--output', '-o', help='Output to file. Otherwise show.',
                 nargs='?')
 ap.add_argument('inf', nargs='?', default=sys.stdin, type=argparse.FileType('r'),
                 help='input CSV file')
+ap.add_argument('--max-points', type=int, help='Downsample each column to at most N points, '
+                'keeping minimums and maximums. 0 for all points. Default is twice the figure width in pixels')
+ap.add_argument('--start', type=float, help='Only plot from time stamp START (seconds)')
+ap.add_argument('--end', type=float, help='Only plot until time stamp END (seconds)')
 args = ap.parse_args()
+if args.max_points is None:
+    args.max_points = downsample.default_max_points(plt)
 
 inf = args.inf
 
 rc = csv.reader(inf)
 
 num = 0
-timestamps = []
 columns = {}
 for r in rc:
     num += 1
     if num == 1:
         for j in r[1:]:
-            columns[j] = []
+            columns[j] = downsample.Downsample(args.max_points)
+        continue
+    try:
+        ts = float(r[0])
+    except ValueError:
+        continue
+    if not downsample.in_window(ts, args.start, args.end):
         continue
-    timestamps.append(r[0])
     c = 1
-    for j in columns:
+    for j in columns.values():
         try:
-            columns[j].append(float(r[c]))
-        except ValueError:
-            columns[j].append(float('nan'))
+            j.add(ts, float(r[c]))
+        except (ValueError, IndexError):
+            j.add(ts, float('nan'))
         c += 1
 
 for j in columns:
-    plt.plot(timestamps, columns[j], label=j)
+    plt.plot(*columns[j].points(), label=j)
 leg = plt.legend()
 leg.get_frame().set_alpha(0.5)
 if args.output:
@@ -6,7 +6,7 @@ import os
 import re
 import argparse
 from math import isnan, trunc
-from collections import defaultdict
+import numpy as np
 import matplotlib
 if os.getenv('DISPLAY') is None:
     matplotlib.use('Agg')
@@ -24,6 +24,11 @@ def parse_args():
     p.add_argument('--title', help='Set title of plot', nargs='?')
     p.add_argument('--quiet', help='Be quiet', action='store_true')
     p.add_argument('--cpu', help='CPU to plot (by default first)')  # XXX
+    p.add_argument('--group', choices=('cpu', 'core', 'socket', 'all'),
+                   help='Plot the average of every CPU, core, socket, or of all CPUs, '
+                   'each into its own plot. The output file names get the group appended.')
+    p.add_argument('--window', type=float,
+                   help='Split into a separate plot for every WINDOW seconds')
     return p.parse_args()
 
 args = parse_args()
@@ -39,48 +44,96 @@ if args.xkcd:
 
 data = tldata.TLData(args.file, args.verbose)
 data.update()
+series = data.arrays()
 
 levels = data.levels
-timestamps = data.times
-ratios = defaultdict(list)
-# XXX plot multiple cpus instead
-cpu = None
-if args.cpu:
-    cpu = args.cpu
-elif 'CLKS' in data.headers and len(data.vals) > 0:
-    # pick CPU with highest utilization. XXX look at all time series
-    util = sorted([(data.vals[0][x], x[1]) for x in data.vals[0].keys() if x[0] == 'CLKS'],
-                  reverse=True)
-    cpu = util[0][1]
-elif len(data.cpus) > 0:
-    cpu = sorted(sorted(data.cpus), key=len, reverse=True)[0]
+names = series.names
+name_ind = {n: i for i, n in enumerate(names)}
+
+def pick_cpu():
+    if args.cpu:
+        return args.cpu
+    if 'CLKS' in name_ind and len(series.times) > 0:
+        # pick CPU with highest utilization. XXX look at all time series
+        k = np.flatnonzero((series.name == name_ind['CLKS']) & ~np.isnan(series.values[:, 0]))
+        if len(k) > 0:
+            util = sorted([(series.values[x, 0], series.cpus[series.cpu[x]]) for x in k],
+                          reverse=True)
+            return util[0][1]
+    if len(data.cpus) > 0:
+        return sorted(sorted(data.cpus), key=len, reverse=True)[0]
+    return None
 
 def cpumatch(x, cpu, base):
     return x.startswith(cpu) or x == base
 
-if cpu:
-    base = None
-    m = re.match(r'C\d+', cpu)
-    if m:
-        base = m.group(0)
-    aliases = [x for x in data.cpus if cpumatch(x, cpu, base)]
-    print("plotting cpus:", " ".join(sorted(aliases)))
-else:
-    aliases = []
-if len(aliases) == 0:
-    aliases = [None]
-
-for h in data.headers:
-    def findval(d):
-        for c in aliases:
-            if (h, c) in d:
-                return d[(h, c)]
-        return float('nan')
-
-    ratios[h] = list(map(findval, data.vals))
+def cpu_ratios(cpu):
+    """Return ratios[name, time] of the first CPU matching cpu with a value."""
+    if cpu:
+        base = None
+        m = re.match(r'C\d+', cpu)
+        if m:
+            base = m.group(0)
+        aliases = [x for x in data.cpus if cpumatch(x, cpu, base)]
+        print("plotting cpus:", " ".join(sorted(aliases)))
+    else:
+        aliases = []
+    if len(aliases) == 0:
+        aliases = [None]
+    ratios = np.full((len(names), len(series.times)), np.nan)
+    for c in reversed(aliases):
+        if c not in series.cpus:
+            continue
+        k = np.flatnonzero(series.cpu == series.cpus.index(c))
+        v = series.values[k]
+        ratios[series.name[k]] = np.where(np.isnan(v), ratios[series.name[k]], v)
+    return ratios
+
+def group_key(cpu):
+    # values without CPU are for the whole system
+    if cpu is None or args.group == 'all':
+        return 'all'
+    if args.group == 'core':
+        return re.sub(r'-T\d+$', '', cpu)
+    if args.group == 'socket':
+        m = re.match(r'S\d+', cpu)
+        if m:
+            return m.group(0)
+        # toplev leaves out the socket with a single socket
+        if re.match(r'C\d+', cpu):
+            return 'S0'
+    # no topology in the name
+    return cpu
+
+def group_ratios():
+    """Return the group names and the average ratios[group, name, time] of the CPUs in each group."""
+    keys = [group_key(c) for c in series.cpus]
+    groups = sorted(set(keys[c] for c in set(series.cpu)))
+    gind = {g: i for i, g in enumerate(groups)}
+    cpu_group = np.array([gind.get(k, 0) for k in keys], dtype=int)
+    key = cpu_group[series.cpu] * len(names) + series.name
+    valid = ~np.isnan(series.values)
+    sums = np.zeros((len(groups) * len(names), len(series.times)))
+    counts = np.zeros_like(sums)
+    np.add.at(sums, key, np.where(valid, series.values, 0.))
+    np.add.at(counts, key, valid)
+    for g in groups:
+        print("plotting %s:" % g, " ".join(sorted(c for c, k in zip(series.cpus, keys)
+                                                  if k == g and c is not None)))
+    with np.errstate(invalid='ignore'):
+        return groups, (sums / counts).reshape((len(groups), len(names), len(series.times)))
+
+def windows(timestamps):
+    """Return label, time slice for every window."""
+    if not args.window or len(timestamps) == 0:
+        return [(None, slice(None))]
+    w = np.floor((timestamps - timestamps[0]) / args.window).astype(int)
+    starts = np.flatnonzero(np.diff(w, prepend=-1))
+    ends = list(starts[1:]) + [len(w)]
+    return [("w%d" % w[s], slice(s, e)) for s, e in zip(starts, ends)]
 
 def valid_row(r):
-    s = sum(r)
+    s = np.sum(r)
     #if sum([0 if isnan(x) else 1 for x in r]) < len(r)/80.:
     #    return False
     return s != 0.0 and not isnan(s)
@@ -105,71 +158,90 @@ def suffix(x):
         return x[dot + 1:]
     return x
 
-n = 0
-numplots = len(levels.keys())
-ax = None
-yset = False
-max_legend = 0
-xaxis = None
-legend_bbox = (0., 0., -0.07, -0.03)
-legend_loc = 2
-
-for l in tldata.level_order(data):
-    non_null = [x for x in levels[l] if valid_row(ratios[x])]
-    if not non_null:
+def plot(timestamps, ratios, title, output):
+    """Plot all levels of ratios[name, time] into a new figure."""
+    fig = plt.figure()
+    n = 0
+    numplots = len(levels.keys())
+    ax = None
+    max_legend = 0
+    xaxis = None
+    legend_bbox = (0., 0., -0.07, -0.03)
+    legend_loc = 2
+
+    for l in tldata.level_order(data):
+        non_null = [x for x in levels[l] if valid_row(ratios[name_ind[x]])]
+        if not non_null:
+            n += 1
+            continue
+        all_colors = get_colors(non_null)
+        ax = plt.subplot2grid((numplots, 1), (n, 0), sharex=xaxis)
+        plt.tight_layout()
+        set_title(ax, l)
+        rows = ratios[[name_ind[x] for x in non_null]]
+        r = np.where(np.isnan(rows), 0.0, rows)
+
+        if gen_level.is_metric(non_null[0]):
+            for j, name in zip(r, non_null):
+                stack = ax.plot(timestamps, j, label=name)
+            leg = plt.legend(ncol=6,
+                             loc=legend_loc,
+                             bbox_to_anchor=legend_bbox,
+                             prop={'size':6})
+            low = np.min(rows)
+            high = np.max(rows)
+            if not isnan(low) and not isnan(high):
+                ax.yaxis.set_ticks([low, trunc(((high - low) / 2.0) / 100.) * 100., high])
+        else:
+            stack = ax.stackplot(timestamps, *r, colors=all_colors)
+            ax.set_ylim(0, 100)
+            ax.yaxis.set_ticks([0., 50., 100.])
+            p = [plt.Rectangle((0, 0), 1, 1, fc=pc.get_facecolor()[0]) for pc in stack]
+            leg = plt.legend(p, list(map(suffix, non_null)),
+                    ncol=6,
+                    bbox_to_anchor=legend_bbox,
+                    loc=legend_loc,
+                    prop={'size':6})
+        leg.get_frame().set_alpha(0.5)
+        for j in ax.get_xticklabels() + ax.get_yticklabels():
+            j.set_fontsize(6)
+        if not xaxis:
+            xaxis = ax
+        if n != numplots:
+            max_legend = max(len(non_null), max_legend)
+        #ax.margins(0, 0)
         n += 1
-        continue
-    all_colors = get_colors(non_null)
-    ax = plt.subplot2grid((numplots, 1), (n, 0), sharex=xaxis)
-    plt.tight_layout()
-    set_title(ax, l)
-    r = [[y if not isnan(y) else 0.0 for y in ratios[x]] for x in non_null]
-
-    if gen_level.is_metric(non_null[0]):
-        for j, name in zip(r, non_null):
-            stack = ax.plot(timestamps, j, label=name)
-        leg = plt.legend(ncol=6,
-                         loc=legend_loc,
-                         bbox_to_anchor=legend_bbox,
-                         prop={'size':6})
-        low = min([min(ratios[x]) for x in non_null])
-        high = max([max(ratios[x]) for x in non_null])
-        if not isnan(low) and not isnan(high):
-            ax.yaxis.set_ticks([low, trunc(((high - low) / 2.0) / 100.) * 100., high])
-    else:
-        stack = ax.stackplot(timestamps, *r, colors=all_colors)
-        ax.set_ylim(0, 100)
-        ax.yaxis.set_ticks([0., 50., 100.])
-        p = [plt.Rectangle((0, 0), 1, 1, fc=pc.get_facecolor()[0]) for pc in stack]
-        leg = plt.legend(p, list(map(suffix, non_null)),
-                ncol=6,
-                bbox_to_anchor=legend_bbox,
-                loc=legend_loc,
-                prop={'size':6})
-    leg.get_frame().set_alpha(0.5)
-    for j in ax.get_xticklabels() + ax.get_yticklabels():
-        j.set_fontsize(6)
-    if not xaxis:
-        xaxis = ax
-    #if n >= 2 and not yset and l != -1:
-    #    ax.set_ylabel('(% of execution time)')
-    #    yset = True
-    if n != numplots:
-        max_legend = max(len(non_null), max_legend)
-    #ax.margins(0, 0)
-    n += 1
-
-if len(timestamps) == 1:
-    plt.gca().axes.get_xaxis().set_visible(False)
-
-plt.subplots_adjust(hspace=1.5 if max_legend > 6 else 0.9, bottom=0.20,
-                    top=0.95)
-
-if args.title:
-    #plt.subplot(numplots, 1, 1)
-    plt.title(args.title)
-
-if args.output:
-    plt.savefig(args.output)
+
+    if len(timestamps) == 1:
+        plt.gca().axes.get_xaxis().set_visible(False)
+
+    plt.subplots_adjust(hspace=1.5 if max_legend > 6 else 0.9, bottom=0.20,
+                        top=0.95)
+
+    if title:
+        #plt.subplot(numplots, 1, 1)
+        plt.title(title)
+
+    if output:
+        plt.savefig(output)
+        plt.close(fig)
+
+def output_name(label):
+    if not args.output or not label:
+        return args.output
+    base, ext = os.path.splitext(args.output)
+    return "%s-%s%s" % (base, label, ext)
+
+def title(label):
+    return " ".join([x for x in (args.title, label) if x])
+
+if args.group:
+    groups, group_vals = group_ratios()
 else:
+    groups, group_vals = [None], [cpu_ratios(pick_cpu())]
+for group, ratios in zip(groups, group_vals):
+    for win, sl in windows(series.times):
+        label = "-".join([x for x in (group, win) if x])
+        plot(series.times[sl], ratios[:, sl], title(label), output_name(label))
+if not args.output:
     plt.show()
@@ -2,6 +2,8 @@
 # serve toplev csv file as http using dygraph
 # toplev.py -I100 -o x.csv -v -x, ...
 # tl-serve.py x.csv [host [port]]
+# The csv data urls accept ?start=&end=&points= to return at most points
+# rows between the start and end time stamps, downsampled to min/max/mean.
 from __future__ import print_function
 import string
 import argparse
@@ -10,10 +12,29 @@ import re
 import os
 import signal
 import sys
+import threading
+from bisect import bisect_left, bisect_right
 try:
     import BaseHTTPServer
 except ImportError:
     import http.server as BaseHTTPServer
+try:
+    from http.server import ThreadingHTTPServer
+except ImportError:
+    try:
+        import SocketServer as socketserver
+    except ImportError:
+        import socketserver
+    class ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+        daemon_threads = True
+try:
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    from urlparse import urlparse, parse_qs
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 import tldata
 
 ap = argparse.ArgumentParser(usage="Serve toplev csv file as http or generate in directory")
@@ -29,6 +50,8 @@ T = string.Template
 
 data = tldata.TLData(args.csvfile, args.verbose)
 data.update()
+# serializes the data updates and the pyramids between the server threads
+data_lock = threading.Lock()
 
 def jsname(n):
     return n.replace(".", "_").replace("-", "_")
@@ -54,6 +77,23 @@ var graphs = []
 var goptions = []
 var num_graphs = 0
 var block_redraw = false
+var points = 1000
+
+function data_url(i, range) {
+    url = goptions[i].base + "?points=" + points
+    if (range)
+        url += "&start=" + range[0] + "&end=" + range[1]
+    return url
+}
+
+// reload the data of all graphs downsampled for the new time range
+function zoom_graphs(minX, maxX, yRanges) {
+    range = this.isZoomed('x') ? [minX, maxX] : null
+    for (i = 0; i < num_graphs; i++) {
+        goptions[i].file = data_url(i, range)
+        graphs[i].updateOptions({file: goptions[i].file})
+    }
+}
 
 function enable(el) {
     for (i = 0; i < cpus.length; i++) {
@@ -231,8 +271,10 @@ def gen_html_cpu(cpu):
     }
     goptions[i].unhighlightCallback = unhilight_help
     goptions[i].drawCallback = draw_graph
-    graphs[i] = new Dygraph(document.getElementById("d_${cpu}_$name"), "$cpu.$file.csv", goptions[i])
-    goptions[i]["file"] = "$cpu.$file.csv"
+    goptions[i].zoomCallback = zoom_graphs
+    goptions[i].base = "$cpu.$file.csv"
+    goptions[i].file = data_url(i, null)
+    graphs[i] = new Dygraph(document.getElementById("d_${cpu}_$name"), goptions[i].file, goptions[i])
 </script>
                 """).substitute({"name": name, "jname": jsname(name), "file": name, "cpu": cpu, "opts": opts})
     return graph
@@ -252,12 +294,189 @@ def get_postfix(s):
         return m.group(1)
     return s
 
-def gencsv(wfile, l, cpu):
-    hdr = sorted(data.levels[l])
-    wr = csv.writer(wfile, lineterminator='\n')
-    wr.writerow(["Timestamp"] + map(get_postfix, hdr))
-    for val, ts in zip(data.vals, data.times):
-        wr.writerow([ts] + [val[(x, cpu)] if (x, cpu) in val else "" for x in hdr])
+NAN = float('nan')
+# number of intervals or buckets aggregated into a bucket of the next pyramid level
+FANOUT = 8
+
+def aggregate(vals):
+    """Return min, max, sum, count of vals, skipping missing (NaN) values."""
+    vals = [v for v in vals if v == v]
+    if not vals:
+        return NAN, NAN, 0.0, 0
+    return min(vals), max(vals), sum(vals), len(vals)
+
+def merge(mn, mx, sm, cnt):
+    """Merge lists of min, max, sum, count into one bucket."""
+    return min(mn), max(mx), sum(sm), sum(cnt)
+
+class Tail(object):
+    """Read only view of a list that is only changed from index start on.
+       The items before start are read from the list, the others are copied."""
+
+    def __init__(self, l, start):
+        self.l = l
+        self.start = min(start, len(l))
+        self.tail = l[self.start:]
+        self.n = self.start + len(self.tail)
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if i < self.start:
+            return self.l[i]
+        return self.tail[i - self.start]
+
+class Pyramid(object):
+    """Downsampling index for the nodes of a level on a CPU.
+       Bucket b of pyramid level k has the min/max/sum/count of the
+       intervals b*FANOUT**(k+1) until (b+1)*FANOUT**(k+1)."""
+
+    def __init__(self, names, cpu, resets=0):
+        self.names = names
+        self.cpu = cpu
+        # the TLData reset count the pyramid was built from
+        self.resets = resets
+        self.times = []
+        self.raw = [[] for _ in names]
+        # levels[k][node] is [min, max, sum, count] lists
+        self.levels = []
+
+    def update(self, times, vals):
+        # TLData fills in the last interval while its rows arrive,
+        # so always copy it again
+        start = max(len(self.times) - 1, 0)
+        del self.times[start:]
+        for col in self.raw:
+            del col[start:]
+        for ts, val in zip(times[start:], vals[start:]):
+            self.times.append(ts)
+            for col, name in zip(self.raw, self.names):
+                col.append(val.get((name, self.cpu), NAN))
+        n = len(self.times)
+        if n == start:
+            return
+        # recompute the buckets touched by the new intervals, level by level
+        size = FANOUT
+        k = 0
+        while size < n * FANOUT:
+            if k == len(self.levels):
+                self.levels.append([[[], [], [], []] for _ in self.names])
+            first = start // size
+            nb = (n + size - 1) // size
+            for node, agg in enumerate(self.levels[k]):
+                for col in agg:
+                    del col[first:]
+                for b in range(first, nb):
+                    if k == 0:
+                        r = aggregate(self.raw[node][b * FANOUT:(b + 1) * FANOUT])
+                    else:
+                        r = merge(*[col[b * FANOUT:(b + 1) * FANOUT]
+                                    for col in self.levels[k - 1][node]])
+                    for col, v in zip(agg, r):
+                        col.append(v)
+            size *= FANOUT
+            k += 1
+
+    def snapshot(self):
+        """Return a copy that can be queried without holding data_lock.
+           Later updates only change the last interval and the buckets
+           that contain it, so only these are copied."""
+        s = Pyramid(self.names, self.cpu, self.resets)
+        start = max(len(self.times) - 1, 0)
+        s.times = Tail(self.times, start)
+        s.raw = [Tail(col, start) for col in self.raw]
+        size = FANOUT
+        for lev in self.levels:
+            s.levels.append([[Tail(col, start // size) for col in agg] for agg in lev])
+            size *= FANOUT
+        return s
+
+    def query(self, start=None, end=None, points=None):
+        """Yield (timestamp, [(min, mean, max)...]) rows between start and end,
+           at most points rows from the finest level that fits."""
+        i0 = 0 if start is None else bisect_left(self.times, start)
+        i1 = len(self.times) if end is None else bisect_right(self.times, end)
+        if not points or i1 - i0 <= points:
+            for i in range(i0, i1):
+                yield self.times[i], [(col[i], col[i], col[i]) for col in self.raw]
+            return
+        size = FANOUT
+        for k, lev in enumerate(self.levels):
+            b0 = i0 // size
+            b1 = (i1 - 1) // size + 1
+            if b1 - b0 <= points or k == len(self.levels) - 1:
+                break
+            size *= FANOUT
+        for b in range(b0, b1):
+            row = []
+            for mn, mx, sm, cnt in lev:
+                if cnt[b]:
+                    row.append((mn[b], sm[b] / cnt[b], mx[b]))
+                else:
+                    row.append((NAN, NAN, NAN))
+            yield self.times[b * size], row
+
+pyramids = {}
+
+def get_pyramid(l, cpu):
+    names = sorted(data.levels[l])
+    p = pyramids.get((l, cpu))
+    if (p is None or p.names != names or p.resets != data.resets or
+            len(p.times) > len(data.times)):
+        p = pyramids[(l, cpu)] = Pyramid(names, cpu, data.resets)
+    p.update(data.times, data.vals)
+    return p
+
+def fmt(v):
+    return "" if v != v else v
+
+def gencsv(p, start=None, end=None, points=None, bars=False):
+    """Return the csv for pyramid p. With bars each value is
+       min;mean;max for dygraph customBars."""
+    out = StringIO()
+    wr = csv.writer(out, lineterminator='\n')
+    wr.writerow(["Timestamp"] + [get_postfix(x) for x in p.names])
+    for ts, row in p.query(start, end, points):
+        if bars:
+            wr.writerow([ts] + ["" if v[1] != v[1] else "%s;%s;%s" % v for v in row])
+        else:
+            wr.writerow([ts] + [fmt(v[1]) for v in row])
+    return out.getvalue()
+
+# responses for the current data generation
+cache = {}
+MAX_CACHE = 1000
+cache_gen = None
+
+def cached_csv(l, cpu, query):
+    """Update the data and return the encoded csv for a request."""
+    global cache_gen
+    def arg(name, conv):
+        if name in query:
+            return conv(query[name][0])
+        return None
+    start, end, points = arg("start", float), arg("end", float), arg("points", int)
+    if points is not None:
+        points = max(points, 1)
+    bars = arg("bars", int)
+    key = (l, cpu, start, end, points, bars)
+    with data_lock:
+        data.update()
+        if cache_gen != data.generation or len(cache) >= MAX_CACHE:
+            cache.clear()
+            cache_gen = data.generation
+        gen = cache_gen
+        out = cache.get(key)
+        if out is not None:
+            return out
+        p = get_pyramid(l, cpu).snapshot()
+    # format outside the lock so that other viewers are not blocked
+    out = gencsv(p, start, end, points, bars).encode()
+    with data_lock:
+        if cache_gen == gen:
+            cache[key] = out
+    return out
 
 class TLHandler(BaseHTTPServer.BaseHTTPRequestHandler):
     def header(self, typ):
@@ -269,7 +488,7 @@ class TLHandler(BaseHTTPServer.BaseHTTPRequestHandler):
         self.send_response(401)
         self.send_header('Content-Type', 'text/html')
         self.end_headers()
-        self.wfile.write("%s not found" % (self.path))
+        self.wfile.write(("%s not found" % (self.path)).encode())
 
     def serve_file(self, fn, mime):
         with open(fn, "r") as f:
@@ -277,16 +496,19 @@ class TLHandler(BaseHTTPServer.BaseHTTPRequestHandler):
             self.wfile.write(f.read().encode('utf-8'))
 
     def do_GET(self):
-        if self.path == "/":
+        url = urlparse(self.path)
+        path = url.path
+        if path == "/":
+            with data_lock:
+                html = gen_html()
             self.header("text/html")
-            self.wfile.write(gen_html().encode())
-        elif self.path == "/dygraph-combined.js":
+            self.wfile.write(html.encode())
+        elif path == "/dygraph-combined.js":
             self.serve_file("dygraph-combined.js", "text/javascript")
-        elif self.path == "/toplev.ico":
+        elif path == "/toplev.ico":
             self.serve_file("toplev.ico", "image/x-icon")
-        elif self.path.endswith(".csv"):
-            data.update()
-            m = re.match(r"/(cpu|C\d+|S\d+-C\d+|C\d+-T\d+)\.(.*?)\.csv", self.path)
+        elif path.endswith(".csv"):
+            m = re.match(r"/(cpu|CPU\d+|C\d+|S\d+-C\d+|C\d+-T\d+)\.(.*?)\.csv$", path)
             if not m:
                 self.bad()
                 return
@@ -295,8 +517,13 @@ class TLHandler(BaseHTTPServer.BaseHTTPRequestHandler):
             if l not in data.levels:
                 self.bad()
                 return
+            try:
+                out = cached_csv(l, cpu, parse_qs(url.query))
+            except ValueError:
+                self.bad()
+                return
             self.header("text/csv")
-            gencsv(self.wfile, l, cpu)
+            self.wfile.write(out)
         else:
             self.bad()
 
@@ -320,12 +547,12 @@ if args.gen:
     for cpu in data.cpus:
         for l in data.levels:
             with open(genfn(args.gen, cpu + "." + l + ".csv"), 'w') as f:
-                gencsv(f, l, cpu)
+                f.write(gencsv(get_pyramid(l, cpu)))
     print("Please browse", args.gen, "through a web server, not through file:")
 else:
     signal.signal(signal.SIGTERM, term)
 
-    httpd = BaseHTTPServer.HTTPServer((args.host, args.port), TLHandler)
+    httpd = ThreadingHTTPServer((args.host, args.port), TLHandler)
 
     print("serving at",args.host,"port",args.port,"until Ctrl-C")
     try:
@@ -22,6 +22,11 @@ import argparse
 import re
 import collections
 import csv
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zipfile
 try:
     import xlsxwriter
 except ImportError:
@@ -43,23 +48,39 @@ ap.add_argument('--cpuinfo', type=argparse.FileType('r'), help="cpuinfo file")
 ap.add_argument('--chart', help="add sheet with plots of normalized sheet. argument is normalied sheet name",
                 action="append")
 ap.add_argument('--no-summary', help='Do not generate summary charts', action='store_true')
+ap.add_argument('--summary-only', help='Only generate the summary sheets and the charts. '
+                'The normalized sheets for the charts are still written, downsampled with --every.',
+                action='store_true')
+ap.add_argument('--every', type=int, default=1, help='Only write every Nth interval to the interval sheets')
+ap.add_argument('--jobs', '-j', type=int, default=1,
+                help='Convert the sheets in N parallel processes. 0 for the number of CPUs')
 args = ap.parse_args()
 
-workbook = xlsxwriter.Workbook(args.xlsxfile, {'constant_memory': True})
-bold = workbook.add_format({'bold': True})
-valueformat = workbook.add_format({'num_format': '###,###,###,###,##0.0'})
-valueformat_bold = workbook.add_format({'num_format': '###,###,###,###,##0.0',
-    'bold': True})
-#valueformat.set_num_format(1)
+def init_workbook(fn):
+    global workbook, bold, valueformat, valueformat_bold
+    workbook = xlsxwriter.Workbook(fn, {'constant_memory': True})
+    bold = workbook.add_format({'bold': True})
+    valueformat = workbook.add_format({'num_format': '###,###,###,###,##0.0'})
+    valueformat_bold = workbook.add_format({'num_format': '###,###,###,###,##0.0',
+        'bold': True})
+    #valueformat.set_num_format(1)
+    # fix the style indexes, so that sheets from different processes can be combined
+    for f in (bold, valueformat, valueformat_bold):
+        f._get_xf_index()
 
-def set_columns(worksheet, c, lengths):
+init_workbook(args.xlsxfile)
+
+def set_columns(worksheet, lengths):
+    for col, l in lengths.items():
+        worksheet.set_column(col, col, l)
+
+def update_lengths(c, lengths):
     for col, j in enumerate(c):
         if j == "Value":
             j = " " * 18
         if j == "Description":
             j = "Descr"
         lengths[col] = max(len(j) + 5, lengths[col])
-        worksheet.set_column(col, col, lengths[col])
 
 worksheets = {}
 rows = {}
@@ -73,70 +94,107 @@ def get_worksheet(name):
     rows[name] = 1
     return worksheet
 
+number = re.compile(r'-?[,.0-9]+$')
+
 def to_float(n):
-    if re.match(r'-?[,.0-9]+$', n):
+    if number.match(n):
         n = float(n)
     return n
 
-def create_sheet(name, infh, delimiter=',', version=None):
+def create_sheet(name, infh, delimiter=',', version=None, intervals=True):
+    """Convert a csv file to sheet name, with the SUMMARY rows in the name summary sheet.
+       Without intervals only the summary sheet is generated."""
     lengths = collections.defaultdict(lambda: 0)
-    worksheet = get_worksheet(name)
     cf = csv.reader(infh, delimiter=delimiter)
+    sname = name + " summary"
+    cur = None
     row = 0
+    if intervals:
+        worksheet = get_worksheet(name)
+        cur = name
     title = {}
-    titlerow = []
-    summary = False
+    titlerow = None
+    valcol = bn = None
+    numrows = 0
+    lastts = None
+    tsnum = 0
     for c in cf:
         if len(c) > 0 and len(c[0]) > 0 and c[0][0] == "#":
             version = c
             continue
-        if row == 0:
+        if numrows < 10:
+            update_lengths(c, lengths)
+            numrows += 1
+        if titlerow is None:
             title = collections.OrderedDict()
             for i, k in enumerate(c):
                 title[k] = i
             titlerow = c
             headers[name] = title
-        if row < 10:
-            set_columns(worksheet, c, lengths)
-        if not summary and len(c) > 0 and c[0] == "SUMMARY":
+            valcol = title.get("Value")
+            bn = title.get("Bottleneck")
+            if intervals:
+                worksheet.write_row(0, 0, c)
+                row = 1
+            continue
+        if len(c) > 0 and c[0].startswith("SUMMARY"):
             if args.no_summary:
                 continue
-            rows[name] = row
-            sname = name + " summary"
-            worksheet = get_worksheet(sname)
-            set_columns(worksheet, c, lengths)
-            worksheet.write_row(0, 0, titlerow)
-            headers[sname] = titlerow
-            row = rows[sname]
-            summary = True
-        elif summary and len(c) > 0 and c[0] != "SUMMARY" and c[0][0] != "#":
-            worksheet = get_worksheet(name)
-            summary = False
-            rows[sname] = row
-            row = rows[name]
-        c = list(map(to_float, c))
-        worksheet.write_row(row, 0, c)
-        isbn = False
-        if "Bottleneck" in title:
-            bn = title["Bottleneck"]
-            if len(c) > bn and c[bn] == "<==":
-                worksheet.write(row, title["Area"], c[title["Area"]], bold)
-                worksheet.write(row, title["Value"], c[title["Value"]], bold)
-                if "CPUs" in title:
-                    worksheet.write(row, title["CPUs"], c[title["CPUs"]], bold)
-                isbn = True
-                worksheet.write(row, bn, c[bn], bold)
-        if "Value" in title and len(c) > title["Value"] and isinstance(c[title["Value"]], float):
-            worksheet.write_number(row, title["Value"], c[title["Value"]],
+            if cur != sname:
+                if cur:
+                    rows[cur] = row
+                new = sname not in worksheets
+                worksheet = get_worksheet(sname)
+                if new:
+                    worksheet.write_row(0, 0, titlerow)
+                    headers[sname] = titlerow
+                row = rows[sname]
+                cur = sname
+        elif len(c) > 0:
+            if not intervals:
+                continue
+            if args.every > 1 and title.get("Timestamp") == 0:
+                if c[0] != lastts:
+                    lastts = c[0]
+                    tsnum += 1
+                if (tsnum - 1) % args.every:
+                    continue
+            if cur != name:
+                rows[cur] = row
+                worksheet = get_worksheet(name)
+                row = rows[name]
+                cur = name
+        elif cur is None:
+            continue
+        c = [to_float(x) for x in c]
+        isbn = bn is not None and len(c) > bn and c[bn] == "<=="
+        if valcol is not None and len(c) > valcol and isinstance(c[valcol], float):
+            worksheet.write_row(row, 0, c[:valcol])
+            worksheet.write_number(row, valcol, c[valcol],
                                    valueformat_bold if isbn else valueformat)
-        elif "0" in title:
-            num = 0
-            while num in title:
-                col = title["%d" % num]
-                if len(c) > col and re.match(r'[0-9]+', c[col]):
-                    worksheet.write_number(row, col, float(c[col]), valueformat)
-                num += 1
+            worksheet.write_row(row, valcol + 1, c[valcol + 1:])
+        else:
+            worksheet.write_row(row, 0, c)
+            if isbn:
+                worksheet.write(row, valcol, c[valcol], bold)
+            elif "0" in title:
+                num = 0
+                while num in title:
+                    col = title["%d" % num]
+                    if len(c) > col and re.match(r'[0-9]+', c[col]):
+                        worksheet.write_number(row, col, float(c[col]), valueformat)
+                    num += 1
+        if isbn:
+            worksheet.write(row, title["Area"], c[title["Area"]], bold)
+            if "CPUs" in title:
+                worksheet.write(row, title["CPUs"], c[title["CPUs"]], bold)
+            worksheet.write(row, bn, c[bn], bold)
         row += 1
+    if cur:
+        rows[cur] = row
+    for n in (name, sname):
+        if n in worksheets:
+            set_columns(worksheets[n], lengths)
     return version
 
 ROW_SCALE = 18
@@ -192,32 +250,115 @@ def gen_chart(source):
         worksheet.insert_chart('A%d' % row, charts[j])
         row += GRAPH_ROWS
 
-version = None
-if args.global_:
-    version = create_sheet("global", args.global_, version=version)
-if args.socket:
-    version = create_sheet("socket", args.socket, version=version)
-if args.core:
-    version = create_sheet("core", args.core, version=version)
-if args.thread:
-    version = create_sheet("thread", args.thread, version=version)
-if args.program:
-    version = create_sheet("prog", args.program, version=version)
-if args.add:
-    for fn, name in args.add:
-        version = create_sheet(name, open(fn), version=version)
-if args.chart:
-    for cname in args.chart:
-        gen_chart(cname)
-if args.valcsv:
-    create_sheet("event values", args.valcsv)
-if args.perf:
-    create_sheet("raw perf output", args.perf, delimiter=';')
-if args.cpuinfo:
-    create_sheet("cpuinfo", args.cpuinfo, delimiter=':')
+def sheet_steps():
+    """Return the conversion steps in sheet order. A step is a create_sheet
+       argument list with a flag if it updates the version, or a chart name."""
+    steps = []
+    for name, fh in (("global", args.global_), ("socket", args.socket), ("core", args.core),
+                     ("thread", args.thread), ("prog", args.program)):
+        if fh:
+            steps.append(((name, fh, ',', not args.summary_only), True))
+    if args.add:
+        for fn, name in args.add:
+            if not args.summary_only or (args.chart and name in args.chart):
+                steps.append(((name, open(fn), ',', True), True))
+    if args.chart:
+        steps += args.chart
+    if args.valcsv and not args.summary_only:
+        steps.append((("event values", args.valcsv, ',', True), False))
+    if args.perf and not args.summary_only:
+        steps.append((("raw perf output", args.perf, ';', True), False))
+    if args.cpuinfo:
+        steps.append((("cpuinfo", args.cpuinfo, ':', True), False))
+    return steps
+
+steps = sheet_steps()
+
+def convert_step(num):
+    """Convert the csv file of a step into a separate workbook in a worker process.
+       The first sheet is a dummy, so that the converted sheets are not selected."""
+    (name, fh, delimiter, intervals), _ = steps[num]
+    fd, fn = tempfile.mkstemp(prefix="tl-xlsx", suffix=".xlsx")
+    os.close(fd)
+    init_workbook(fn)
+    worksheets.clear()
+    workbook.add_worksheet("_")
+    version = create_sheet(name, fh, delimiter, None, intervals)
+    names = [w.get_name() for w in workbook.worksheets()[1:]]
+    workbook.close()
+    return fn, names, version, rows, headers
+
+def assemble(parts):
+    """Replace the empty sheets of the output with the sheets converted by the workers.
+       parts maps the sheet number to the worker file and its sheet number."""
+    tmp = args.xlsxfile + ".tmp"
+    srcs = {}
+    with zipfile.ZipFile(args.xlsxfile) as zin:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zout:
+            for item in zin.infolist():
+                m = re.match(r'xl/worksheets/sheet(\d+)\.xml$', item.filename)
+                if not m or int(m.group(1)) not in parts:
+                    zout.writestr(item, zin.read(item.filename))
+                    continue
+                fn, num = parts[int(m.group(1))]
+                if fn not in srcs:
+                    srcs[fn] = zipfile.ZipFile(fn)
+                with srcs[fn].open("xl/worksheets/sheet%d.xml" % num) as inf:
+                    with zout.open(item, "w") as outf:
+                        if m.group(1) == "1":
+                            outf.write(inf.read(1024).replace(b'<sheetView workbookViewId="0"',
+                                b'<sheetView tabSelected="1" workbookViewId="0"', 1))
+                        shutil.copyfileobj(inf, outf)
+    for fn, z in srcs.items():
+        z.close()
+        os.remove(fn)
+    os.rename(tmp, args.xlsxfile)
+
+def convert_serial():
+    version = None
+    for step in steps:
+        if not isinstance(step, tuple):
+            gen_chart(step)
+            continue
+        (name, fh, delimiter, intervals), update = step
+        v = create_sheet(name, fh, delimiter, version if update else None, intervals)
+        if update:
+            version = v
+    return version
+
+def convert_parallel(jobs):
+    pool = multiprocessing.get_context("fork").Pool(jobs)
+    results = pool.map(convert_step, [n for n, s in enumerate(steps) if isinstance(s, tuple)])
+    pool.close()
+    results.reverse()
+    version = None
+    parts = {}
+    for step in steps:
+        if not isinstance(step, tuple):
+            gen_chart(step)
+            continue
+        fn, names, v, wrows, wheaders = results.pop()
+        for num, n in enumerate(names):
+            get_worksheet(n)
+            rows[n] = wrows[n]
+            if n in wheaders:
+                headers[n] = wheaders[n]
+            parts[len(worksheets)] = (fn, num + 2)
+        if step[1] and v:
+            version = v
+    return version, parts
+
+parts = None
+jobs = args.jobs if args.jobs > 0 else multiprocessing.cpu_count()
+if jobs > 1 and len(steps) > 1:
+    version, parts = convert_parallel(jobs)
+else:
+    version = convert_serial()
 
 if version:
     worksheet = workbook.add_worksheet("version")
     worksheet.write_row(0, 0, version)
 
 workbook.close()
+if parts:
+    assemble(parts)
@@ -19,13 +19,31 @@ import re
 import sys
 import json
 import os
-from math import isnan
+import struct
+import time
+import atexit
+from array import array
+from math import isnan, isinf
 from collections import defaultdict, Counter, OrderedDict
 from tl_uval import UVal, combine_uval
 from tl_io import flex_open_w
 if sys.version_info.major == 3:
     import typing # noqa
-    from typing import DefaultDict, Dict, Any # noqa
+    from typing import DefaultDict, Dict, List, Any # noqa
+
+class WindowTimestamp(float):
+    """Timestamp of a --summary-every summary. It is NaN like the timestamp
+       of the final summary, but prints with the end of its window."""
+    end = None # type: float | None
+
+    def __new__(cls, end):
+        ts = float.__new__(cls, float('nan'))
+        ts.end = end
+        return ts
+
+def summary_label(ts):
+    end = getattr(ts, "end", None)
+    return "SUMMARY" if end is None else "SUMMARY-%s" % end
 
 def output_name(name, typ):
     if typ:
@@ -46,45 +64,77 @@ def open_logfile(name, typ):
     except IOError:
         sys.exit("Cannot open logfile %s" % name)
 
-def open_all_logfiles(args, logfile):
+def open_all_logfiles(args, logfile, opener=open_logfile):
     if args.split_output and args.per_thread + args.per_core + args.per_socket + args.global_ > 0:
         logfiles = dict()
         if args.per_thread:
-            logfiles['thread'] = open_logfile(logfile, "thread")
+            logfiles['thread'] = opener(logfile, "thread")
         if args.per_core:
-            logfiles['core'] = open_logfile(logfile, "core")
+            logfiles['core'] = opener(logfile, "core")
         if args.per_socket:
-            logfiles['socket'] = open_logfile(logfile, "socket")
+            logfiles['socket'] = opener(logfile, "socket")
         if args.global_:
-            logfiles['global'] = open_logfile(logfile, "global")
+            logfiles['global'] = opener(logfile, "global")
         return logfiles, None
     else:
-        return None, open_logfile(logfile, None)
-
-BUFS = 1024*1024
-
-def catrmfile(infn, outf, keep):
-    with open(infn, "r") as inf:
-        while True:
-            buf = inf.read(BUFS)
-            if len(buf) == 0:
-                break
-            outf.write(buf)
-    outf.flush()
-    if not keep:
-        os.remove(infn)
-
-def catrmoutput(infn, logf, logfiles, keep):
+        return None, opener(logfile, None)
+
+def csv_writers(logfiles, logf, sep):
     if logfiles:
-        for j in logfiles.keys():
-            catrmfile(output_name(infn, j), logfiles[j], keep)
-    else:
-        catrmfile(infn, logf, keep)
+        return {n: csv.writer(f, delimiter=sep, lineterminator='\n') for n, f in logfiles.items()}
+    return {'': csv.writer(logf, delimiter=sep, lineterminator='\n')}
+
+class IntervalBuffer(object):
+    """Collect the writes to file f in memory and write them with a single
+       write at the end of each interval. f is flushed at the end of the
+       interval when the last flush is latency or more seconds ago."""
+    def __init__(self, f, latency):
+        self.f = f
+        self.latency = latency
+        self.buf = []
+        self.last_flush = time.time()
+        # don't lose the last interval on an early exit
+        atexit.register(self.commit_at_exit)
+
+    def write(self, s):
+        self.buf.append(s)
+
+    def commit(self):
+        if self.buf:
+            # join with "" or b"" for binary files
+            self.f.write(self.buf[0][:0].join(self.buf))
+            self.buf = []
+
+    def commit_at_exit(self):
+        if self.buf:
+            self.flush()
+
+    def end_interval(self):
+        self.commit()
+        now = time.time()
+        if now - self.last_flush >= self.latency:
+            self.f.flush()
+            self.last_flush = now
+
+    def flush(self):
+        self.commit()
+        self.f.flush()
+        self.last_flush = time.time()
+
+def buffer_files(logfiles, logf, latency):
+    if logfiles:
+        return OrderedDict([(n, IntervalBuffer(f, latency)) for n, f in logfiles.items()]), None
+    return None, IntervalBuffer(logf, latency)
 
 class Output(object):
     """Abstract base class for Output classes."""
     def __init__(self, logfile, version, cpu, args):
-        self.logfiles, self.logf = open_all_logfiles(args, args.output)
+        self.logfiles, self.logf = self.open_files(args)
+        # negative latency writes every line directly
+        latency = getattr(args, "flush_latency", 0)
+        self.buffered = latency is not None and latency >= 0
+        if self.buffered:
+            self.logfiles, self.logf = buffer_files(self.logfiles, self.logf, latency)
         self.printed_descs = set()
         self.hdrlen = 30
         self.version = version
@@ -101,6 +151,21 @@ class Output(object):
         self.valcsv = None
         self.last_prefix = ""
         self.args = args
+        # rendered strings that only depend on the column lengths
+        self.prefixes = {} # type: Dict[Any, str]
+
+    def open_files(self, args):
+        return open_all_logfiles(args, args.output)
+
+    def set_files(self, logfiles, logf):
+        """Redirect output to other (e.g. in memory) files. Same shape as the opened ones."""
+        self.logfiles, self.logf = logfiles, logf
+        if logfiles and self.curname in logfiles:
+            self.logf = logfiles[self.curname]
+
+    def mark_written(self):
+        """Continue output that was started by someone else, e.g. a parallel worker."""
+        pass
 
     def flushfiles(self):
         if self.logfiles:
@@ -108,18 +173,34 @@ class Output(object):
                 j.flush()
         self.logf.flush()
 
+    def end_interval(self):
+        """Write the buffered output of an interval."""
+        for f in self.logfiles.values() if self.logfiles else [self.logf]:
+            if isinstance(f, IntervalBuffer):
+                f.end_interval()
+
+    def sync(self):
+        """Flush the output when it is written line by line."""
+        if not self.buffered:
+            self.logf.flush()
+
     # pass all possible hdrs in advance to compute suitable padding
     def set_hdr(self, hdr, area):
         if area:
             hdr = "%-16s %s" % (area, hdr)
-        self.hdrlen = max(len(hdr) + 1, self.hdrlen)
+        if len(hdr) + 1 > self.hdrlen:
+            self.hdrlen = len(hdr) + 1
+            self.prefixes = {}
 
     def set_below(self, below):
-        if below:
+        if below and not self.belowlen:
             self.belowlen = 1
+            self.prefixes = {}
 
     def set_unit(self, unit):
-        self.unitlen = max(len(unit), self.unitlen)
+        if len(unit) > self.unitlen:
+            self.unitlen = len(unit)
+            self.prefixes = {}
 
     def set_cpus(self, cpus):
         pass
@@ -204,10 +285,13 @@ class OutputHuman(Output):
             pass
         self.args = args
         self.titlelen = 7
+        self.last_ts = None
+        self.ts_str = ""
 
     def set_cpus(self, cpus):
         if len(cpus) > 0:
             self.titlelen = max(map(len, cpus)) + 1
+            self.prefixes = {}
 
     def print_desc(self, desc, sample):
         if self.args.no_desc:
@@ -217,22 +301,35 @@ class OutputHuman(Output):
             if sample:
                 print("\t" + "Sampling events: ", sample, file=self.logf)
 
+    def timestamp_str(self, timestamp):
+        if not timestamp:
+            return ""
+        if isnan(timestamp):
+            return "%-11s " % summary_label(timestamp)
+        if timestamp != self.last_ts:
+            self.last_ts = timestamp
+            self.ts_str = "%6.9f " % timestamp
+        return self.ts_str
+
     def print_timestamp(self, timestamp):
-        if timestamp:
-            if isnan(timestamp):
-                self.logf.write("%-11s " % "SUMMARY")
-            else:
-                self.logf.write("%6.9f " % timestamp)
+        self.logf.write(self.timestamp_str(timestamp))
 
-    def print_line_header(self, area, ohdr):
+    def line_header(self, area, ohdr):
         if "Info" in area or not self.abbrev:
-            hdr = ohdr
-        else:
-            hdr = short_hdr(ohdr, self.last_prefix)
-            self.last_prefix = ohdr
+            key = ("hdr", area, ohdr)
+            s = self.prefixes.get(key)
+            if s is None:
+                s = "%-*s " % (self.hdrlen, "%-16s %s" % (area, ohdr) if area else ohdr)
+                self.prefixes[key] = s
+            return s
+        hdr = short_hdr(ohdr, self.last_prefix)
+        self.last_prefix = ohdr
         if area:
             hdr = "%-16s %s" % (area, hdr)
-        self.logf.write("%-*s " % (self.hdrlen, hdr))
+        return "%-*s " % (self.hdrlen, hdr)
+
+    def print_line_header(self, area, ohdr):
+        self.logf.write(self.line_header(area, ohdr))
 
     # timestamp Timestamp in interval mode
     # title     CPU
@@ -250,24 +347,25 @@ class OutputHuman(Output):
     # C0    BE      Backend_Bound:                                62.00 %
     def show(self, timestamp, title, area, hdr, val, unit, desc, sample, bn, below, idle):
         self.print_header()
-        self.print_timestamp(timestamp)
-        write = self.logf.write
+        line = self.timestamp_str(timestamp)
         if title:
-            write("%-*s" % (self.titlelen, title))
-        self.print_line_header(area, hdr)
-        vals = "{:<{unitlen}} {:>20} {:<{belowlen}}".format(
-                    ("  " if unit and unit[0] != "%" else "") + unit,
-                    val.format_value(unit),
-                    fmt_below(below),
-                    unitlen=self.unitlen + 2,
-                    belowlen=self.belowlen)
+            t = self.prefixes.get(("title", title))
+            if t is None:
+                t = self.prefixes[("title", title)] = "%-*s" % (self.titlelen, title)
+            line += t
+        line += self.line_header(area, hdr)
+        u = self.prefixes.get(("unit", unit))
+        if u is None:
+            u = "%-*s " % (self.unitlen + 2, ("  " if unit and unit[0] != "%" else "") + unit)
+            self.prefixes[("unit", unit)] = u
+        vals = "%s%s%20s %-*s" % (line, u, val.format_value(unit), self.belowlen, fmt_below(below))
         if not self.args.no_mux and val.multiplex != 100.0:
             vals += " " + val.format_mux()
         if val.stddev:
             vals += " +- {:>8}".format(val.format_uncertainty())
         if bn:
             vals += bn
-        write(vals + "\n")
+        self.logf.write(vals + "\n")
         self.print_desc(desc, sample)
 
     def metric(self, area, name, uval, timestamp, desc, title, unit, idle):
@@ -275,7 +373,7 @@ class OutputHuman(Output):
 
 def convert_ts(ts):
     if isnan(ts):
-        return "SUMMARY"
+        return summary_label(ts)
     return ts
 
 class OutputColumns(OutputHuman):
@@ -308,7 +406,7 @@ class OutputColumns(OutputHuman):
 
         cpunames = sorted(self.cpunames)
 
-        if not self.printed_header:
+        if not self.printed_header and not self.no_header:
             if self.timestamp:
                 write("%9s" % "")
             self.print_line_header("", "")
@@ -354,14 +452,14 @@ class OutputColumnsCSV(OutputColumns):
 
     def __init__(self, logfile, sep, args, version, cpu):
         OutputColumns.__init__(self, logfile, args, version, cpu)
-        self.writer = {}
-        if self.logfiles:
-            for n, f in self.logfiles.items():
-                self.writer[n] = csv.writer(f, delimiter=sep, lineterminator='\n')
-        else:
-            self.writer[''] = csv.writer(self.logf, delimiter=sep, lineterminator='\n')
+        self.sep = sep
+        self.writer = csv_writers(self.logfiles, self.logf, sep)
         self.printed_header = False
 
+    def set_files(self, logfiles, logf):
+        Output.set_files(self, logfiles, logf)
+        self.writer = csv_writers(logfiles, logf, self.sep)
+
     # XXX implement bn and idle
     def show(self, timestamp, title, area, hdr, val, unit, desc, sample, bn, below, idle):
         self.print_header()
@@ -416,15 +514,15 @@ class OutputCSV(Output):
     """Output data in CSV format."""
     def __init__(self, logfile, sep, args, version, cpu):
         Output.__init__(self, logfile, version, cpu, args)
-        self.writer = {}
-        if self.logfiles:
-            for n, f in self.logfiles.items():
-                self.writer[n] = csv.writer(f, delimiter=sep, lineterminator='\n')
-        else:
-            self.writer[''] = csv.writer(self.logf, delimiter=sep, lineterminator='\n')
+        self.sep = sep
+        self.writer = csv_writers(self.logfiles, self.logf, sep)
         self.args = args
         self.printed_headers = set()
 
+    def set_files(self, logfiles, logf):
+        Output.set_files(self, logfiles, logf)
+        self.writer = csv_writers(logfiles, logf, self.sep)
+
     def print_header_csv(self, timestamp, title):
         if self.no_header:
             return
@@ -448,17 +546,36 @@ class OutputCSV(Output):
         if timestamp:
             l.append(convert_ts(timestamp))
         if title:
-            l.append("CPU" + title if re.match(r'[0-9]+', title) else title)
+            t = self.prefixes.get(("title", title))
+            if t is None:
+                t = self.prefixes[("title", title)] = (
+                        "CPU" + title if re.match(r'[0-9]+', title) else title)
+            l.append(t)
         stddev = val.format_uncertainty().strip()
         multiplex = val.multiplex if not isnan(val.multiplex) else ""
+        u = self.prefixes.get(("unit", unit, below))
+        if u is None:
+            u = self.prefixes[("unit", unit, below)] = (unit + " " + fmt_below(below)).strip()
         self.writer[self.curname].writerow(l + [hdr, val.format_value_raw().strip(),
-                                  (unit + " " + fmt_below(below)).strip(),
-                                  desc, sample, stddev, multiplex, bn, "Y" if idle else ""])
+                                  u, desc, sample, stddev, multiplex, bn, "Y" if idle else ""])
 
     print_footer = Output.print_footer_all
 
+LEVEL1 = ("Frontend_Bound", "Backend_Bound", "BadSpeculation", "Retiring") # XXX
+
+def json_number(v):
+    # same as json.dumps, but without the encoder overhead for the common cases
+    if type(v) is int or (type(v) is float and not isnan(v) and not isinf(v)):
+        return repr(v)
+    return json.dumps(v)
+
 class OutputJSON(Output):
-    """Output data in chrome / trace-viewer JSON format."""
+    """Output data in chrome / trace-viewer JSON format.
+       Each node is written as a counter event, named by the CPU and the
+       parent node. The names and the JSON fragments for the node names are
+       computed once for each node and CPU, and the events are written with
+       string templates. With compact all values with the same name are
+       merged into a single event per interval, written without white space."""
     def __init__(self, logfile, sep, args, version, cpu):
         Output.__init__(self, logfile, version, cpu, args)
         self.nodes = defaultdict(dict) # type: DefaultDict[str, Dict[str, Any]]
@@ -466,8 +583,41 @@ class OutputJSON(Output):
         self.count = Counter() # type: typing.Counter[str]
         self.no_header = args.no_json_header
         self.no_footer = args.no_json_footer
+        self.compact = getattr(args, "json_compact", False)
+        if self.compact:
+            self.template = '{"name":%s,"ph":"C","pid":0,"ts":%s,"args":{%s}}'
+            self.argsep, self.keysep = ",", ":"
+        else:
+            self.template = '{"name": %s, "ph": "C", "pid": 0, "ts": %s, "args": {%s}}'
+            self.argsep, self.keysep = ", ", ": "
+        # hdr -> trace name suffix, merge, round
+        self.trace_names = {} # type: Dict[str, Any]
+        # title, hdr -> encoded event name, merge, round, encoded key
+        self.events = {} # type: Dict[Any, Any]
         self.num = 0
 
+    def trace_name(self, hdr):
+        t = self.trace_names.get(hdr)
+        if t is None:
+            if hdr in LEVEL1:
+                t = ("Level1", True, False)
+            elif "." in hdr:
+                t = (hdr[:hdr.rindex(".")], self.compact, True)
+            else: # assume it's metric
+                t = (hdr, self.compact, False)
+            self.trace_names[hdr] = t
+        return t
+
+    def event(self, title, hdr):
+        e = self.events.get((title, hdr))
+        if e is None:
+            name, merge, rnd = self.trace_name(hdr)
+            if title:
+                name = title + " " + name
+            e = (json.dumps(name), merge, rnd, json.dumps(hdr) + self.keysep)
+            self.events[(title, hdr)] = e
+        return e
+
     def print_footer_all(self):
         def write_all(s):
             if self.logfiles:
@@ -489,6 +639,11 @@ class OutputJSON(Output):
 
     print_footer = print_footer_all
 
+    def mark_written(self):
+        for n in self.logfiles if self.logfiles else [""]:
+            self.count[n] += 1
+        self.num += 1
+
     def show(self, timestamp, title, area, hdr, val, unit, desc, sample, bn, below, idle):
         self.timestamp = timestamp
         self.nodes[title][hdr] = val
@@ -496,41 +651,195 @@ class OutputJSON(Output):
         self.num += 1
 
     def flush(self):
+        # encoded name -> list of encoded key: value
         nodes = OrderedDict() # type: OrderedDict[str,Any]
+        titles = sorted(self.nodes.keys())
         for hdr in self.headers:
-            for title in sorted(self.nodes.keys()):
-                if hdr not in self.nodes[title]:
-                    continue
+            for title in titles:
                 nd = self.nodes[title]
+                if hdr not in nd:
+                    continue
                 val = nd[hdr].value if isinstance(nd[hdr], UVal) else nd[hdr]
+                name, merge, rnd, key = self.event(title, hdr)
+                if rnd:
+                    val = round(val, 2)
+                arg = key + json_number(val)
+                if merge and name in nodes:
+                    nodes[name].append(arg)
+                else:
+                    nodes[name] = [arg]
 
-                if title:
-                    title += " "
-                if hdr in ("Frontend_Bound", "Backend_Bound", "BadSpeculation", "Retiring"): # XXX
-                    key = title + "Level1"
-                    if key not in nodes:
-                        nodes[key] = {}
-                    nodes[title + "Level1"][hdr] = val
-                elif hdr.count(".") >= 1:
-                    dot = hdr.rindex(".")
-                    nodes[title + hdr[:dot]] = { hdr: round(val, 2) }
-                else: # assume it's metric
-                    nodes[title + hdr] = {hdr: val}
-
-        for name in nodes.keys():
+        if nodes:
+            ts = json_number(self.timestamp / 1e6 if self.timestamp and not isnan(self.timestamp) else 0)
+            out = []
+            for name, args in nodes.items():
+                out.append(self.template % (name, ts, self.argsep.join(args)))
             if self.count[self.curname] == 0:
-                if not self.no_header:
-                    self.logf.write("[\n")
+                start = "" if self.no_header else "[\n"
             else:
-                self.logf.write(",\n")
-            json.dump({"name": name,
-                      "ph": "C",
-                      "pid": 0,
-                      "ts": self.timestamp / 1e6 if self.timestamp and not isnan(self.timestamp) else 0,
-                      "args": nodes[name]}, self.logf)
-            self.count[self.curname] += 1
+                start = ",\n"
+            self.logf.write(start + ",\n".join(out))
+            self.count[self.curname] += len(out)
         self.nodes = defaultdict(dict)
         self.headers = OrderedDict()
 
     def remark(self, m):
         pass
+
+# Columnar binary format (--binary), read by tldata.TLData.
+#
+# The file starts with BIN_MAGIC followed by blocks. Each block has a
+# BIN_BLOCK header (tag, count, payload length) and a payload padded to
+# 8 bytes, so that the columns of ROWS blocks can be used directly from
+# a mmap of the file.
+#
+# META  Starts a segment (one toplev run). JSON object with version and byte order.
+#       Node and CPU ids are numbered from 0 in each segment.
+# NODE  count nodes: JSON list of [id, area, name, unit, description, sample].
+#       A known id sets the description, which may be only known later.
+# CPUS  count new CPUs: JSON list of names. "" for no CPU.
+# ROWS  count rows: one column after the other in BIN_COLUMNS order.
+#
+# Blocks are written at each interval flush. Appending to an existing
+# file starts a new segment.
+
+BIN_MAGIC = b"TLBIN\0\0\1"
+BIN_BLOCK = struct.Struct("<4sIQ")
+BIN_COLUMNS = (("ts", "d"), ("value", "d"), ("stddev", "d"), ("mux", "d"),
+               ("cpu", "i"), ("node", "i"), ("flags", "B"))
+BIN_BN, BIN_BELOW, BIN_IDLE, BIN_RATIO = 1, 2, 4, 8
+
+def bin_blocks(buf, offset=len(BIN_MAGIC)):
+    """Iterate over the complete blocks in buf as tag, count, payload offset, payload length."""
+    while offset + BIN_BLOCK.size <= len(buf):
+        tag, count, length = BIN_BLOCK.unpack_from(buf, offset)
+        offset += BIN_BLOCK.size
+        if offset + length > len(buf):
+            break
+        yield tag, count, offset, length
+        offset += length
+
+def bin_columns(buf, count, offset):
+    """Return the columns of a ROWS block as dict of memoryviews into buf."""
+    cols = {}
+    for name, typ in BIN_COLUMNS:
+        size = array(typ).itemsize * count
+        cols[name] = memoryview(buf)[offset:offset + size].cast(typ) # type: ignore
+        offset += size
+    return cols
+
+def open_binfile(name, typ):
+    import mmap
+    name = output_name(name, typ)
+    try:
+        af = open(name, "r+b")
+        if af.read(len(BIN_MAGIC)) == BIN_MAGIC:
+            # cut off a partial block from an interrupted run
+            end = len(BIN_MAGIC)
+            mm = mmap.mmap(af.fileno(), 0, access=mmap.ACCESS_READ)
+            for _, _, offset, length in bin_blocks(mm):
+                end = offset + length
+            mm.close()
+            af.seek(end)
+            af.truncate()
+            return af
+        af.close()
+    except IOError:
+        pass
+    try:
+        f = open(name, "wb")
+    except IOError:
+        sys.exit("Cannot open logfile %s" % name)
+    f.write(BIN_MAGIC)
+    return f
+
+def bin_float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float("nan")
+
+class BinaryWriter(object):
+    """Collect the rows for one binary output file until the next flush."""
+    def __init__(self, f, version):
+        self.f = f
+        self.nodes = {} # type: Dict[Any, int]
+        self.descs = [] # type: List[str]
+        self.cpus = {} # type: Dict[str, int]
+        self.new_nodes = [] # type: List[Any]
+        self.new_cpus = [] # type: List[str]
+        self.cols = [array(typ) for _, typ in BIN_COLUMNS]
+        self.block(b"META", 0, {"version": version, "byteorder": sys.byteorder})
+
+    def block(self, tag, count, data):
+        if not isinstance(data, bytes):
+            data = json.dumps(data).encode()
+        pad = -len(data) % 8
+        self.f.write(BIN_BLOCK.pack(tag, count, len(data) + pad) + data + b"\0" * pad)
+
+    def add(self, timestamp, title, area, hdr, val, unit, desc, sample, flags):
+        node = self.nodes.get((area, hdr))
+        if node is None or (desc and not self.descs[node]):
+            if node is None:
+                node = self.nodes[(area, hdr)] = len(self.nodes)
+                self.descs.append("")
+            self.descs[node] = re.sub(r"\s+", " ", desc)
+            self.new_nodes.append([node, area, hdr, unit, self.descs[node], sample or ""])
+        cpu = self.cpus.get(title)
+        if cpu is None:
+            cpu = self.cpus[title] = len(self.cpus)
+            self.new_cpus.append(title)
+        ts, value, stddev, mux, cpus, nodes, flagcol = self.cols
+        ts.append(bin_float(timestamp))
+        value.append(bin_float(val.value))
+        stddev.append(bin_float(val.stddev))
+        mux.append(bin_float(val.multiplex))
+        cpus.append(cpu)
+        nodes.append(node)
+        flagcol.append(flags)
+
+    def flush(self):
+        if self.new_nodes:
+            self.block(b"NODE", len(self.new_nodes), self.new_nodes)
+            self.new_nodes = []
+        if self.new_cpus:
+            self.block(b"CPUS", len(self.new_cpus), self.new_cpus)
+            self.new_cpus = []
+        if len(self.cols[0]) > 0:
+            self.block(b"ROWS", len(self.cols[0]), b"".join([c.tobytes() for c in self.cols]))
+            self.cols = [array(typ) for _, typ in BIN_COLUMNS]
+        self.f.flush()
+
+class OutputBinary(Output):
+    """Output data in a columnar binary format."""
+    def __init__(self, logfile, args, version, cpu):
+        Output.__init__(self, logfile, version, cpu, args)
+        self.writers = {} # type: Dict[str, BinaryWriter]
+
+    def open_files(self, args):
+        return open_all_logfiles(args, args.output, open_binfile)
+
+    def item(self, area, name, uval, timestamp, unit, desc, title, sample, bn, below, idle):
+        assert isinstance(uval, UVal)
+        # descriptions are stored once per node, no need to suppress them
+        self.show(timestamp, title, area or "", name, uval, unit, desc, sample, bn, below, idle)
+
+    def show(self, timestamp, title, area, hdr, val, unit, desc, sample, bn, below, idle):
+        w = self.writers.get(self.curname)
+        if w is None:
+            w = self.writers[self.curname] = BinaryWriter(self.logf, self.version)
+        flags = ((BIN_BN if bn else 0) | (BIN_BELOW if below else 0) |
+                 (BIN_IDLE if idle else 0) | (BIN_RATIO if val.is_ratio else 0))
+        if title and re.match(r'[0-9]+', title):
+            title = "CPU" + title
+        w.add(timestamp, title or "", area, hdr, val, unit,
+              "" if self.args.no_desc else desc, sample, flags)
+
+    def flush(self):
+        for w in self.writers.values():
+            w.flush()
+
+    def remark(self, m):
+        pass
+
+    print_footer = flush
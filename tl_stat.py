@@ -13,6 +13,7 @@
 # Maintain error data on perf measurements
 from __future__ import print_function
 import math
+from array import array
 from collections import namedtuple
 from tl_io import warn, warn_test, inform
 
@@ -28,6 +29,72 @@ def combine_valstat(l):
         return []
     return ValStat(geoadd([x.stddev for x in l]), min([x.multiplex for x in l]))
 
+def float_array(l=()):
+    return array('d', l)
+
+class ValStats(object):
+    """ValStats of a result vector stored as two float arrays instead of
+       a list of ValStat tuples. Indexing still returns ValStat."""
+    __slots__ = ('stddev', 'multiplex')
+
+    def __init__(self, stddev=None, multiplex=None):
+        self.stddev = stddev if stddev is not None else float_array()
+        self.multiplex = multiplex if multiplex is not None else float_array()
+
+    def add(self, stddev, multiplex):
+        self.stddev.append(stddev)
+        self.multiplex.append(multiplex)
+
+    def append(self, st):
+        self.add(st.stddev, st.multiplex)
+
+    def __len__(self):
+        return len(self.stddev)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ValStats(self.stddev[i], self.multiplex[i])
+        return ValStat(self.stddev[i], self.multiplex[i])
+
+    def __setitem__(self, i, st):
+        self.stddev[i] = st.stddev
+        self.multiplex[i] = st.multiplex
+
+    def __iter__(self):
+        return map(ValStat, self.stddev, self.multiplex)
+
+    def __iadd__(self, other):
+        self.stddev += other.stddev
+        self.multiplex += other.multiplex
+        return self
+
+    def __getstate__(self):
+        return (self.stddev, self.multiplex)
+
+    def __setstate__(self, state):
+        self.stddev, self.multiplex = state
+
+    def merge(self, other):
+        """Combine with the ValStats of another interval, like combine_valstat
+           for each element. Elements only in other are appended."""
+        n = min(len(self), len(other))
+        # stddev is usually all zero and multiplex the same
+        if any(self.stddev[:n]) or any(other.stddev[:n]):
+            self.stddev[:n] = float_array(map(lambda a, b: math.sqrt(a**2 + b**2),
+                                              self.stddev[:n], other.stddev[:n]))
+        if self.multiplex[:n] != other.multiplex[:n]:
+            self.multiplex[:n] = float_array(map(min, self.multiplex[:n], other.multiplex[:n]))
+        self.stddev += other.stddev[n:]
+        self.multiplex += other.multiplex[n:]
+
+def combine_valstats(l):
+    """combine_valstat for each element of a list of ValStats."""
+    return ValStats(float_array(map(lambda *a: geoadd(a), *[x.stddev for x in l])),
+                    float_array(map(min, *[x.multiplex for x in l])))
+
+def zero_valstats(n):
+    return ValStats(float_array([0.0]) * n, float_array([0.0]) * n)
+
 class ComputeStat:
     """Maintain statistics on measurement data."""
     def __init__(self, quiet):
@@ -40,6 +107,16 @@ class ComputeStat:
         self.prev_mismeasured = set()
         self.quiet = quiet
 
+    def merge(self, other):
+        """Merge state of another ComputeStat, e.g. from a parallel worker."""
+        self.referenced |= other.referenced
+        self.already_warned |= other.already_warned
+        self.errcount += other.errcount
+        self.errors |= other.errors
+        self.prev_errors |= other.prev_errors
+        self.mismeasured |= other.mismeasured
+        self.prev_mismeasured |= other.prev_mismeasured
+
     def referenced_check(self, res, evnum):
         referenced = self.referenced
         referenced = referenced - self.already_warned
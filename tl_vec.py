@@ -0,0 +1,693 @@
+# Copyright (c) 2012-2026, Intel Corporation
+# Author: Andi Kleen
+#
+# This program is free software; you can redistribute it and/or modify it
+# under the terms and conditions of the GNU General Public License,
+# version 2, as published by the Free Software Foundation.
+#
+# This program is distributed in the hope it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for
+# more details.
+#
+# Vectorized evaluation of the toplev models for many CPUs at once
+# (toplev --vector-compute). Needs numpy.
+#
+# The models are generated for scalar values. To evaluate a node for all
+# CPUs of an interval in one call the model source is rewritten so that
+# divisions, min/max, and/or/not, chained compares and conditional
+# expressions also work on numpy arrays with one element per CPU ("lane").
+# Lanes where the scalar code would behave differently (division by zero,
+# min/max selecting an integer constant, side effects in a branch the
+# scalar code would have skipped) are marked in the fallback mask and have
+# to be computed by the caller with the scalar path. Constructs that cannot
+# be vectorized at all raise VecFallback.
+#
+# Measurements with uncertainty (UVal in the scalar code) are represented
+# as VecUVal, with parallel arrays for the value, standard deviation and
+# multiplex ratio of all lanes. Its operators apply the UVal propagation
+# rules to all lanes at once.
+#
+from __future__ import print_function
+import ast
+import inspect
+import operator
+import sys
+import numpy as np
+from tl_uval import UVal, TEMPVAL
+
+class VecFallback(Exception):
+    """Cannot vectorize this evaluation. Use the scalar path."""
+    pass
+
+class VecState(object):
+    """State of one vector evaluation pass over lanes."""
+    def __init__(self, lanes):
+        self.lanes = lanes
+        self.fallback = np.zeros(lanes, dtype=bool)
+        # state of nodes before nested computes inside branches
+        self.log = [] # type: ignore
+        self.depth = 0
+        # nodes with lanes that still need the state from before a
+        # skipped branch, which could not be merged per lane
+        self.pending = {} # type: ignore
+
+state = VecState(0)
+
+def quiet():
+    """Context for a vector pass. Lanes that fall back can have inf or
+       nan values, don't warn about them."""
+    return np.errstate(all="ignore")
+
+def isvec(x):
+    return isinstance(x, (np.ndarray, VecUVal))
+
+def truth(x):
+    """Truth value per lane."""
+    if isinstance(x, np.ndarray):
+        if x.dtype == np.bool_:
+            return x
+        return x != 0
+    if isinstance(x, VecUVal):
+        return x.value != 0
+    return bool(x)
+
+def _kind(x):
+    if isinstance(x, np.ndarray):
+        return "bool" if x.dtype == np.bool_ else "num"
+    if isinstance(x, VecUVal):
+        return "num"
+    if isinstance(x, bool):
+        return "bool"
+    if isinstance(x, (int, float)):
+        return "num"
+    return None
+
+def _blend(obj, skipped, old, new):
+    # old for the lanes in skipped, otherwise new
+    if old is new:
+        return new
+    kind = _kind(old)
+    if kind is None or kind != _kind(new):
+        state.pending[obj] = state.pending.get(obj, False) | skipped
+        return new
+    if isinstance(old, VecUVal) or isinstance(new, VecUVal):
+        return _uval_where(skipped, old, new)
+    val = np.where(skipped, old, new)
+    if kind == "bool":
+        return val
+    oi, ni = _intmask(old, state.lanes), _intmask(new, state.lanes)
+    return _with_ints(val, np.where(skipped, oi, ni), mask(state.lanes, True))
+
+def _branch(th, taken):
+    """Evaluate thunk th, which the scalar code only evaluates for the
+       lanes in taken. Nodes computed by th keep their old state in the
+       other lanes."""
+    if taken.all():
+        return th()
+    fallback = state.fallback.copy()
+    n = len(state.log)
+    state.depth += 1
+    try:
+        val = th()
+    finally:
+        state.depth -= 1
+    state.fallback = fallback | (state.fallback & taken)
+    skipped = ~taken
+    seen = set() # type: ignore
+    for obj, oval, othresh, oerrcount, opending in state.log[n:]:
+        if obj in seen:
+            continue
+        seen.add(obj)
+        if opending is not None:
+            state.pending[obj] = state.pending.get(obj, False) | (opending & skipped)
+        obj.val = _blend(obj, skipped, oval, obj.val)
+        obj.thresh = _blend(obj, skipped, othresh, obj.thresh)
+        if getattr(obj, "errcount", 0) != oerrcount:
+            state.fallback |= skipped
+    if state.depth == 0:
+        del state.log[:]
+    return val
+
+def resolve(obj):
+    """obj is computed again for all lanes."""
+    state.pending.pop(obj, None)
+    parent = getattr(obj, "parent", None)
+    if parent in state.pending:
+        state.fallback |= state.pending[parent]
+
+def unresolved():
+    """Lanes that still have state from skipped branches."""
+    m = mask(state.lanes)
+    for p in state.pending.values():
+        m |= p
+    state.pending.clear()
+    return m
+
+def vdiv(a, b):
+    if isvec(b):
+        zero = _value(b) == 0
+        if zero.any():
+            state.fallback |= zero
+        return a / b
+    if isvec(a) and b == 0:
+        raise ZeroDivisionError("vector division by zero")
+    return a / b
+
+class IntLanes(np.ndarray):
+    """Result of a selection where some lanes hold an integer constant,
+       like the scalar max(0, x). Arithmetic on it gives plain floats
+       again, as in the scalar code."""
+    def __array_finalize__(self, obj):
+        self.intmask = None
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        ints = [_intmask(x, state.lanes) for x in inputs]
+        plain = [np.asarray(x) if isinstance(x, IntLanes) else x for x in inputs]
+        res = getattr(ufunc, method)(*plain, **kwargs)
+        if ufunc not in _cmpufuncs:
+            # integer arithmetic stays integer in the scalar code
+            both = mask(state.lanes, True)
+            for m in ints:
+                both = both & m if m is not None else mask(state.lanes)
+            state.fallback |= both
+        return res
+
+def _intmask(x, lanes):
+    # lanes where x is an int in the scalar code. None if x cannot be represented.
+    if isinstance(x, np.ndarray):
+        m = getattr(x, "intmask", None)
+        return m if m is not None else np.zeros(lanes, dtype=bool)
+    if isinstance(x, VecUVal):
+        return x.ints
+    if isinstance(x, UVal):
+        return _intmask(x.value, lanes)
+    if isinstance(x, float):
+        return np.zeros(lanes, dtype=bool)
+    if type(x) is int:
+        return np.ones(lanes, dtype=bool)
+    return None
+
+def _with_ints(val, ints, mask):
+    # val with int lanes ints. Lanes in mask where the type is unknown fall back.
+    if ints is None:
+        state.fallback |= mask
+        return np.asarray(val)
+    ints = ints & mask
+    if not ints.any():
+        return val
+    val = np.asarray(val, dtype=float).view(IntLanes)
+    val.intmask = ints
+    return val
+
+def _value(x):
+    return x.value if isinstance(x, (VecUVal, UVal)) else x
+
+def _sq(x):
+    # x**2 rounded like the scalar code, which uses pow() that can differ
+    # from x * x in the last bit. Most stddevs are zero.
+    if not isinstance(x, np.ndarray):
+        return pow(float(x), 2)
+    res = np.zeros(x.shape)
+    nz = np.flatnonzero(x)
+    if len(nz):
+        res.flat[nz] = [pow(v, 2) for v in x.flat[nz].tolist()]
+    return res
+
+def _parts(x):
+    """value, stddev, mux, UVal lanes, int lanes of x."""
+    if isinstance(x, VecUVal):
+        return x.value, x.stddev, x.mux, x.uval, x.ints
+    if isinstance(x, UVal):
+        return x.value, x.stddev, x.multiplex, mask(state.lanes, True), _intmask(x.value, state.lanes)
+    if isinstance(x, np.ndarray):
+        return np.asarray(x), 0., 100., mask(state.lanes), _intmask(x, state.lanes)
+    return x, 0., 100., mask(state.lanes), _intmask(x, state.lanes)
+
+def _uval(value, stddev, mux, uval, ints):
+    # plain values when no lane has an UVal
+    if not uval.any():
+        return _with_ints(value, ints, mask(state.lanes, True))
+    return VecUVal(value, stddev, mux, uval, ints)
+
+def _uval_where(cond, a, b):
+    """a in the lanes in cond, otherwise b, keeping the UVal state per lane."""
+    av, asd, amux, au, ai = _parts(a)
+    bv, bsd, bmux, bu, bi = _parts(b)
+    ints = None
+    if ai is not None and bi is not None:
+        ints = np.where(cond, ai, bi)
+    return _uval(np.where(cond, av, bv), np.where(cond, asd, bsd), np.where(cond, amux, bmux),
+                 np.where(cond, au, bu), ints)
+
+def _calc(op, a, b):
+    """a op b with the UVal propagation rules for each lane. Lanes where
+       the scalar code computes with plain numbers stay plain numbers."""
+    av, asd, amux, au, ai = _parts(a)
+    bv, bsd, bmux, bu, bi = _parts(b)
+    # the scalar fast path without uncertainty
+    plain = (~au | ((asd == 0) & (amux == 100.0))) & (~bu | ((bsd == 0) & (bmux == 100.0)))
+    if ai is None or bi is None:
+        state.fallback |= plain
+    elif op is not operator.truediv:
+        # integer arithmetic stays integer in the scalar code
+        state.fallback |= plain & ai & bi
+    f = op(av, bv)
+    calc = ~plain
+    if not calc.any():
+        return np.asarray(f)
+    if op in (operator.mul, operator.truediv):
+        nonzero = (av != 0) & (bv != 0)
+        u = np.where(nonzero, np.abs(f) * np.sqrt(_sq(np.divide(asd, av)) + _sq(np.divide(bsd, bv))), 0.)
+    else:
+        u = np.sqrt(_sq(asd) + _sq(bsd))
+    # UVal._calc converts integral results to int
+    ints = calc & np.isfinite(f) & (f == np.floor(f))
+    return _uval(f, np.where(calc, u, 0.), np.where(calc, np.minimum(amux, bmux), 100.),
+                 calc, ints)
+
+class VecUVal(object):
+    """UVal for all lanes, as parallel arrays of value, stddev and multiplex
+       ratio. Lanes not in uval are plain numbers in the scalar code,
+       lanes in ints have an int value. Arithmetic applies the UVal rules
+       per lane, compares use the values."""
+
+    # make numpy use the reflected operators below
+    __array_ufunc__ = None
+
+    def __init__(self, value, stddev, mux, uval, ints=None, name=TEMPVAL):
+        self.value = value
+        self.stddev = stddev
+        self.mux = mux
+        self.uval = uval
+        self.ints = ints if ints is not None else mask(state.lanes)
+        self.name = name
+
+    def __bool__(self):
+        # a truth test that is not handled per lane
+        raise VecFallback()
+
+    __nonzero__ = __bool__
+
+    def __add__(self, other):
+        return _calc(operator.add, self, other)
+
+    def __radd__(self, other):
+        return _calc(operator.add, other, self)
+
+    def __sub__(self, other):
+        return _calc(operator.sub, self, other)
+
+    def __rsub__(self, other):
+        return _calc(operator.sub, other, self)
+
+    def __mul__(self, other):
+        return _calc(operator.mul, self, other)
+
+    def __rmul__(self, other):
+        return _calc(operator.mul, other, self)
+
+    def __truediv__(self, other):
+        return _calc(operator.truediv, self, other)
+
+    def __rtruediv__(self, other):
+        return _calc(operator.truediv, other, self)
+
+    def __lt__(self, other):
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        return self.value >= _value(other)
+
+    def __eq__(self, other):
+        return self.value == _value(other)
+
+    def __ne__(self, other):
+        return self.value != _value(other)
+
+    __hash__ = None
+
+    def tolist(self):
+        """UVal or number for each lane."""
+        vals = self.value.tolist()
+        sd, mux = self.stddev.tolist(), self.mux.tolist()
+        ints = self.ints.tolist()
+        for i, u in enumerate(self.uval.tolist()):
+            v = int(vals[i]) if ints[i] else vals[i]
+            vals[i] = UVal(self.name, value=v, stddev=sd[i], mux=mux[i], computed=True) if u else v
+        return vals
+
+def _select(builtin, better, args):
+    items = args[0] if len(args) == 1 else args
+    items = list(items)
+    if not any(isvec(x) for x in items):
+        return builtin(items)
+    if any(isinstance(x, (VecUVal, UVal)) for x in items):
+        cur = items[0]
+        for item in items[1:]:
+            cur = _uval_where(truth(better(item, cur)), item, cur)
+        return cur
+    # same order of compares as the builtin, tracking the lanes where
+    # an integer constant is selected
+    cur = items[0]
+    ints = _intmask(cur, state.lanes)
+    for item in items[1:]:
+        pick = truth(better(item, cur))
+        cur = np.where(pick, item, cur)
+        iints = _intmask(item, state.lanes)
+        if ints is None or iints is None:
+            return _with_ints(cur, None, mask(state.lanes, True))
+        ints = np.where(pick, iints, ints)
+    return _with_ints(cur, ints, mask(state.lanes, True))
+
+def vmax(*args):
+    return _select(max, lambda a, b: a > b, args)
+
+def vmin(*args):
+    return _select(min, lambda a, b: a < b, args)
+
+def vand(val, *rest):
+    for th in rest:
+        if not isvec(val):
+            if not val:
+                return val
+            val = th()
+            continue
+        t = truth(val)
+        if not t.any():
+            return t
+        val = t & truth(_branch(th, t))
+    return val
+
+def vor(val, *rest):
+    for th in rest:
+        if not isvec(val):
+            if val:
+                return val
+            val = th()
+            continue
+        t = truth(val)
+        if t.all():
+            return t
+        val = t | truth(_branch(th, ~t))
+    return val
+
+def vnot(x):
+    if isvec(x):
+        return ~truth(x)
+    return not x
+
+def vif(test, body, orelse):
+    if not isvec(test):
+        return body() if test else orelse()
+    t = truth(test)
+    if t.all():
+        return body()
+    if not t.any():
+        return orelse()
+    b = _branch(body, t)
+    o = _branch(orelse, ~t)
+    for x in (b, o):
+        if not isinstance(x, (np.ndarray, VecUVal, UVal, float, int)):
+            raise VecFallback()
+    if any(isinstance(x, (VecUVal, UVal)) for x in (b, o)):
+        return _uval_where(t, b, o)
+    bi, oi = _intmask(b, state.lanes), _intmask(o, state.lanes)
+    if bi is None or oi is None:
+        return _with_ints(np.where(t, b, o), None, mask(state.lanes, True))
+    return _with_ints(np.where(t, b, o), np.where(t, bi, oi), mask(state.lanes, True))
+
+def vtest(x):
+    """Condition of an if or while statement. All lanes need to agree."""
+    if not isvec(x):
+        return x
+    t = truth(x)
+    if t.all():
+        return True
+    if not t.any():
+        return False
+    raise VecFallback()
+
+_cmpufuncs = (np.less, np.less_equal, np.greater, np.greater_equal,
+              np.equal, np.not_equal)
+
+_cmpops = {
+    "Lt": lambda a, b: a < b,
+    "LtE": lambda a, b: a <= b,
+    "Gt": lambda a, b: a > b,
+    "GtE": lambda a, b: a >= b,
+    "Eq": lambda a, b: a == b,
+    "NotEq": lambda a, b: a != b,
+}
+
+def vcompare(left, *pairs):
+    """Chained compare left op1 b op2 c ... with lazily evaluated comparators."""
+    res = None # type: ignore
+    for i in range(0, len(pairs), 2):
+        op, th = _cmpops[pairs[i]], pairs[i + 1]
+        if res is None or not isvec(res):
+            if res is not None and not res:
+                return res
+            right = th()
+            res = op(left, right)
+        else:
+            t = truth(res)
+            if not t.any():
+                return t
+            right = _branch(th, t)
+            res = t & truth(op(left, right))
+        left = right
+    return res
+
+def in_range(v, lo, hi):
+    """lo < v < hi per lane"""
+    if isinstance(v, VecUVal):
+        v = v.value
+    if isinstance(v, np.ndarray):
+        return (lo < v) & (v < hi)
+    return lo < v < hi
+
+def mask_false(x, mask):
+    """x, but false for all lanes in mask"""
+    if isinstance(mask, np.ndarray):
+        return truth(x) & ~mask
+    return False if mask else x
+
+class Source(object):
+    """Results for all lanes as matrices [lane, result index].
+       When the scalar path sees tuples of merged CPUs there is
+       one matrix per merged CPU."""
+    def __init__(self, rows, strows, sel, merged):
+        self.mats = [rows[s] for s in sel]
+        self.merged = merged
+        self.width = rows.shape[1]
+        mux = None # type: ignore
+        for s in sel:
+            st = strows[s]
+            mux = st[:, :, 1] if mux is None else np.minimum(mux, st[:, :, 1])
+        if merged:
+            # same as combine_valstats
+            sq = _sq(strows[sel[0]][:, :, 0])
+            for s in sel[1:]:
+                sq = sq + _sq(strows[s][:, :, 0])
+            self.stddev = np.sqrt(sq)
+        else:
+            self.stddev = strows[sel[0]][:, :, 0]
+        self.muxes = mux
+        self.uncertain = (self.stddev != 0) | (mux != 100.0)
+        self.nanlanes = np.isnan(mux).any(axis=1)
+        self.mux = mux.min(axis=1)
+
+    def column(self, index, cpuoff):
+        if index >= self.width:
+            raise VecFallback()
+        if not self.merged:
+            return self.mats[0][:, index]
+        if cpuoff == -1:
+            return sum([m[:, index] for m in self.mats])
+        return self.mats[cpuoff][:, index]
+
+    def uval(self, index, value, name):
+        """value for the column of index as VecUVal, or value when
+           the result of no lane is uncertain."""
+        uncertain = self.uncertain[:, index]
+        if not uncertain.any():
+            return value
+        return VecUVal(value, self.stddev[:, index], self.muxes[:, index], uncertain, name=name)
+
+def matrix(rows):
+    return np.array(rows, dtype=float)
+
+def valstat_matrix(l):
+    """[row, result index, stddev/multiplex] matrix from a list of ValStats."""
+    return np.stack((matrix([v.stddev for v in l]), matrix([v.multiplex for v in l])), axis=2)
+
+def index_array(l):
+    return np.array(l, dtype=int)
+
+def mask(lanes, val=False):
+    return np.full(lanes, val, dtype=bool)
+
+def zeros(lanes):
+    return np.zeros(lanes, dtype=int)
+
+def nonzero_lanes(x):
+    return np.flatnonzero(x)
+
+def tolist(x):
+    if isinstance(x, VecUVal):
+        return x.tolist()
+    if isinstance(x, np.ndarray):
+        l = x.tolist()
+        ints = getattr(x, "intmask", None)
+        if ints is not None:
+            for i in np.flatnonzero(ints):
+                l[i] = int(l[i])
+        return l
+    return x
+
+# compute functions for node classes, filled by vectorize_module
+vcompute_map = {} # type: ignore
+
+def _plain_compute(obj, EV):
+    return obj.compute(EV)
+
+def compute_func(obj):
+    """Vectorized compute function for node obj, called as f(obj, EV)"""
+    f = vcompute_map.get(type(obj))
+    if f is None:
+        if type(obj).__module__ != "__main__":
+            vectorize_module(sys.modules[type(obj).__module__])
+        f = vcompute_map.setdefault(type(obj), _plain_compute)
+    return f
+
+def vcompute(obj, EV):
+    if state.depth > 0:
+        state.log.append((obj, obj.val, obj.thresh, getattr(obj, "errcount", 0),
+                          state.pending.get(obj)))
+    state.pending.pop(obj, None)
+    return compute_func(obj)(obj, EV)
+
+def _call(name, args, node):
+    return ast.copy_location(ast.Call(func=ast.Name(id=name, ctx=ast.Load()),
+                                      args=args, keywords=[]), node)
+
+def _thunk(expr):
+    return ast.copy_location(ast.Lambda(args=ast.arguments(posonlyargs=[], args=[], vararg=None,
+                                                           kwonlyargs=[], kw_defaults=[],
+                                                           kwarg=None, defaults=[]),
+                                        body=expr), expr)
+
+class VecTransformer(ast.NodeTransformer):
+    """Rewrite scalar model code to use the vector helpers."""
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Div):
+            return _call("_tlv_div", [node.left, node.right], node)
+        return node
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        fn = "_tlv_and" if isinstance(node.op, ast.And) else "_tlv_or"
+        return _call(fn, [node.values[0]] + [_thunk(x) for x in node.values[1:]], node)
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return _call("_tlv_not", [node.operand], node)
+        return node
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        return _call("_tlv_if", [node.test, _thunk(node.body), _thunk(node.orelse)], node)
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+        node.test = _call("_tlv_test", [node.test], node.test)
+        return node
+
+    def visit_While(self, node):
+        self.generic_visit(node)
+        node.test = _call("_tlv_test", [node.test], node.test)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        if len(node.ops) == 1 and type(node.ops[0]).__name__ in _cmpops:
+            return node
+        args = [node.left]
+        for op, c in zip(node.ops, node.comparators):
+            name = type(op).__name__
+            if name not in _cmpops:
+                return node
+            args += [ast.copy_location(ast.Constant(value=name), node), _thunk(c)]
+        return _call("_tlv_compare", args, node)
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if isinstance(node.func, ast.Name) and node.func.id in ("max", "min"):
+            node.func = ast.copy_location(ast.Name(id="_tlv_" + node.func.id, ctx=ast.Load()),
+                                          node.func)
+        elif (isinstance(node.func, ast.Attribute) and node.func.attr == "compute" and
+                len(node.args) == 1 and not node.keywords):
+            return _call("_tlv_compute", [node.func.value, node.args[0]], node)
+        return node
+
+_helpers = {
+    "_tlv_div": vdiv,
+    "_tlv_max": vmax,
+    "_tlv_min": vmin,
+    "_tlv_and": vand,
+    "_tlv_or": vor,
+    "_tlv_not": vnot,
+    "_tlv_if": vif,
+    "_tlv_test": vtest,
+    "_tlv_compare": vcompare,
+    "_tlv_compute": vcompute,
+}
+
+_vectorized = set() # type: ignore
+
+def _compile_func(fdef, filename, glob):
+    mod = ast.Module(body=[fdef], type_ignores=[])
+    mod = ast.fix_missing_locations(VecTransformer().visit(mod))
+    ns = {} # type: ignore
+    exec(compile(mod, filename, "exec"), glob, ns)
+    return ns[fdef.name]
+
+def vectorize_module(module):
+    """Generate vector versions of the helpers and node compute methods of
+       a model module. Must be called after the model is set up, as it
+       uses a snapshot of the module globals."""
+    if module.__name__ in _vectorized:
+        return
+    _vectorized.add(module.__name__)
+    try:
+        filename = inspect.getsourcefile(module)
+        src = inspect.getsource(module)
+    except (TypeError, IOError):
+        return
+    tree = ast.parse(src, filename)
+    glob = dict(module.__dict__)
+    glob.update(_helpers)
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            code = getattr(glob.get(node.name), "__code__", None)
+            # keep functions overridden at setup
+            if code is None or code.co_name != node.name or code.co_filename != filename:
+                continue
+            glob[node.name] = _compile_func(node, filename, glob)
+        elif isinstance(node, ast.ClassDef):
+            cls = glob.get(node.name)
+            if not inspect.isclass(cls):
+                continue
+            for m in node.body:
+                if isinstance(m, ast.FunctionDef) and m.name == "compute":
+                    vcompute_map[cls] = _compile_func(m, filename, glob)
@@ -1,11 +1,21 @@
 import os
+import sys
+import stat
 import csv
 import re
-from collections import defaultdict
+import json
+from array import array
+from itertools import compress
+from collections import defaultdict, namedtuple
 import gen_level
+import tl_output
+
+# times[t], names[n], cpus[c] (None for no CPU), and for every series k
+# the indexes name[k] and cpu[k] and its values[k, t] (NaN when missing)
+Series = namedtuple("Series", "times names cpus name cpu values")
 
 class TLData:
-    """Read a toplev output CSV file.
+    """Read a toplev output CSV file, or a file written by toplev --binary.
 
    Exported:
     times[n] All time stamps
@@ -16,36 +26,126 @@ class TLData:
     metrics(set) All metrics
     helptxt[col] All help texts.
     cpus(set)    All CPUs
+    generation   Incremented every time update() reads new data
+
+   For binary files also:
+    columns{col} All rows as arrays for the tl_output.BIN_COLUMNS columns.
+                 Values are not scaled and include below threshold and summary rows.
+    nodes[id]    [area, name, unit, description, sample] for the node column
+    cpunames[id] CPU name for the cpu column ("" for none)
+    times and vals are only generated from the columns when first used.
+
+   arrays() returns all data as numpy arrays.
+
+   update() reads only the data appended since the last update, so it can
+   be called repeatedly on a file that toplev is still writing.
     """
 
     def __init__(self, fn, verbose=False):
-        self.times = []
-        self.vals = []
         self.fn = fn
+        self.verbose = verbose
+        self.generation = 0
+        # number of times the data was thrown away and read from the start
+        self.resets = 0
+        self.reset()
+
+    def reset(self):
+        self.resets += 1
+        self._times = []
+        self._vals = []
         self.levels = defaultdict(set)
         self.metrics = set()
         self.headers = set()
-        self.mtime = None
         self.helptxt = {}
         self.cpus = set()
-        self.verbose = verbose
         self.units = {}
+        # where to continue reading
+        self.ident = None
+        self.offset = 0
+        self.binary = None
+        self.prevts = None
+        self.val = {}
+        # csv parsing caches
+        self.cpu_column = {}
+        self.seen = set()
+        # binary format state
+        self.columns = {name: array(typ) for name, typ in tl_output.BIN_COLUMNS}
+        self.nodes = []
+        self.node_ids = {}
+        self.cpunames = []
+        self.nodemap = []
+        self.cpumap = []
+        self.remap = False
+        self.expanded = 0
+
+    @property
+    def times(self):
+        self.expand()
+        return self._times
+
+    @property
+    def vals(self):
+        self.expand()
+        return self._vals
 
     def update(self):
-        mtime = os.path.getmtime(self.fn)
-        if self.mtime == mtime:
+        """Read the data appended to the file since the last update.
+           Start over when the file was truncated or replaced.
+           Returns True when anything new was read."""
+        old = (self.ident, self.offset)
+        self.read_appended()
+        if (self.ident, self.offset) == old:
+            return False
+        self.generation += 1
+        return True
+
+    def read_appended(self):
+        st = os.stat(self.fn)
+        if not stat.S_ISREG(st.st_mode):
+            # pipes, like /dev/stdin from toplev --graph, can be only read once
+            if self.ident is None:
+                self.ident = (st.st_dev, st.st_ino)
+                self.binary = False
+                with open(self.fn, 'r') as f:
+                    self.parse_csv(f)
             return
-        self.mtime = mtime
-        csvf = csv.reader(open(self.fn, 'r'))
-        prevts = None
-        val = {}
-        for r in csvf:
-            if r[0].strip().startswith("#"):
+        ident = (st.st_dev, st.st_ino)
+        if ident != self.ident or st.st_size < self.offset:
+            self.reset()
+            self.ident = ident
+        if st.st_size == self.offset:
+            return
+        with open(self.fn, 'rb') as f:
+            if self.binary is None:
+                if st.st_size < len(tl_output.BIN_MAGIC):
+                    return
+                self.binary = f.read(len(tl_output.BIN_MAGIC)) == tl_output.BIN_MAGIC
+                if self.binary:
+                    self.offset = len(tl_output.BIN_MAGIC)
+            if self.binary:
+                self.update_binary(f)
+                return
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+        # only complete lines
+        data = data[:data.rfind(b"\n") + 1]
+        self.offset += len(data)
+        self.parse_csv(data.decode().splitlines())
+
+    def parse_csv(self, lines):
+        prevts, val = self.prevts, self.val
+        cpu_column, seen = self.cpu_column, self.seen
+        for r in csv.reader(lines):
+            if not r or r[0].strip().startswith("#"):
                 continue
-            if r[0] == "Timestamp" or r[0] == "CPUs":
+            # SUMMARY-<ts> are --summary-every windows
+            if r[0] in ("Timestamp", "CPUs") or r[0].startswith("SUMMARY"):
                 continue
             # 1.001088024,C1,Frontend_Bound,42.9,% Slots,,frontend_retired.latency_ge_4:pp,0.0,100.0,<==,Y
-            if re.match(r'[CS]?\d+.*', r[1]):
+            has_cpu = cpu_column.get(r[1])
+            if has_cpu is None:
+                has_cpu = cpu_column[r[1]] = re.match(r'(CPU|[CS])?\d+.*', r[1]) is not None
+            if has_cpu:
                 ts, cpu, name, pct, unit, helptxt = r[0], r[1], r[2], r[3], r[4], r[5]
             else:
                 ts, name, pct, unit, helptxt = r[0], r[1], r[2], r[3], r[4]
@@ -59,11 +159,16 @@ class TLData:
                 if not self.verbose:
                     continue
             self.units[name] = unit
-            if prevts and ts != prevts:
-                self.times.append(prevts)
-                self.vals.append(val)
+            # the last interval may be still growing, so append it right away
+            if ts != prevts:
                 val = {}
+                self._times.append(ts)
+                self._vals.append(val)
             val[key] = pct
+            prevts = ts
+            if key in seen:
+                continue
+            seen.add(key)
             n = gen_level.level_name(name)
             if cpu:
                 self.cpus.add(cpu)
@@ -71,10 +176,140 @@ class TLData:
             if gen_level.is_metric(name):
                 self.metrics.add(n)
             self.levels[n].add(name)
+        self.prevts, self.val = prevts, val
+
+    def update_binary(self, f):
+        import mmap
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        below = tl_output.BIN_BELOW if not self.verbose else 0
+        keep_table = bytes([0 if x & below else 1 for x in range(256)])
+        used = set()
+        used_cpus = set()
+        for tag, count, offset, length in tl_output.bin_blocks(mm, self.offset):
+            self.offset = offset + length
+            if tag == b"ROWS":
+                cols = tl_output.bin_columns(mm, count, offset)
+                for name, _ in tl_output.BIN_COLUMNS:
+                    col = cols[name]
+                    # ids are per segment
+                    if self.remap and name == "node":
+                        col = array('i', [self.nodemap[x] for x in col])
+                    elif self.remap and name == "cpu":
+                        col = array('i', [self.cpumap[x] for x in col])
+                    self.columns[name].frombytes(memoryview(col).cast("B"))
+                keep = cols["flags"].tobytes().translate(keep_table)
+                used.update(compress(self.columns["node"][-count:], keep))
+                used_cpus.update(compress(self.columns["cpu"][-count:], keep))
+                continue
+            data = json.loads(mm[offset:offset + length].rstrip(b"\0").decode())
+            if tag == b"META":
+                if data["byteorder"] != sys.byteorder:
+                    sys.exit("%s: written with different byte order" % self.fn)
+                self.nodemap, self.cpumap = [], []
+            elif tag == b"NODE":
+                for n in data:
+                    key = (n[1], n[2])
+                    if key not in self.node_ids:
+                        self.node_ids[key] = len(self.nodes)
+                        self.nodes.append(n[1:])
+                    node = self.node_ids[key]
+                    if n[0] == len(self.nodemap):
+                        self.nodemap.append(node)
+                    if not self.nodes[node][3]:
+                        self.nodes[node][3] = n[4]
+                    if not self.helptxt.get(n[2]):
+                        self.helptxt[n[2]] = n[4]
+            elif tag == b"CPUS":
+                for c in data:
+                    if c not in self.cpunames:
+                        self.cpunames.append(c)
+                    self.cpumap.append(self.cpunames.index(c))
+            self.remap = (self.nodemap != list(range(len(self.nodemap))) or
+                          self.cpumap != list(range(len(self.cpumap))))
+        self.cpus |= {self.cpunames[c] for c in used_cpus if self.cpunames[c]}
+        for node in used:
+            _, name, unit, _, _ = self.nodes[node]
+            self.units[name] = unit
+            n = gen_level.level_name(name)
+            self.headers.add(name)
+            if gen_level.is_metric(name):
+                self.metrics.add(n)
+            self.levels[n].add(name)
+
+    def expand(self):
+        """Generate times and vals for the binary rows read since the last expand."""
+        start = self.expanded
+        if start == len(self.columns["ts"]):
+            return
+        self.expanded = len(self.columns["ts"])
+        names = [n[1] for n in self.nodes]
+        cpunames = [c if c else None for c in self.cpunames]
+        c = self.columns
+        prevts, val = self.prevts, self.val
+        for ts, v, cpu, node, flags in zip(c["ts"][start:], c["value"][start:], c["cpu"][start:],
+                                           c["node"][start:], c["flags"][start:]):
+            # no summary
+            if ts != ts:
+                continue
+            if flags & tl_output.BIN_BELOW and not self.verbose:
+                continue
+            if ts != prevts:
+                val = {}
+                self._times.append(ts)
+                self._vals.append(val)
+            val[(names[node], cpunames[cpu])] = v * 100. if flags & tl_output.BIN_RATIO else v
             prevts = ts
-        if len(val.keys()) > 0:
-            self.times.append(prevts)
-            self.vals.append(val)
+        self.prevts, self.val = prevts, val
+
+    def arrays(self):
+        """Return all data as a Series of numpy arrays, with one series for
+           every name and CPU combination. Binary files are converted from
+           the columns directly."""
+        import numpy as np
+        if self.binary:
+            return self.binary_arrays(np)
+        names = sorted(self.headers)
+        name_ind = {n: i for i, n in enumerate(names)}
+        cpus = sorted(self.cpus) + [None]
+        cpu_ind = {c: i for i, c in enumerate(cpus)}
+        series = {}
+        kind, tind, val = array('i'), array('i'), array('d')
+        for t, v in enumerate(self.vals):
+            for key, x in v.items():
+                if key not in series:
+                    series[key] = len(series)
+                kind.append(series[key])
+                tind.append(t)
+                val.append(x)
+        values = np.full((len(series), len(self.times)), np.nan)
+        values[np.asarray(kind), np.asarray(tind)] = np.asarray(val)
+        keys = list(series.keys())
+        return Series(np.array(self.times), names, cpus,
+                      np.array([name_ind[k[0]] for k in keys], dtype=int),
+                      np.array([cpu_ind[k[1]] for k in keys], dtype=int),
+                      values)
+
+    def binary_arrays(self, np):
+        c = {name: np.asarray(self.columns[name]) for name in ("ts", "value", "cpu", "node", "flags")}
+        # no summary
+        keep = ~np.isnan(c["ts"])
+        if not self.verbose:
+            keep &= (c["flags"] & tl_output.BIN_BELOW) == 0
+        c = {name: col[keep] for name, col in c.items()}
+        ts = c["ts"]
+        new = np.ones(len(ts), dtype=bool)
+        new[1:] = ts[1:] != ts[:-1]
+        tind = np.cumsum(new) - 1
+        names = sorted(self.headers)
+        name_ind = {n: i for i, n in enumerate(names)}
+        node_name = np.array([name_ind.get(n[1], -1) for n in self.nodes] or [-1], dtype=int)
+        cpus = [x if x else None for x in self.cpunames]
+        key = node_name[c["node"]] * max(len(cpus), 1) + c["cpu"]
+        keys, kind = np.unique(key, return_inverse=True)
+        values = np.full((len(keys), int(new.sum())), np.nan)
+        values[kind, tind] = np.where(c["flags"] & tl_output.BIN_RATIO, c["value"] * 100., c["value"])
+        return Series(ts[new], names, cpus, keys // max(len(cpus), 1),
+                      keys % max(len(cpus), 1), values)
 
 early_plots = ["TopLevel", "CPU utilization", "Power", "Frequency", "CPU-METRIC"]
 
@@ -26,8 +26,11 @@
 # FORCEMETRICS=1    Force fixed metrics and slots
 # TLSEED=n          Set seed for --subset sample: sampling
 # DURATION_TIME=0   Force not using duration_time
+# INTERPRET_METRICS=1 Compute metrics with the interpreted lookup instead of compiled plans
 
 from __future__ import print_function, division
+import time
+startup_begin = time.time() # for --startup-profile
 import sys
 import os
 import re
@@ -36,25 +39,26 @@ import platform
 import pty
 import subprocess
 import argparse
-import time
 import types
+import operator
 import csv
 import bisect
 import random
 import json
 import io
 import glob
+import gc
 from dummyarith import DummyArith
-from copy import copy
 from fnmatch import fnmatch
 from math import isnan
-from collections import defaultdict, Counter, OrderedDict, namedtuple
+from collections import defaultdict, Counter, OrderedDict
 from itertools import compress, groupby, chain
 from listutils import cat_unique, dedup, filternot, not_list, append_dict, \
-        zip_longest, flatten, findprefix, dummy_dict
+        zip_longest, flatten
 from objutils import has, safe_ref, map_fields, ref_or
 
-from tl_stat import ComputeStat, ValStat, combine_valstat
+from tl_stat import ComputeStat, ValStat, ValStats, combine_valstats, float_array, \
+        zero_valstats
 import tl_cpu
 import tl_output
 import ocperf
@@ -68,6 +72,9 @@ if sys.version_info.major == 3:
     import typing # noqa
     from typing import Set, List, Dict, Any, Tuple, DefaultDict # noqa
 
+# py2 compat
+intern_str = getattr(sys, "intern", None) or intern # type: ignore # noqa
+
 known_cpus = (
     ("snb", (42, )),
     ("jkt", (45, )),
@@ -124,6 +131,7 @@ _lookup_validate_cache = set() # type: Set[Tuple[int, str]]
 _re_digits = re.compile(r'\d+$')
 _re_tsv_header = re.compile(r'^(Timestamp|Value|Location)')
 _re_interval_header = re.compile(r"\s*([0-9.]{9,}|SUMMARY);(.*)")
+_re_interval_header_b = re.compile(br"\s*([0-9.]{9,}|SUMMARY);")
 _re_bracket_event = re.compile(r'\s+\[.*\]')
 _re_cpu_event = re.compile(r'(cpu_core|cpu_atom|cpu|tool)/(cycles|duration_time)/')
 _re_numeric_count = re.compile(r"\s*[0-9.]+")
@@ -148,9 +156,6 @@ INAME = False
 FUZZYINPUT = False
 DISABLE_COMPUTE_CACHE = False
 
-ComputeCacheEntry = namedtuple('ComputeCacheEntry',
-    ['val', 'thresh', 'errcount', 'ref', 'bad_ratio', 'not_measured'])
-
 # handle kernels that don't support all events
 unsup_pebs = (
     ("BR_MISP_RETIRED.ALL_BRANCHES:pp", (("hsw",), (3, 18), None)),
@@ -340,9 +345,13 @@ class PerfFeatures(object):
                 not args.no_uncore
                 and not args.force_hypervisor
                 and os.path.exists("/sys/bus/event_source/devices/power/events/energy-cores"))
-        with os.popen(self.perf + " --version") as f:
-            v = f.readline().split()
-            perf_version = tuple(map(safe_int, v[2].split(".")[:2])) if len(v) >= 3 else (0,0)
+        if self.perf == ocperf.version.perf:
+            # already run by ocperf, avoid another fork
+            v = ocperf.version.string.split()
+        else:
+            with os.popen(self.perf + " --version") as f:
+                v = f.readline().split()
+        perf_version = tuple(map(safe_int, v[2].split(".")[:2])) if len(v) >= 3 else (0,0)
 
         self.supports_percore = (perf_version >= (5,7) or
                                  works(self.perf + " stat --percore-show-thread true"))
@@ -383,12 +392,18 @@ def unsup_event(e, table, kernel_version, min_kernel=None):
         return False
     return False
 
+_remove_qual_cache = {} # type: Dict[str, str]
+
 def remove_qual(ev):
     def get_group(prefix, m):
         if m.group(1):
             return prefix + m.group(1)
         return prefix
-    return _re_remove_percore.sub("", _re_remove_qual_colon.sub(lambda m: get_group("", m), _re_remove_qual_slash.sub(lambda m: get_group("/", m), ev)))
+    r = _remove_qual_cache.get(ev)
+    if r is None:
+        r = _re_remove_percore.sub("", _re_remove_qual_colon.sub(lambda m: get_group("", m), _re_remove_qual_slash.sub(lambda m: get_group("/", m), ev)))
+        _remove_qual_cache[ev] = r
+    return r
 
 def limited_overflow(evlist, num):
     class GenericCounters:
@@ -450,6 +465,15 @@ metrics_own_group = True
 def is_slots(x):
     return re.match(r'(cpu/|cpu_core/)?slots[,/]', x) is not None
 
+def popcount(x):
+    return bin(x).count("1")
+
+def constrained_event(x):
+    """Can x make needed_counters differ from the number of generic counters?"""
+    r = remove_qual(x)
+    return (ismetric(x) or is_slots(x) or event_to_resource(x) != "" or
+            r in ectx.limited_counters or r in ectx.limit4_events)
+
 def needed_counters(evlist):
     evset = set(evlist)
     num = num_generic_counters(evset)
@@ -533,20 +557,6 @@ def add_args(rest, *args):
     a = [x for x in args if x not in rest]
     return a + rest
 
-def update_arg(arg, flag, sep, newval):
-    i = findprefix(arg, flag, "--")
-    if i >= 0:
-        if arg[i] == flag:
-            arg[i+1] = newval
-        else:
-            arg[i] = flag + sep + newval
-        return True
-    return False
-
-def del_arg_val(arg, flag):
-    i = findprefix(arg, flag, "--")
-    del arg[i:i+2 if arg[i] == flag else i+1]
-
 def init_args():
     p = argparse.ArgumentParser(usage='toplev [options] perf-arguments',
     description='''
@@ -635,10 +645,14 @@ the kernel. See http://github.com/andikleen/pmu-tools/wiki/toplev-kernel-support
             "sample:n%% Sample each time stamp in input with n%% (0-100%%) probability. "
             "toplev will automatically round to the next time stamp boundary.")
     g.add_argument('--parallel',
-            help="Run toplev --import in parallel in N processes, or the system's number of CPUs if 0 is specified",
+            help="Run toplev --import in parallel in N processes, or the system's number of CPUs if 0 is specified. "
+            "With --binary each chunk of the input is written as a new segment",
             action='store_true')
     g.add_argument('--pjobs', type=int, default=0,
-            help='Number of threads to run with parallel. Default is number of CPUs.')
+            help='Number of processes to run with parallel. Default and maximum is the number of available CPUs. '
+            'With a single CPU the import runs serially.')
+    g.add_argument('--vector-compute', help='Compute the nodes for all CPUs of an interval at once using numpy. '
+                   'Faster on large systems with --per-thread or --per-core.', action='store_true')
     g.add_argument('--gen-script', help='Generate script to collect perfmon information for --import later',
                    action='store_true')
     g.add_argument('--script-record', help='Use perf stat record in script for faster recording or '
@@ -679,6 +693,9 @@ the kernel. See http://github.com/andikleen/pmu-tools/wiki/toplev-kernel-support
     g.add_argument('--host', action='store_true', help="Count host only")
     g.add_argument('--guest', action='store_true', help="Count guest only")
     g.add_argument('--weak', action='store_true', help="Use weak groups to work around scheduling problems")
+    g.add_argument('--pack-groups', action='store_true',
+                   help="Pack events into the best fitting group instead of the first one that fits. "
+                   "Can give fewer groups and less multiplexing.")
     g.add_argument('--thread',
             help="Enable per thread SMT measurements for pre-ICL, at the cost of more multiplexing.",
             action='store_true')
@@ -740,7 +757,13 @@ the kernel. See http://github.com/andikleen/pmu-tools/wiki/toplev-kernel-support
                     action='store_true')
     g.add_argument('--columns', help='Print CPU output in multiple columns for each node', action='store_true')
     g.add_argument('--json', help='Print output in JSON format for Chrome about://tracing', action='store_true')
+    g.add_argument('--json-compact', help='With --json merge the values of each trace name into one '
+                   'counter event per interval and write without white space', action='store_true')
+    g.add_argument('--binary', help='Write output in a columnar binary format to the -o file. '
+                   'Appends to an existing binary file. Can be read with tldata.py', action='store_true')
     g.add_argument('--summary', help='Print summary at the end. Only useful with -I', action='store_true')
+    g.add_argument('--summary-every', help='Print a summary of every N intervals, labeled SUMMARY-<last interval>. Needs -I', type=int,
+                   metavar='N')
     g.add_argument('--no-area', help='Hide area column', action='store_true')
     g.add_argument('--perf-output', help='Save perf stat output in specified file')
     g.add_argument('--perf-summary', help='Save summarized perf stat output in specified file')
@@ -753,6 +776,9 @@ the kernel. See http://github.com/andikleen/pmu-tools/wiki/toplev-kernel-support
     g.add_argument('--no-mux', help="Don't print mux statistics", action="store_true")
     g.add_argument('--abbrev', help="Abbreviate node names in output", action="store_true")
     g.add_argument('--no-sort', help="Don't sort output by Metric group", action="store_true")
+    g.add_argument('--flush-latency', type=float, default=0, metavar='SECONDS',
+                   help="Write the output of each interval at once and flush the output at most "
+                   "every SECONDS (default 0, every interval). Negative writes every line directly.")
 
     g = p.add_argument_group('Environment')
     g.add_argument('--force-cpu', help='Force CPU type', choices=[x[0] for x in known_cpus])
@@ -769,6 +795,8 @@ the kernel. See http://github.com/andikleen/pmu-tools/wiki/toplev-kernel-support
     g.add_argument('--raw', help="Print raw values", action='store_true')
     g.add_argument('--valcsv', '-V', help='Write raw counter values into CSV file')
     g.add_argument('--stats', help='Show statistics on what events counted', action='store_true')
+    g.add_argument('--startup-profile', help='Report where toplev spends its startup time before perf is launched',
+                   action='store_true')
 
     g = p.add_argument_group('xlsx output')
     g.add_argument('--xlsx', help='Generate xlsx spreadsheet output with data for '
@@ -777,6 +805,11 @@ the kernel. See http://github.com/andikleen/pmu-tools/wiki/toplev-kernel-support
     g.add_argument('--set-xlsx', help=argparse.SUPPRESS, action='store_true') # set arguments for xlsx only
     g.add_argument('--xnormalize', help='Add extra sheets with normalized data in xlsx files', action='store_true')
     g.add_argument('--xchart', help='Chart data in xlsx files', action='store_true')
+    g.add_argument('--xsummary', help='Only put the summaries and charts into the xlsx file. '
+                   'The charted data is still included, use --xevery to downsample it.', action='store_true')
+    g.add_argument('--xevery', type=int, default=1, help='Only put every Nth interval into the xlsx interval sheets')
+    g.add_argument('--xjobs', type=int, default=1,
+                   help='Convert the xlsx sheets in N parallel processes. 0 for the number of CPUs')
     g.add_argument('--keep', help='Keep temporary files', action='store_true')
     g.add_argument('--xkeep', dest='keep', action='store_true', help=argparse.SUPPRESS)
 
@@ -919,6 +952,12 @@ def do_xlsx(env, args):
     cmd += " ".join(["--%s '%s'" % (n, f) for n, f in zip(names, files)])
     cmd += " " + " ".join(["--add '%s' '%s'" % (f, n) for n, f in zip(extranames, extrafiles)])
     cmd += " " + " ".join(["--chart '%s'" % f for f in charts])
+    if args.xsummary:
+        cmd += " --summary-only"
+    if args.xevery > 1:
+        cmd += " --every %d" % args.xevery
+    if args.xjobs != 1:
+        cmd += " --jobs %d" % args.xjobs
     cmd += " '%s'" % args.xlsx
     if not args.quiet:
         print(cmd)
@@ -928,132 +967,10 @@ def do_xlsx(env, args):
             os.remove(fn)
     return ret
 
-def gentmp(o, cpu):
-    o = re.sub(r'\.(xz|gz)', '', o)
-    if o.endswith(".csv"):
-        return o.replace(".csv", "-cpu%d.csv" % cpu)
-    return o + "-cpu%d" % cpu
-
-def output_to_tmp(arg, outfn, args):
-    if not args.output or args.xlsx:
-        arg.insert(1, "-o" + outfn)
-    elif update_arg(arg, "--output", "=", outfn):
-        pass
-    elif update_arg(arg, "-o", "", outfn):
-        pass
-    else:
-        # does not handle -o combined with other one letter options
-        sys.exit("Use plain -o / --output argument with --parallel")
-
-def merge_files(files, outf, args):
-    for j in files:
-        tl_output.catrmfile(j, outf, args.keep)
-
-# run multiple subset toplevs in parallel and merge the results
-def run_parallel(args, env):
-    procs = []
-    pofns = []
-    valfns = []
-    sums = []
-    targ = copy(sys.argv)
-    del targ[targ.index("--parallel")]
-    ichunk = os.path.getsize(args.import_) / args.pjobs
-    fileoff = 0
-    for cpu in range(args.pjobs):
-        arg = copy(targ)
-        if args.xlsx:
-            del_arg_val(arg, "--xlsx")
-            arg = [arg[0], "--set-xlsx", "--perf-output=X", "--valcsv=X"] + arg[1:]
-        outfn = gentmp(args.output if args.output else "toplevo%d" % os.getpid(), cpu)
-        output_to_tmp(arg, outfn, args)
-        if args.perf_output or args.xlsx:
-            pofn = gentmp(args.perf_output if args.perf_output else "toplevp", cpu)
-            update_arg(arg, "--perf-output", "=", pofn)
-            pofns.append(pofn)
-        if args.valcsv or args.xlsx:
-            valfn = gentmp(args.valcsv if args.valcsv else "toplevv", cpu)
-            update_arg(arg, "--valcsv", "=", valfn)
-            valfns.append(valfn)
-        end = ""
-        if cpu < args.pjobs-1:
-            end = "%d" % (fileoff + ichunk)
-        arg.insert(1, ("--subset=%d-" % fileoff) + end)
-        fileoff += ichunk
-        if args.json and args.pjobs > 1:
-            if cpu > 0:
-                arg.insert(1, "--no-json-header")
-            if cpu < args.pjobs - 1 or args.summary:
-                arg.insert(1, "--no-json-footer")
-        sumfn = None
-        if args.summary:
-            del arg[arg.index("--summary")]
-            sumfn = gentmp("toplevs%d" % os.getpid(), cpu)
-            arg.insert(1, "--perf-summary=" + sumfn)
-            sums.append(sumfn)
-        if args.pjobs > 1:
-            if cpu > 0:
-                arg.insert(1, "--no-csv-header")
-            if cpu < args.pjobs - 1 or args.summary:
-                arg.insert(1, "--no-csv-footer")
-        if not args.quiet:
-            print(" ".join(arg))
-        pp = subprocess.Popen(arg, stdout=subprocess.PIPE, **popentext) # type: ignore
-        procs.append((pp, outfn))
-    if args.xlsx:
-        init_xlsx(args)
-        set_xlsx(args)
-    logfiles, logf = tl_output.open_all_logfiles(args, args.output)
-    for p in procs:
-        ret = p[0].wait()
-        if ret:
-            sys.exit("Subprocess toplev failed %d" % ret)
-        tl_output.catrmoutput(p[1], logf, logfiles, args.keep)
-    ret = 0
-    if sums:
-        cmd = [sys.executable, exe_dir() + "/interval-merge.py"] + sums
-        if not args.quiet:
-            print(" ".join(cmd))
-        inp = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-        outfn = "toplevm%d" % os.getpid()
-        output_to_tmp(targ, outfn, args)
-        if args.xlsx:
-            del_arg_val(targ, "--xlsx")
-            targ.insert(1, "--set-xlsx")
-        if args.perf_output:
-            del_arg_val(targ, "--perf-output")
-        if args.valcsv:
-            del_arg_val(targ, "--valcsv")
-        update_arg(targ, "--import", "=", "/dev/stdin")
-        targ.insert(1, "--no-output")
-        if args.json:
-            targ.insert(1, "--no-json-header")
-        else:
-            targ.insert(1, "--no-csv-header")
-        if not args.quiet:
-            print(" ".join(targ))
-        outp = subprocess.Popen(targ, stdin=inp.stdout)
-        ret = inp.wait()
-        if ret:
-            sys.exit("interval-merge failed")
-        ret = outp.wait()
-        if ret:
-            sys.exit("summary toplev failed")
-        tl_output.catrmoutput(outfn, logf, logfiles, args.keep)
-        if not args.keep:
-            for j in sums:
-                os.remove(j)
-    open_output_files(args)
-    merge_files(valfns, args.valcsv, args)
-    merge_files(pofns, args.perf_output, args)
-    if args.xlsx:
-        ret = do_xlsx(env, args)
-    # XXX graph
-    return ret
-
 def init_idle_threshold(args):
     if args.idle_threshold:
         idle_threshold = args.idle_threshold / 100.
-    elif args.csv or args.xlsx or args.set_xlsx: # not for args.graph
+    elif args.csv or args.xlsx or args.set_xlsx or args.binary: # not for args.graph
         idle_threshold = 0  # avoid breaking programs that rely on the CSV output
     else:
         idle_threshold = 0.05
@@ -1146,7 +1063,7 @@ def update_args(args, env):
     if args.exclusive and args.pinned:
         sys.exit("--exclusive and --pinned cannot be combined")
 
-def handle_parallel(args, env):
+def handle_parallel(args):
     if args.parallel:
         if not args.import_:
             sys.exit("--parallel requires --import")
@@ -1161,10 +1078,16 @@ def handle_parallel(args, env):
             sys.exit("--parallel does not support multi-output --json without --split-output")
         if args.graph:
             sys.exit("--parallel does not support --graph") # XXX
-        if args.pjobs == 0:
+        if args.script_record:
+            sys.exit("--parallel does not support --script-record")
+        # more workers than CPUs only time slice and evict each other's caches
+        if hasattr(os, "sched_getaffinity"):
+            ncpus = len(os.sched_getaffinity(0))
+        else:
             import multiprocessing
-            args.pjobs = multiprocessing.cpu_count()
-        sys.exit(run_parallel(args, env))
+            ncpus = multiprocessing.cpu_count()
+        if args.pjobs == 0 or args.pjobs > ncpus:
+            args.pjobs = ncpus
 
 def handle_rest(args, rest):
     if rest[:1] == ["--"]:
@@ -1394,7 +1317,12 @@ class PerfRun(object):
             self.sampling = r < self.sample_prob
         return False
 
-    def execute(self, r):
+    def execute(self, r, inputf=None):
+        if inputf:
+            # chunk of the import handed out by parallel_execute
+            self.perf = None
+            self.inputf = inputf
+            return inputf
         if args.import_:
             print_perf(r)
             if args.script_record:
@@ -1413,6 +1341,8 @@ class PerfRun(object):
                 except io.UnsupportedOperation:
                     sys.exit("--subset not supported on compressed or unseekable files.")
             self.inputf = f
+            if not args.subset:
+                return BlockReader(f)
             return f
 
         if args.gen_script:
@@ -1442,6 +1372,23 @@ class PerfRun(object):
         if self.perf:
             self.perf.kill()
 
+class BlockReader(object):
+    """Read lines of an import file in large blocks."""
+    def __init__(self, f, size=1 << 20):
+        self.f = f
+        self.size = size
+        self.lines = iter([]) # type: Any
+
+    def readline(self):
+        l = next(self.lines, None)
+        if l is None:
+            self.lines = iter(self.f.readlines(self.size))
+            l = next(self.lines, "")
+        return l
+
+    def close(self):
+        self.f.close()
+
 def separator(x):
     if ":" in x:
         return ""
@@ -1575,9 +1522,9 @@ def perf_args(evstr, rest):
         add += ['-I', str(args.interval)]
     return [feat.perf, "stat", "-x;", "--log-fd", "X"] + add + ["-e", evstr] + rest
 
-def setup_perf(evstr, rest):
+def setup_perf(evstr, rest, inputf=None):
     prun = PerfRun()
-    inf = prun.execute(perf_args(evstr, rest))
+    inf = prun.execute(perf_args(evstr, rest), inputf)
     return inf, prun
 
 class Stat(object):
@@ -1710,6 +1657,8 @@ def display_keys(runner, keys, mode, post=""):
 
 def verify_rev(rev, cpus):
     for k in cpus:
+        if rev[k] is rev[cpus[0]]:
+            continue
         for ind, o in enumerate(rev[k]):
             assert o == rev[cpus[0]][ind]
         assert len(rev[k]) == len(rev[cpus[0]])
@@ -1731,7 +1680,7 @@ def find_idle_keys(res, rev, idle_thresh):
         return set()
     idle_ev = find_cycles(rev)
     if idle_ev == "":
-        if not not all((x == ["dummy"] for x in rev.values())):
+        if not not all((list(x) == ["dummy"] for x in rev.values())):
             warn_once("no idle detection because no cycle event found")
         return set()
     cycles = { k: max([0] + [val for val, ev in zip(res[k], rev[k]) if ev == idle_ev])
@@ -1774,6 +1723,155 @@ default_compute_iter = 3
 # override how often to recompute to converge all the thresholds
 COMPUTE_ITER = None
 
+class VectorStat(object):
+    """Collect the ComputeStat updates of a --vector-compute pass. They are
+       only applied for lanes that don't need the scalar path."""
+    def __init__(self, lanes):
+        import tl_vec
+        self.active = tl_vec.mask(lanes, True)
+        self.statlanes = self.active
+        self.referenced = set() # type: Set[int]
+        self.bad = {} # type: Dict[str, Any]
+        self.errors = [] # type: List[Tuple[str, int, Set[int]]]
+
+    def num_active(self):
+        return int(self.active.sum())
+
+    def mismeasured(self, name, bad):
+        import tl_vec
+        bad = tl_vec.vand(tl_vec.vand(bad, lambda: self.active), lambda: self.statlanes)
+        if name in self.bad:
+            bad = tl_vec.vor(self.bad[name], lambda: bad)
+        self.bad[name] = bad
+
+    def apply(self, stat, fallback):
+        import tl_vec
+        ok = tl_vec.vnot(fallback)
+        if not ok.any():
+            return
+        stat.referenced |= self.referenced
+        for name, bad in self.bad.items():
+            if tl_vec.vand(bad, lambda: ok).any():
+                stat.mismeasured.add(name)
+        for name, errcount, ref in self.errors:
+            if name not in stat.errors:
+                stat.errcount += errcount
+            stat.errors.add(name)
+            stat.referenced |= ref
+
+class VectorResult(object):
+    """Node state per key computed by --vector-compute."""
+    def __init__(self):
+        self.keys = {} # type: Dict[str, Tuple[Any, int]]
+        self.lists = {} # type: Dict[int, Any]
+
+    def add(self, keys, states, last, fallback):
+        for i, j in enumerate(keys):
+            if not fallback[i]:
+                self.keys[j] = (states[last[i]], i)
+
+    def value(self, x, i):
+        import tl_vec
+        if not tl_vec.isvec(x):
+            return x
+        l = self.lists.get(id(x))
+        if l is None:
+            l = self.lists[id(x)] = tl_vec.tolist(x)
+        return l[i]
+
+    def restore(self, j):
+        """Set the node state for key j. Returns False if j needs the scalar path."""
+        if j not in self.keys:
+            return False
+        state, i = self.keys[j]
+        for obj, val, thresh, errcount in state:
+            obj.val = self.value(val, i)
+            obj.thresh = self.value(thresh, i)
+            obj.errcount = errcount
+        return True
+
+def vector_group(runner, vr, lanes, passes, rev, env, stat, runner_list, iterations):
+    import tl_vec
+    st = tl_vec.state = tl_vec.VecState(len(lanes))
+    for _, src, _ in passes:
+        st.fallback |= src.nanlanes
+    saved = [(obj, obj.val, obj.thresh, getattr(obj, "errcount", 0)) for obj in runner.olist]
+    vev = VectorEval(rev[lanes[0]], env, runner_list)
+    vstat = VectorStat(len(lanes))
+    states = []
+    last = tl_vec.zeros(len(lanes))
+    onemore = tl_vec.mask(len(lanes))
+    runner.reset_thresh()
+    try:
+        # same as the loop in print_keys, but tracking each lane
+        for it in range(iterations):
+            changed = tl_vec.zeros(len(lanes))
+            for num, src, match in passes:
+                env['num_merged'] = num
+                with tl_vec.quiet():
+                    changed = changed + runner.vector_compute(vev, src, env, match, vstat)
+            states.append([(obj, obj.val, obj.thresh, obj.errcount) for obj in runner.olist])
+            last[vstat.active] = it
+            if COMPUTE_ITER is None:
+                zero = changed == 0
+                vstat.active = vstat.active & ~(zero & onemore)
+                onemore = onemore | zero
+                vstat.statlanes = vstat.statlanes & zero
+            else:
+                vstat.statlanes = tl_vec.mask(len(lanes))
+            if not vstat.active.any():
+                break
+    except tl_vec.VecFallback:
+        return
+    finally:
+        for obj, val, thresh, errcount in saved:
+            obj.val, obj.thresh, obj.errcount = val, thresh, errcount
+    vr.add(lanes, states, last, st.fallback)
+    vstat.apply(stat, st.fallback)
+
+def vector_keys(runner, res, rev, valstats, env, mode, keys, lanes, filtered, thread_node, core_node,
+                runner_list):
+    """Compute the nodes for all lanes (keys) at once for --vector-compute.
+       Returns a VectorResult. Keys missing in it need the scalar path."""
+    import tl_vec
+    vr = VectorResult()
+    if not lanes:
+        return vr
+    width = len(res[lanes[0]])
+    rowkeys = [k for k in keys if len(res[k]) == width and len(valstats[k]) == width]
+    if width == 0 or len(rowkeys) < 2:
+        return vr
+    row = { k: i for i, k in enumerate(rowkeys) }
+    rows = tl_vec.matrix([res[k] for k in rowkeys])
+    strows = tl_vec.valstat_matrix([valstats[k] for k in rowkeys])
+    def source(sel, merged):
+        return tl_vec.Source(rows, strows,
+                             [tl_vec.index_array([row[x] for x in s]) for s in sel], merged)
+
+    if smt_mode:
+        corecpus = defaultdict(list) # type: DefaultDict[int, List[str]]
+        for x in keys:
+            if not filtered(x):
+                corecpus[key_to_coreid(x)].append(x)
+        groups = defaultdict(list) # type: DefaultDict[int, List[str]]
+        for j in lanes:
+            cpus = corecpus[key_to_coreid(j)]
+            if all([x in row for x in cpus]):
+                groups[len(cpus)].append(j)
+        iterations = COMPUTE_ITER if COMPUTE_ITER else default_compute_iter
+        for n, gl in groups.items():
+            own = source([gl], False)
+            comb = source([[corecpus[key_to_coreid(j)][k] for j in gl] for k in range(n)], True)
+            passes = [(1, comb if mode == OUTPUT_CORE else own, thread_node),
+                      (n, comb, core_node)]
+            vector_group(runner, vr, gl, passes, rev, env, runner.stat, runner_list, iterations)
+    else:
+        gl = [j for j in lanes if j in row]
+        if gl:
+            vector_group(runner, vr, gl, [(1, source([gl], False), not_package_node)],
+                         rev, env, runner.stat, runner_list, 1)
+    return vr
+
 def print_keys(runner, res, rev, valstats, out, interval, env, mode, runner_list):
     nothing = set() # type: Set[str]
     allowed_threads = runner.cpu_list
@@ -1803,6 +1901,11 @@ def print_keys(runner, res, rev, valstats, out, interval, env, mode, runner_list
                 warn_once("Warning: input cpu %s not in cpuinfo." % j)
                 del res[j]
         keys = sorted(res.keys(), key=num_key)
+        vr = None
+        if args.vector_compute and mode in (OUTPUT_THREAD, OUTPUT_CORE, OUTPUT_CORE_THREAD):
+            vr = vector_keys(runner, res, rev, valstats, env, mode, keys,
+                             [j for j in keys if not filtered(j) and j not in idle_keys],
+                             filtered, thread_node, core_node, runner_list)
         for j in keys:
             if filtered(j):
                 continue
@@ -1824,40 +1927,46 @@ def print_keys(runner, res, rev, valstats, out, interval, env, mode, runner_list
                 cpus = [x for x in keys if key_to_socketid(x) == sid and not filtered(x)]
             else:
                 cpus = [x for x in keys if key_to_coreid(x) == core and not filtered(x)]
-            combined_res = list(zip(*[res[x] for x in cpus]))
-            combined_st = [combine_valstat(z)
-                  for z in zip(*[valstats[x] for x in cpus])]
-            env['num_merged'] = len(cpus)
-
-            if mode in (OUTPUT_CORE,OUTPUT_SOCKET,OUTPUT_GLOBAL):
-                merged_res = combined_res
-                merged_st = combined_st
-            else:
-                merged_res = res[j]
-                merged_st = valstats[j]
-
-            if invalid_res(merged_res, cpus, nothing):
-                continue
 
-            # may need to repeat to get stable threshold values
-            # in case of mutual dependencies between SMT and non SMT
-            # but don't loop forever (?)
-            used_stat = stat
-            onemore = False
-            iterations = COMPUTE_ITER if COMPUTE_ITER else default_compute_iter
-            for _ in range(iterations):
-                env['num_merged'] = 1
-                changed = runner.compute(merged_res, rev[j], merged_st, env, thread_node, used_stat, runner_list)
+            if vr is not None and vr.restore(j):
                 verify_rev(rev, cpus)
                 env['num_merged'] = len(cpus)
-                changed += runner.compute(combined_res, rev[cpus[0]], combined_st, env, core_node, used_stat, runner_list)
-                if changed == 0 and COMPUTE_ITER is None:
-                    # do always one more so that any thresholds depending on a later node are caught
-                    if not onemore:
-                        onemore = True
-                        continue
-                    break
-                used_stat = None
+            else:
+                combined_res = list(zip(*[res[x] for x in cpus]))
+                combined_st = combine_valstats([valstats[x] for x in cpus])
+                env['num_merged'] = len(cpus)
+
+                if mode in (OUTPUT_CORE,OUTPUT_SOCKET,OUTPUT_GLOBAL):
+                    merged_res = combined_res
+                    merged_st = combined_st
+                else:
+                    merged_res = res[j]
+                    merged_st = valstats[j]
+
+                if invalid_res(merged_res, cpus, nothing):
+                    continue
+
+                # may need to repeat to get stable threshold values
+                # in case of mutual dependencies between SMT and non SMT
+                # but don't loop forever (?)
+                used_stat = stat
+                onemore = False
+                iterations = COMPUTE_ITER if COMPUTE_ITER else default_compute_iter
+                for _ in range(iterations):
+                    env['num_merged'] = 1
+                    changed = runner.compute(merged_res, rev[j], merged_st, env, thread_node, used_stat,
+                                             runner_list, (mode, j, "thread"))
+                    verify_rev(rev, cpus)
+                    env['num_merged'] = len(cpus)
+                    changed += runner.compute(combined_res, rev[cpus[0]], combined_st, env, core_node, used_stat,
+                                              runner_list, (mode, j, "core"))
+                    if changed == 0 and COMPUTE_ITER is None:
+                        # do always one more so that any thresholds depending on a later node are caught
+                        if not onemore:
+                            onemore = True
+                            continue
+                        break
+                    used_stat = None
 
             # find bottleneck
             bn = find_bn(runner.olist, not_package_node)
@@ -1871,7 +1980,8 @@ def print_keys(runner, res, rev, valstats, out, interval, env, mode, runner_list
                 printed_sockets.add(sid)
                 continue
             if mode == OUTPUT_THREAD:
-                runner.compute(res[j], rev[j], valstats[j], env, package_node, stat, runner_list)
+                runner.compute(res[j], rev[j], valstats[j], env, package_node, stat, runner_list,
+                               (mode, j, "package"))
                 printer.print_res(runner.olist, out, interval, thread_fmt(int(j))+post, any_node,
                                   bn, j in idle_mark_keys)
                 continue
@@ -1893,6 +2003,11 @@ def print_keys(runner, res, rev, valstats, out, interval, env, mode, runner_list
                 idle = j in idle_mark_keys
             printer.print_res(runner.olist, out, interval, fmt+post, thread_node, bn, idle)
     elif mode != OUTPUT_GLOBAL:
+        vr = None
+        if args.vector_compute:
+            vr = vector_keys(runner, res, rev, valstats, env, mode, keys,
+                             [j for j in keys if j != "" and not filtered(j) and j not in idle_keys],
+                             filtered, thread_node, core_node, runner_list)
         env['num_merged'] = 1
         for j in keys:
             if filtered(j):
@@ -1903,17 +2018,20 @@ def print_keys(runner, res, rev, valstats, out, interval, env, mode, runner_list
             if invalid_res(res[j], j, nothing):
                 continue
             runner.reset_thresh()
-            runner.compute(res[j], rev[j], valstats[j], env, not_package_node, stat, runner_list)
+            if vr is None or not vr.restore(j):
+                runner.compute(res[j], rev[j], valstats[j], env, not_package_node, stat, runner_list,
+                               (mode, j, "thread"))
             bn = find_bn(runner.olist, not_package_node)
             printer.print_res(runner.olist, out, interval, j+post, not_package_node, bn, j in idle_mark_keys)
     if mode == OUTPUT_GLOBAL:
         env['num_merged'] = 1
         cpus = [x for x in keys if not filtered(x)]
         if cpus:
-            combined_res = [sum([res[j][i] for j in cpus])
-                            for i in range(len(res[cpus[0]]))]
-            combined_st = [combine_valstat([valstats[j][i] for j in cpus])
-                           for i in range(len(valstats[cpus[0]]))]
+            # sum the columns in the same order as sum() over each row
+            combined_res = float_array([0.0]) * len(res[cpus[0]])
+            for j in cpus:
+                combined_res = float_array(map(operator.add, combined_res, res[j]))
+            combined_st = combine_valstats([valstats[j] for j in cpus])
             if smt_mode:
                 nodeselect = package_node
             else:
@@ -1921,7 +2039,7 @@ def print_keys(runner, res, rev, valstats, out, interval, env, mode, runner_list
             if not invalid_res(combined_res, cpus, nothing):
                 runner.reset_thresh()
                 runner.compute(combined_res, rev[cpus[0]] if len(cpus) > 0 else [],
-                               combined_st, env, nodeselect, stat, runner_list)
+                               combined_st, env, nodeselect, stat, runner_list, (mode, "", "global"))
                 bn = find_bn(runner.olist, lambda x: True)
                 printer.print_res(runner.olist, out, interval, "", nodeselect, bn, False)
     elif mode != OUTPUT_THREAD:
@@ -1945,7 +2063,8 @@ def print_keys(runner, res, rev, valstats, out, interval, env, mode, runner_list
             runner.reset_thresh()
             if invalid_res(res[j], j, nothing):
                 continue
-            runner.compute(res[j], rev[j], valstats[j], env, package_node, stat, runner_list)
+            runner.compute(res[j], rev[j], valstats[j], env, package_node, stat, runner_list,
+                           (mode, j, "package"))
             printer.print_res(runner.olist, out, interval, jname, package_node, None, j in idle_mark_keys)
     # no bottlenecks from package nodes for now
     out.flush()
@@ -2032,12 +2151,40 @@ def print_summary(summary, out, runner_list, full_system):
                                                       r[2], "%f" % r[3],
                                                       "%.2f" % r[4], "", ""]) + "\n")
 
+    if summary.rolling and summary.rolling.count > 0:
+        print_window_summary(summary.rolling, out, runner_list)
     if not args.summary:
         return
+    print_summary_keys(summary, out, runner_list, float('nan'))
+
+def print_summary_keys(summary, out, runner_list, interval):
     for runner, res, rev in runner_split(runner_list, summary.res, summary.rev):
         print_and_split_keys(runner, res, rev,
                          summary.valstats, out,
-                             float('nan'), summary.env, runner_list)
+                             interval, summary.env, runner_list)
+
+def print_window_summary(rolling, out, runner_list):
+    # printed as SUMMARY-<last interval> to tell the windows apart
+    print_summary_keys(rolling, out, runner_list, tl_output.WindowTimestamp(rolling.end))
+
+def summary_add(summary, res, rev, valstats, env, interval):
+    if args.summary:
+        summary.add(res, rev, valstats, env)
+    if args.summary_every:
+        rolling_add(summary, res, rev, valstats, env, interval)
+
+def rolling_add(summary, res, rev, valstats, env, interval):
+    if summary.rolling is None:
+        summary.rolling = Summary()
+    summary.rolling.add(res, rev, valstats, env)
+    summary.rolling.end = interval
+
+def print_rolling_summary(summary, out, runner_list):
+    """Print the --summary-every summary once it has enough intervals
+       and start a new one."""
+    if summary.rolling and summary.rolling.count >= args.summary_every:
+        print_window_summary(summary.rolling, out, runner_list)
+        summary.rolling = None
 
 class SaveContext(object):
     """Save (some) environment context, in this case stdin seek offset to make < file work
@@ -2111,10 +2258,11 @@ def execute_no_multiplex(runner_list, out, rest, summary):
                         v = lresults[0]
                         for ind, _ in enumerate(results):
                             if ind >= len(lresults):
-                                lresults.append([dummy_dict(v[RES]),
+                                lresults.append([{k: float_array([0.0]) * len(x)
+                                                  for k, x in v[RES].items()},
                                                  v[REV],
                                                  v[INTERVAL],
-                                                 dummy_dict(v[RES], ValStat(0,0)),
+                                                 {k: zero_valstats(len(x)) for k, x in v[RES].items()},
                                                  v[ENV]])
                     assert len(lresults) == len(results)
                 i = 0
@@ -2128,9 +2276,12 @@ def execute_no_multiplex(runner_list, out, rest, summary):
     assert num_runs == n
     for res, rev, interval, valstats, env in results:
         if summary:
-            summary.add(res, rev, valstats, env)
+            summary_add(summary, res, rev, valstats, env, interval)
         for runner, res, rev in runner_split(runner_list, res, rev):
             print_check_keys(runner, res, rev, valstats, out, interval, env, runner_list)
+        if summary:
+            print_rolling_summary(summary, out, runner_list)
+        out.end_interval()
     return ret
 
 def runner_split(runner_list, res, rev):
@@ -2140,7 +2291,7 @@ def runner_split(runner_list, res, rev):
             end = off + len(r.sched.evnum)
             yield r, { "": res[""][off:end]}, { "": rev[""][off:end] }
         elif r.cpu_list:
-            d = defaultdict(list) # type: DefaultDict[str,list]
+            d = defaultdict(float_array) # type: DefaultDict[str,Any]
             d.update({ "%d" % k: res["%d" % k] for k in r.cpu_list })
             yield r, d, rev
         else:
@@ -2160,17 +2311,248 @@ def execute(runner_list, out, rest, summary):
         flat_events += new_flat_events
         flat_rmap += [event_rmap(e, runner_list) for e in new_flat_events]
         runner.clear_ectx()
+    if args.parallel and args.interval and args.pjobs > 1:
+        return parallel_execute(runner_list, out, rest, summary, evstr, flat_rmap)
     ctx = SaveContext()
     for ret, res, rev, interval, valstats, env in do_execute(
             runner_list, summary,
             evstr, flat_rmap, out, rest, Counter(), None):
         if summary:
-            summary.add(res, rev, valstats, env)
+            summary_add(summary, res, rev, valstats, env, interval)
         for runner, res, rev in runner_split(runner_list, res, rev):
             print_check_keys(runner, res, rev, valstats, out, interval, env, runner_list)
+        if summary:
+            print_rolling_summary(summary, out, runner_list)
+        out.end_interval()
     ctx.restore()
     return ret
 
+# chunks per parallel job, to balance uneven intervals
+PARALLEL_CHUNKS = 4
+
+def interval_ts(mm, off):
+    """Return time stamp of the line at off in a mmap'ed perf stat -I log and offset of the next line."""
+    end = mm.find(b"\n", off)
+    if end < 0:
+        end = len(mm)
+    m = _re_interval_header_b.match(mm, off, end)
+    if m is None:
+        return None, end + 1
+    return (float(m.group(1)) if m.group(1) != b"SUMMARY" else 0.0), end + 1
+
+def next_interval_start(mm, off):
+    """Find the first line after off that starts a new interval. Returns offset and time stamp."""
+    if off > 0:
+        off = mm.find(b"\n", off - 1) + 1
+        if off == 0:
+            return None, None
+    first = None
+    while off < len(mm):
+        ts, nextoff = interval_ts(mm, off)
+        if ts is not None:
+            if first is None:
+                first = ts
+            elif ts != first:
+                return off, ts
+        off = nextoff
+    return None, None
+
+def import_chunks(mm, num):
+    """Split mmap'ed perf stat -I log into up to num chunks at interval boundaries.
+       Returns list of (start, end, time stamp of the interval following the chunk)."""
+    bounds = [(0, None)]
+    for i in range(1, num):
+        pos = len(mm) * i // num
+        # still in the interval before the last boundary, would find it again
+        if pos < bounds[-1][0]:
+            continue
+        off, ts = next_interval_start(mm, pos)
+        if off is None:
+            break
+        if off > bounds[-1][0]:
+            bounds.append((off, ts))
+    # the last chunk needs two intervals to get the duration of its last interval
+    while len(bounds) > 1 and next_interval_start(mm, bounds[-1][0])[0] is None:
+        bounds.pop()
+    bounds.append((len(mm), None))
+    return [(bounds[i][0], bounds[i + 1][0], bounds[i + 1][1]) for i in range(len(bounds) - 1)]
+
+# buffers for the text output of the workers
+if sys.version_info.major == 3:
+    text_buffer = io.StringIO
+else:
+    # accepts both str and unicode
+    from StringIO import StringIO as text_buffer # type: ignore
+
+class ParallelImport(object):
+    """State of a parallel import, inherited by the forked workers."""
+    def __init__(self, runner_list, out, rest, evstr, flat_rmap, mm, chunks):
+        self.runner_list = runner_list
+        self.out = out
+        self.rest = rest
+        self.evstr = evstr
+        self.flat_rmap = flat_rmap
+        self.mm = mm
+        self.chunks = chunks
+
+def parallel_chunk(pi, i, q):
+    """Process chunk i of a parallel import in a forked worker.
+       Send the output of each interval to q, followed by the final runner state."""
+    out = pi.out
+    start, end, next_ts = pi.chunks[i]
+    # each chunk of --binary output is a new segment with its own node and cpu ids
+    newbuf = io.BytesIO if args.binary else text_buffer
+    if out.logfiles:
+        logfiles, logf = OrderedDict([(n, newbuf()) for n in out.logfiles]), None
+        bufs = list(logfiles.values())
+    else:
+        logfiles, logf = None, newbuf()
+        bufs = [logf]
+    out.set_files(logfiles, logf)
+    if i > 0:
+        out.no_header = True
+        out.mark_written()
+    bufs += [text_buffer() if args.perf_output else None,
+             text_buffer() if args.valcsv else None]
+    args.perf_output = bufs[-2]
+    if args.valcsv:
+        out.valcsv = csv.writer(bufs[-1], lineterminator='\n', delimiter=';')
+
+    def texts():
+        t = []
+        for b in bufs:
+            t.append(b.getvalue() if b else None)
+            if b:
+                b.seek(0)
+                b.truncate()
+        return t
+
+    data = pi.mm[start:end]
+    if sys.version_info.major == 3:
+        data = data.decode()
+    inf = text_buffer(data)
+    # sum up the summary here and only send the sums at the end
+    summary = Summary() if args.summary else None
+    for ret, res, rev, interval, valstats, env in do_execute(
+            pi.runner_list, None,
+            pi.evstr, pi.flat_rmap, out, pi.rest, Counter(), None, inf, next_ts):
+        if summary:
+            summary.add(res, rev, valstats, env)
+        # only the parent knows where the --summary-every windows start
+        rolling = (res, rev, valstats, dict(env), interval) if args.summary_every else None
+        for runner, res, rev in runner_split(pi.runner_list, res, rev):
+            print_check_keys(runner, res, rev, valstats, out, interval, env, pi.runner_list)
+        q.put(("interval", texts(), rolling))
+    state = [(r.stat, r.idle_keys,
+              [id(o) for o in r.printer.sample_obj],
+              [id(o) for o in r.printer.bottlenecks]) for r in pi.runner_list]
+    q.put(("done", texts(), state, summary, ret))
+
+def parallel_worker(pi, i, q):
+    try:
+        parallel_chunk(pi, i, q)
+    except SystemExit as e:
+        q.put(("exit", e.code))
+    except BaseException:
+        q.put(("exit", 1))
+        raise
+
+def parallel_get(p, q):
+    try:
+        import queue
+    except ImportError:
+        import Queue as queue # type: ignore
+    while True:
+        try:
+            return q.get(timeout=1)
+        except queue.Empty:
+            if p.exitcode is not None:
+                break
+    try:
+        return q.get(timeout=1)
+    except queue.Empty:
+        return ("exit", "parallel import worker failed with %d" % p.exitcode)
+
+def merge_runner_state(runner_list, state):
+    for r, (stat, idle_keys, sample_ids, bn_ids) in zip(runner_list, state):
+        objs = {id(o): o for o in chain(r.full_olist, r.olist)}
+        r.stat.merge(stat)
+        r.idle_keys |= idle_keys
+        r.printer.sample_obj |= {objs[x] for x in sample_ids if x in objs}
+        r.printer.bottlenecks |= {objs[x] for x in bn_ids if x in objs}
+
+# process an interval import in parallel chunks in forked workers, which
+# inherit the initialized runners. The output is streamed back in order.
+def parallel_execute(runner_list, out, rest, summary, evstr, flat_rmap):
+    # only needed for --parallel, keep them out of the startup path
+    import mmap
+    import multiprocessing
+    print_perf(perf_args(evstr, rest))
+    try:
+        f = open(args.import_, "rb")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (IOError, ValueError) as e:
+        sys.exit("Cannot open file %s: %s" % (args.import_, e))
+    chunks = import_chunks(mm, args.pjobs * PARALLEL_CHUNKS)
+    pi = ParallelImport(runner_list, out, rest, evstr, flat_rmap, mm, chunks)
+    files = ((list(out.logfiles.values()) if out.logfiles else [out.logf]) +
+             [args.perf_output, args.valcsv])
+    if hasattr(multiprocessing, "get_context"):
+        mp = multiprocessing.get_context("fork")
+    else:
+        # python 2 always forks
+        mp = multiprocessing # type: ignore
+    workers = [] # type: List[Any]
+    # keep the garbage collector from touching (and copying) the inherited heap
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+    def start_worker():
+        # avoid the workers inheriting buffered output
+        for fl in files + [sys.stdout, sys.stderr]:
+            if fl:
+                fl.flush()
+        q = mp.Queue()
+        p = mp.Process(target=parallel_worker, args=(pi, len(workers), q))
+        p.start()
+        workers.append((p, q))
+
+    while len(workers) < min(args.pjobs, len(chunks)):
+        start_worker()
+    # the first worker prints the header, the footer is printed here
+    out.no_header = True
+    out.mark_written()
+    ret = 0
+    for i in range(len(chunks)):
+        p, q = workers[i]
+        while True:
+            msg = parallel_get(p, q)
+            if msg[0] == "exit":
+                for w in workers:
+                    w[0].terminate()
+                sys.exit(msg[1])
+            for fl, t in zip(files, msg[1]):
+                if t:
+                    fl.write(t)
+            if msg[0] == "interval" and msg[2]:
+                rolling_add(summary, *msg[2])
+                print_rolling_summary(summary, out, runner_list)
+            out.end_interval()
+            if msg[0] == "done":
+                merge_runner_state(runner_list, msg[2])
+                if msg[3]:
+                    summary.merge(msg[3])
+                ret = msg[4]
+                break
+        p.join()
+        if len(workers) < len(chunks):
+            start_worker()
+    if hasattr(gc, "unfreeze"):
+        gc.unfreeze()
+    mm.close()
+    f.close()
+    return ret
+
 def find_group(num, runner_list):
     offset = 0
     for runner in runner_list:
@@ -2339,13 +2721,138 @@ def update_missing(res, rev, valstats, fallback):
             res[k][ind] = float("nan")
         assert not any([x is None for x in res[k]])
 
-def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
-    res = defaultdict(list) # type: DefaultDict[str,List[float]]
-    rev = defaultdict(list) # type: DefaultDict[str, List[str]]
-    valstats = defaultdict(list) # type: DefaultDict[str,List[ValStat]]
+class PerfStatParser(object):
+    """Split perf stat output lines into fields. The regular expressions
+       only depend on the event and title strings, and there are only a few
+       distinct ones of them, so cache the results instead of running them
+       for every line."""
+    def __init__(self):
+        self.compiled = None # type: Any
+        self.valid = {} # type: Dict[str, bool]
+        self.events = {} # type: Dict[str, str]
+        self.titles = {} # type: Dict[str, Tuple[str, bool, Any]]
+        self.uncore = {} # type: Dict[str, bool]
+        self.ignored = {} # type: Dict[Tuple[Any, str], bool]
+
+    def is_event(self, n, i):
+        if len(n) <= i:
+            return False
+        if self.compiled is not valid_events.compiled:
+            self.compiled = valid_events.compiled
+            self.valid = {}
+        tok = n[i]
+        v = self.valid.get(tok)
+        if v is None:
+            v = self.compiled.match(tok) is not None
+            # don't fill the cache with counts
+            if not ("0" <= tok[:1] <= "9" or tok[:1] in (" ", "<")):
+                self.valid[tok] = v
+        return v
+
+    def split(self, l):
+        """Return title, count, event, offset of the next field, fields.
+           None if the line is not parseable."""
+        n = l.split(";")
+
+        # filter out the empty unit field added by 3.14
+        n = [x for x in n if x not in ('', 'Joules', 'ns')]
+
+        # timestamp is already removed
+        # -a --per-socket socket,numcpus,count,event,...
+        # -a --per-core core,numcpus,count,event,...
+        # -a -A cpu,count,event,...
+        # count,event,...
+        if self.is_event(n, 1):
+            return "", n[0], n[1], 2, n
+        if self.is_event(n, 3):
+            return n[0], n[2], n[3], 4, n
+        if self.is_event(n, 2):
+            return n[0], n[1], n[2], 3, n
+        return None
+
+    def event(self, event):
+        """Canonical event name of a raw perf event."""
+        e = self.events.get(event)
+        if e is None:
+            # code later relies on stripping ku flags
+            e = _re_bracket_event.sub('', event)
+            e = remove_qual(e)
+            m = _re_cpu_event.match(e)
+            if m:
+                e = m.group(2)
+            e = self.events[event] = intern_str(e)
+        return e
+
+    def title(self, title):
+        """Return title, is number, core title match"""
+        t = self.titles.get(title)
+        if t is None:
+            nt = intern_str(title.replace("CPU", ""))
+            m = _re_coretitle_match.match(nt) if _re_coretitle.match(nt) else None
+            t = self.titles[title] = (nt, is_number(nt), m)
+        return t
+
+    def uncore_event(self, event):
+        u = self.uncore.get(event)
+        if u is None:
+            u = self.uncore[event] = _re_uncore_event.match(event) is not None
+        return u
+
+    def ignored_cpu(self, runner, t):
+        k = (runner, t)
+        v = self.ignored.get(k)
+        if v is None:
+            num = int(t)
+            v = self.ignored[k] = num not in runner.cpu_list and (num not in cpu.cputocore or not any(
+                    [k in runner.cpu_list for k in cpu.coreids[cpu.cputocore[num]]]))
+        return v
+
+class IntervalResults(object):
+    """Collect the results of one interval in columnar form.
+       res maps each key (CPU, core, socket, or "") to an array of values,
+       valstats to a ValStats. The event names are normally the same for all
+       keys of a runner, so they are stored only once per runner and only
+       keys that differ get their own copy."""
+    def __init__(self):
+        self.res = defaultdict(float_array) # type: DefaultDict[str,Any]
+        self.valstats = defaultdict(ValStats) # type: DefaultDict[str,ValStats]
+        self.events = {} # type: Dict[str,List[str]]
+        self.shared = {} # type: Dict[Any,List[str]]
+
+    def add(self, runner, t, val, event, stddev, multiplex):
+        r = self.res[t]
+        n = len(r)
+        r.append(val)
+        self.valstats[t].add(stddev, multiplex)
+        ev = self.events.get(t)
+        if ev is None:
+            ev = self.events[t] = self.shared.setdefault(runner, [])
+        if n == len(ev):
+            ev.append(event)
+        elif ev[n] is not event and ev[n] != event:
+            ev = self.events[t] = ev[:n]
+            ev.append(event)
+
+    def rev(self):
+        """Return the event names for each key. Keys with the same
+           events share the same tuple."""
+        rev = defaultdict(tuple) # type: DefaultDict[str,Tuple[str,...]]
+        tuples = {} # type: Dict[int,Tuple[List[str],Tuple[str,...]]]
+        for t, ev in self.events.items():
+            tev = tuples.get(id(ev))
+            if tev is None:
+                tev = tuples[id(ev)] = (ev, tuple(ev))
+            n = len(self.res[t])
+            rev[t] = tev[1] if n == len(ev) else tev[1][:n]
+        return rev
+
+def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum,
+               inputf=None, next_interval=None):
+    results = IntervalResults()
+    res = results.res
     env = {} # type: Dict[str,str]
     account = defaultdict(Stat) # type: DefaultDict[str,Stat]
-    inf, prun = setup_perf(evstr, rest)
+    inf, prun = setup_perf(evstr, rest, inputf)
     prev_interval = 0.0
     interval = None
     interval_dur = 0.0
@@ -2354,6 +2861,7 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
     last_linenum = [0]
     fallback = {} # type: Dict[Tuple[str,str], Tuple[float, ValStat]]
     need_fallback = False
+    parser = PerfStatParser()
     if not args.import_ and not args.interval:
         start = time.time()
     while True:
@@ -2406,14 +2914,14 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
                     if res:
                         interval_dur = interval - prev_interval
                         set_interval(env, interval_dur, prev_interval)
+                        rev, valstats = results.rev(), results.valstats
                         if need_fallback:
                             update_missing(res, rev, valstats, fallback)
                         fallback = {}
                         need_fallback = False
                         yield 0, res, rev, prev_interval, valstats, env
-                        res = defaultdict(list)
-                        rev = defaultdict(list)
-                        valstats = defaultdict(list)
+                        results = IntervalResults()
+                        res = results.res
                     prev_interval = interval
                     start = interval
             elif not l[:1].isspace():
@@ -2427,43 +2935,24 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
         if args.perf_output and not skip:
             args.perf_output.write(origl.rstrip() + "\n")
 
-        n = l.split(";")
-
-        # filter out the empty unit field added by 3.14
-        n = [x for x in n if x not in ('', 'Joules', 'ns')]
-
-        # timestamp is already removed
-        # -a --per-socket socket,numcpus,count,event,...
-        # -a --per-core core,numcpus,count,event,...
-        # -a -A cpu,count,event,...
-        # count,event,...
-        if is_event(n, 1):
-            title, count, event, off = "", n[0], n[1], 2
-        elif is_event(n, 3):
-            title, count, event, off = n[0], n[2], n[3], 4
-        elif is_event(n, 2):
-            title, count, event, off = n[0], n[1], n[2], 3
-        else:
+        fields = parser.split(l)
+        if fields is None:
             if not FUZZYINPUT:
                 warn("unparseable perf output\n%s" % origl.rstrip())
             linenum += 1
             skip = False
             continue
 
+        title, count, event, off, n = fields
+
         # dummy event used as separator to avoid merging problems
         if event.startswith("emulation-faults"):
             linenum += 1
             skip = False
             continue
 
-        title = title.replace("CPU", "")
-
-        # code later relies on stripping ku flags
-        event = _re_bracket_event.sub('', event)
-        event = remove_qual(event)
-        m = _re_cpu_event.match(event)
-        if m:
-            event = m.group(2)
+        title, title_number, coretitle = parser.title(title)
+        event = parser.event(event)
 
         # duplicated duration_time in perf ~6.5. was already added from the first.
         if event == "duration_time" and count == "<not counted>":
@@ -2486,7 +2975,7 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
 
         multiplex = float('nan')
         event = event.rstrip()
-        if _re_numeric_count.match(count):
+        if "0" <= count[:1] <= "9" or _re_numeric_count.match(count):
             val = float(count.replace(",", "."))
         elif _re_angle_count.match(count):
             account[event].errors[count.replace("<","").replace(">","")] += 1
@@ -2509,30 +2998,22 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
             multiplex = float(n[off + 1].replace(",", "."))
             off += 2
 
-        st = ValStat(stddev=stddev, multiplex=multiplex)
-
         account[event].total += 1
 
-        def ignored_cpu(num):
-            return num not in runner.cpu_list and (num not in cpu.cputocore or not any(
-                    [k in runner.cpu_list for k in cpu.coreids[cpu.cputocore[num]]]))
-
         def add(t):
-            if runner.cpu_list and is_number(t) and ignored_cpu(int(t)):
+            if runner.cpu_list and is_number(t) and parser.ignored_cpu(runner, t):
                 return
 
             if skip:
-                res[t].append(0.0)
+                results.add(runner, t, 0.0, event, stddev, multiplex)
             elif action == FUZZY:
-                res[t].append(float("nan"))
+                results.add(runner, t, float("nan"), event, stddev, multiplex)
             else:
-                res[t].append(val)
-            fallback[(t, origevent)] = (val, st)
-            rev[t].append(event)
-            valstats[t].append(st)
+                results.add(runner, t, val, event, stddev, multiplex)
+            if FUZZYINPUT:
+                fallback[(t, origevent)] = (val, ValStat(stddev=stddev, multiplex=multiplex))
             if args.perf_summary:
                 # XXX add unit, enabled, num-cpus
-                assert len(res[t]) == len(rev[t])
                 update_perf_summary(summary, resoff[t] + len(res[t]) - 1, t, val, event, "", multiplex)
 
         def dup_val(l):
@@ -2540,19 +3021,15 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
                 if j in runner.cpu_list:
                     add("%d" % j)
 
-        def uncore_event(event):
-            return _re_uncore_event.match(event)
-
         # power/uncore events are only output once for every socket
-        if ((uncore_event(event) or uncore_event(origevent)) and
-                is_number(title) and
+        if ((parser.uncore_event(event) or parser.uncore_event(origevent)) and
+                title_number and
                 (not ((args.core or args.cpu) and not args.single_thread))):
             cpunum = int(title)
             socket = cpu.cputosocket[cpunum]
             dup_val(cpu.sockettocpus[socket])
-        elif _re_coretitle.match(title) and (smt_mode or args.no_aggr):
-            m = _re_coretitle_match.match(title)
-            assert m is not None
+        elif coretitle and (smt_mode or args.no_aggr):
+            m = coretitle
             if m.group(2): # XXX
                 warn_once("die topology not supported currently")
             socket, core = int(m.group(1)), int(m.group(3))
@@ -2560,7 +3037,7 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
         # duration time is only output once, except with --cpu/-C (???)
         # except perf 6.2+ outputs it with -A on all cpus, but not counting except the first
         elif ((event.startswith("duration_time") or origevent.startswith("duration_time"))
-                and is_number(title) and not args.cpu and not args.core):
+                and title_number and not args.cpu and not args.core):
             dup_val(runner.cpu_list)
         else:
             add(title)
@@ -2584,6 +3061,9 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
     if not args.import_ and not args.interval:
         set_interval(env, time.time() - start, start)
     elif args.interval:
+        if next_interval is not None and interval is not None:
+            # the chunk ends before the end of the input
+            interval_dur = next_interval - interval
         set_interval(env, interval_dur if interval_dur else args.interval/1000.,
                      interval if interval else float('NaN'))
     else:
@@ -2591,6 +3071,7 @@ def do_execute(rlist, summary, evstr, flat_rmap, out, rest, resoff, revnum):
         set_interval(env, 0, 0)
     ret = prun.wait()
     print_account(account)
+    rev, valstats = results.rev(), results.valstats
     if need_fallback:
         update_missing(res, rev, valstats, fallback)
     yield ret, res, rev, interval, valstats, env
@@ -2609,6 +3090,8 @@ def adjust_ev(ev, level):
 def ev_collect(ev, level, obj):
     if isinstance(ev, types.LambdaType):
         return ev(lambda ev, level: ev_collect(ev, level, obj), level)
+    # the references as the model passes them, resolved in gen_res_map
+    obj.evrefs.add((ev, level))
     if ev == "mux":
         return DummyArith()
     if ev.startswith("interval-"):
@@ -2705,6 +3188,24 @@ def compare_event(aname, bname):
 def is_hybrid():
     return ocperf.file_exists("/sys/bus/event_source/devices/cpu/format/any")
 
+def lookup_validate(rev, index, ev, obj, env, runner_list):
+    """check once that the perf output at index is the event the model expects"""
+    cache_key = (index, ev)
+    if cache_key not in _lookup_validate_cache:
+        try:
+            r = rev[index]
+        except IndexError:
+            warn_once_no_assert("Not enough lines in perf output for rev (%d vs %d for %s) at %s, event %s" %
+                    (index, len(rev), obj.name, env['interval'], ev))
+            return False
+        rmap_ev = event_rmap(r, runner_list).lower()
+        assert (rmap_ev == canon_event(ev).replace("/k", "/") or
+                compare_event(rmap_ev, ev) or
+                rmap_ev == "dummy" or
+                (rmap_ev.endswith("_any") and not is_hybrid())), "event rmap mismatch %s vs %s" % (rmap_ev, ev)
+        _lookup_validate_cache.add(cache_key)
+    return True
+
 def lookup_res(res, rev, ev, obj, env, level, referenced, cpuoff, st, runner_list):
     """get measurement result, possibly wrapping in UVal"""
 
@@ -2714,15 +3215,13 @@ def lookup_res(res, rev, ev, obj, env, level, referenced, cpuoff, st, runner_lis
     ev = adjust_ev(ev, level)
 
     if isinstance(ev, str) and ev.startswith("interval") and feat.supports_duration_time:
-        scale = { "interval-s":  1e9,
-                  "interval-ns": 1,
-                  "interval-ms": 1e6 }[ev]
+        scale = interval_scale[ev]
         return lookup_res(res, rev, "duration_time", obj, env, level, referenced, cpuoff, st, runner_list)/scale
 
     if ev in env:
         return env[ev]
     if ev == "mux":
-        return min([s.multiplex for s in st])
+        return min(st.multiplex)
     #
     # when the model passed in a lambda run the function for each logical cpu
     # (by resolving its EVs to only that CPU)
@@ -2740,20 +3239,8 @@ def lookup_res(res, rev, ev, obj, env, level, referenced, cpuoff, st, runner_lis
     referenced.add(index)
     if not args.fast:
         ev = ev.lower()
-        cache_key = (index, ev)
-        if cache_key not in _lookup_validate_cache:
-            try:
-                r = rev[index]
-            except IndexError:
-                warn_once_no_assert("Not enough lines in perf output for rev (%d vs %d for %s) at %s, event %s" %
-                        (index, len(rev), obj.name, env['interval'], ev))
-                return 0
-            rmap_ev = event_rmap(r, runner_list).lower()
-            assert (rmap_ev == canon_event(ev).replace("/k", "/") or
-                    compare_event(rmap_ev, ev) or
-                    rmap_ev == "dummy" or
-                    (rmap_ev.endswith("_any") and not is_hybrid())), "event rmap mismatch %s vs %s" % (rmap_ev, ev)
-            _lookup_validate_cache.add(cache_key)
+        if not lookup_validate(rev, index, ev, obj, env, runner_list):
+            return 0
 
     try:
         vv = res[index]
@@ -2771,10 +3258,208 @@ def lookup_res(res, rev, ev, obj, env, level, referenced, cpuoff, st, runner_lis
                 warn_once("Partial CPU thread data from perf for %s" %
                         obj.name)
                 return 0.0
-    if st[index].stddev or st[index].multiplex != 100.0:
-        return UVal(name=ev, value=vv, stddev=st[index].stddev, mux=st[index].multiplex)
+    stddev, mux = st.stddev[index], st.multiplex[index]
+    if stddev or mux != 100.0:
+        return UVal(name=ev, value=vv, stddev=stddev, mux=mux)
     return vv
 
+interpret_metrics = os.getenv("INTERPRET_METRICS") not in (None, "", "0")
+
+# duration_time is in ns
+interval_scale = { "interval-s":  1e9,
+                   "interval-ns": 1,
+                   "interval-ms": 1e6 }
+
+# kinds of entries in a compiled evaluation plan
+PLAN_CONST, PLAN_ENV, PLAN_MUX, PLAN_INDEX = range(4)
+
+def compile_ev(rev, ev, obj, env, level, runner_list):
+    """Resolve a model event reference once into a plan entry.
+       Returns None when the reference cannot be compiled (yet)."""
+    if level == 999:
+        return (PLAN_CONST, lookup_retlat(ev))
+    ev = adjust_ev(ev, level)
+    scale = None
+    if ev.startswith("interval") and feat.supports_duration_time:
+        scale = interval_scale[ev]
+        ev = "duration_time"
+    elif ev in env:
+        return (PLAN_ENV, ev)
+    if ev == "mux":
+        return (PLAN_MUX, )
+    index = obj.res_map[(ev, level, obj.name)]
+    if not args.fast:
+        ev = ev.lower()
+        if not lookup_validate(rev, index, ev, obj, env, runner_list):
+            return None
+    return (PLAN_INDEX, index, ev, scale)
+
+def plan_ev(ev, level, obj):
+    """Resolve a model event reference into a plan entry when the
+       scheduler has assigned the res_map indexes. Returns None for references
+       that need the environment or the results, which are compiled
+       on the first lookup."""
+    if level == 999:
+        return None
+    ev = adjust_ev(ev, level)
+    scale = None
+    if ev.startswith("interval"):
+        if not feat.supports_duration_time:
+            return None
+        scale = interval_scale[ev]
+        ev = "duration_time"
+    if ev == "mux":
+        return (PLAN_MUX, )
+    index = obj.res_map.get((ev, level, obj.name))
+    if index is None:
+        return None
+    return (PLAN_INDEX, index, ev if args.fast else ev.lower(), scale)
+
+def check_plans(olist, rev, env, runner_list):
+    """Check the event plans of a new schedule once against the perf output.
+       Plans for events missing in the output are dropped, so that they
+       are handled (and warned about) on lookup."""
+    if args.fast:
+        return
+    for obj in olist:
+        for k, p in list(obj.eval_plan.items()):
+            if p[0] != PLAN_INDEX:
+                continue
+            if p[1] >= len(rev):
+                del obj.eval_plan[k]
+                continue
+            lookup_validate(rev, p[1], p[2], obj, env, runner_list)
+
+class CompiledEval(object):
+    """Evaluate the model event references of one compute pass.
+       Event references are resolved once per node into obj.eval_plan,
+       and the raw values are shared between all nodes and sub expressions
+       using the same result. Gives the same results as lookup_res."""
+
+    def __init__(self, res, rev, env, st, runner_list):
+        self.res = res
+        self.rev = rev
+        self.env = env
+        self.st = st
+        self.runner_list = runner_list
+        self.vals = {} # type: Dict[Tuple[int,int], Tuple[Any,float,float,bool]]
+        self.mux = None # type: Any
+        # env keys read by the current node. None when a lookup could not be tracked.
+        self.track = set() # type: Set[Any]
+
+    def lookup(self, obj, ev, level, referenced, cpuoff):
+        p = obj.eval_plan.get((ev, level))
+        if p is None:
+            # lambdas are created fresh for each call, so never compiled
+            if isinstance(ev, types.LambdaType):
+                if level == 999:
+                    return lookup_retlat(ev)
+                self.track.add('num_merged')
+                return sum([ev(lambda ev, level:
+                          self.lookup(obj, ev, level, referenced, off), level)
+                          for off in range(self.env['num_merged'])])
+            p = compile_ev(self.rev, ev, obj, self.env, level, self.runner_list)
+            if p is None:
+                self.track.add(None)
+                return lookup_res(self.res, self.rev, ev, obj, self.env, level, referenced,
+                                  cpuoff, self.st, self.runner_list)
+            obj.eval_plan[(ev, level)] = p
+        kind = p[0]
+        if kind == PLAN_INDEX:
+            index = p[1]
+            referenced.add(index)
+            key = (index, cpuoff)
+            v = self.vals.get(key)
+            if v is None:
+                v = self.fetch(index, cpuoff)
+                if v is None:
+                    self.track.add(None)
+                    return lookup_res(self.res, self.rev, ev, obj, self.env, level, referenced,
+                                      cpuoff, self.st, self.runner_list)
+                self.vals[key] = v
+            if v[3]:
+                val = UVal(name=p[2], value=v[0], stddev=v[1], mux=v[2])
+            else:
+                val = v[0]
+            if p[3] is not None:
+                return val / p[3]
+            return val
+        if kind == PLAN_CONST:
+            return p[1]
+        if kind == PLAN_ENV:
+            self.track.add(p[1])
+            return self.env[p[1]]
+        self.track.add(PLAN_MUX)
+        return self.get_mux()
+
+    def get_mux(self):
+        if self.mux is None:
+            self.mux = min(self.st.multiplex)
+        return self.mux
+
+    def track_values(self, keys):
+        return tuple([self.get_mux() if k == PLAN_MUX else self.env.get(k) for k in keys])
+
+    def fetch(self, index, cpuoff):
+        try:
+            vv = self.res[index]
+        except IndexError:
+            return None
+        if isinstance(vv, tuple):
+            if cpuoff == -1:
+                vv = sum(vv)
+            else:
+                try:
+                    vv = vv[cpuoff]
+                except IndexError:
+                    return None
+        stddev, mux = self.st.stddev[index], self.st.multiplex[index]
+        return (vv, stddev, mux, bool(stddev or mux != 100.0))
+
+class VectorEval(object):
+    """Evaluate model event references for all lanes of a --vector-compute
+       pass as arrays. Uses the same plans as CompiledEval."""
+
+    def __init__(self, rev, env, runner_list):
+        self.rev = rev
+        self.env = env
+        self.runner_list = runner_list
+        self.vals = {} # type: Dict[Tuple[int,int,int], Any]
+
+    def lookup(self, src, obj, ev, level, referenced, cpuoff):
+        import tl_vec
+        p = obj.eval_plan.get((ev, level))
+        if p is None:
+            if isinstance(ev, types.LambdaType):
+                if level == 999:
+                    return lookup_retlat(ev)
+                return sum([ev(lambda ev, level:
+                          self.lookup(src, obj, ev, level, referenced, off), level)
+                          for off in range(self.env['num_merged'])])
+            p = compile_ev(self.rev, ev, obj, self.env, level, self.runner_list)
+            if p is None:
+                raise tl_vec.VecFallback()
+            obj.eval_plan[(ev, level)] = p
+        kind = p[0]
+        if kind == PLAN_INDEX:
+            index = p[1]
+            referenced.add(index)
+            key = (id(src), index, cpuoff)
+            v = self.vals.get(key)
+            if v is None:
+                v = src.column(index, cpuoff)
+                self.vals[key] = v
+            # an UVal in the lanes where the scalar path uses one
+            val = src.uval(index, v, p[2])
+            if p[3] is not None:
+                return val / p[3]
+            return val
+        if kind == PLAN_CONST:
+            return p[1]
+        if kind == PLAN_ENV:
+            return self.env[p[1]]
+        return src.mux
+
 class BadEvent(Exception):
     def __init__(self, name):
         super(Exception, self).__init__()
@@ -3014,30 +3699,43 @@ def node_below(obj):
     return not obj.thresh
 
 class Summary(object):
-    """Accumulate counts for summary."""
+    """Accumulate counts for summary. Only the running sums are kept,
+       each key is updated with a single operation on its whole array."""
     def __init__(self):
-        self.res = defaultdict(list)
-        self.rev = defaultdict(list)
+        self.res = defaultdict(float_array) # type: DefaultDict[str,Any]
+        self.rev = defaultdict(tuple) # type: DefaultDict[str,Any]
         self.env = Counter() # type: typing.Counter[str]
-        self.valstats = defaultdict(list)
+        self.valstats = defaultdict(ValStats) # type: DefaultDict[str,ValStats]
         self.summary_perf = OrderedDict()
+        self.count = 0
+        self.rolling = None # type: Summary | None
+        # the last interval added, for the --summary-every windows
+        self.end = None # type: float | None
 
     def add(self, res, rev, valstats, env):
+        self.count += 1
         for j in sorted(res.keys()):
-            for ind, val in enumerate(res[j]):
-                if ind < len(self.res[j]):
-                    self.res[j][ind] += val
-                    self.valstats[j][ind] = combine_valstat([self.valstats[j][ind], valstats[j][ind]])
-                else:
-                    self.res[j].append(val)
-                    self.valstats[j].append(valstats[j][ind])
-        if len(rev.keys()) == 1:
-            append_dict(self.rev, rev)
-        else:
-            self.rev.update(rev)
+            r = res[j]
+            if len(r) == 0:
+                continue
+            sr = self.res[j]
+            n = min(len(sr), len(r))
+            sr[:n] = float_array(map(operator.add, sr[:n], r[:n]))
+            sr += r[n:]
+            self.valstats[j].merge(valstats[j])
+        # the events are the same in every interval, except a truncated last one
+        for k, ev in rev.items():
+            if len(ev) >= len(self.rev.get(k, ())):
+                self.rev[k] = ev
         for j in env.keys():
             self.env[j] += env[j]
 
+    def merge(self, other):
+        """Add the sums of another Summary, e.g. from a parallel worker."""
+        if other.count > 0:
+            self.add(other.res, other.rev, other.valstats, other.env)
+            self.count += other.count - 1
+
 def parse_metric_group(l, mg):
     if l is None:
         return [], []
@@ -3077,12 +3775,14 @@ def quote(s):
     return s
 
 class Group(object):
-    def __init__(self, evnum, objl, num, outgroup=False):
+    def __init__(self, evnum, objl, num, outgroup=False, evmask=0):
         self.evnum = evnum
         self.base = -1
         self.objl = set(objl)
         self.outgroup = outgroup
         self.num = num
+        # the events of evnum as Scheduler bits
+        self.evmask = evmask
 
 class GroupCmp(object):
     def __init__(self, v):
@@ -3109,8 +3809,8 @@ def grab_group(l):
 
 def update_group_map(evnum, obj, group):
     taken = set()
-    for lev in obj.evlevels:
-        r = raw_event(lev[0])
+    # obj.evnum has the raw events of obj.evlevels
+    for lev, r in zip(obj.evlevels, obj.evnum):
         # can happen during splitting
         # the update of the other level will fix it
         if r in evnum and lev not in obj.group_map:
@@ -3134,6 +3834,11 @@ def gen_res_map(solist):
         for k in obj.group_map.keys():
             gr = obj.group_map[k]
             obj.res_map[k] = gr[0].base + gr[1]
+        obj.eval_plan = {}
+        for r in obj.evrefs:
+            p = plan_ev(r[0], r[1], obj)
+            if p is not None:
+                obj.eval_plan[r] = p
 
 def print_group(g):
     evkeys = [k for o in g.objl for k in o.group_map.keys() if o.group_map[k][0] == g]
@@ -3164,6 +3869,15 @@ class Scheduler(object):
         self.evgroups_nf = []
         self.nextgnum = 0
         self.event_to_group = {}
+        # events interned as bits for the group checks
+        self.evbits = {} # type: Dict[str, int]
+        # bits of the events using generic counters, and of the events
+        # that need the full needed_counters check
+        self.generic_mask = 0
+        self.constrained_mask = 0
+        self.sched_time = 0.0
+        # the plans of gen_res_map still need check_plans
+        self.plans_checked = False
 
     # should avoid adding those in the first place instead
     def dummy_unreferenced(self, olist):
@@ -3191,10 +3905,46 @@ class Scheduler(object):
                 evlev = evlev[n:]
                 evnum = evnum[n:]
 
+    def evmask(self, evnum):
+        """Return the bits of the events in evnum, interning new events."""
+        m = 0
+        for e in evnum:
+            b = self.evbits.get(e)
+            if b is None:
+                b = self.evbits[e] = 1 << len(self.evbits)
+                if num_generic_counters({e}):
+                    self.generic_mask |= b
+                if constrained_event(e):
+                    self.constrained_mask |= b
+            m |= b
+        return m
+
+    def merged_counters(self, g, evnum, mask):
+        """needed_counters of group g with the events evnum (bits mask) added."""
+        m = g.evmask | mask
+        if m & self.constrained_mask:
+            return needed_counters(cat_unique(g.evnum, evnum))
+        return popcount(m & self.generic_mask)
+
+    def merge(self, g, evnum, mask, obj):
+        obj_debug_print(obj, "add_duplicate %s in %s obj %s to group %d" % (
+            " ".join(evnum),
+            " ".join(g.evnum),
+            obj.name,
+            g.num))
+        for k in evnum:
+            if not g.evmask & self.evbits[k]:
+                g.evnum.append(k)
+            if k not in self.event_to_group:
+                self.event_to_group[k] = g
+        g.evmask |= mask
+        g.objl.add(obj)
+        update_group_map(g.evnum, obj, g)
+
     # may modify evnum
     def add_duplicate(self, evnum, obj):
-        evset = set(evnum)
-        num_gen = num_generic_counters(evset)
+        evmask = self.evmask(evnum)
+        num_gen = evmask & self.generic_mask
         full = set()
 
         if ((has(obj, 'area') and match_patlist(DEDUP_AREA, obj.area)) or
@@ -3220,7 +3970,11 @@ class Scheduler(object):
             if len(evnum) == 0:
                 debug_print("%s fully deduped" % obj.name)
                 return True
+            mask = self.evmask(evnum)
+        else:
+            mask = evmask
 
+        best = None
         for g in reversed(self.evgroups_nf if num_gen else self.evgroups):
             if g.outgroup:
                 continue
@@ -3231,27 +3985,26 @@ class Scheduler(object):
             # scheduler isn't very good at handling smaller groups, and
             # with eventual exclusive use we would like as big groups as
             # possible. Still keep it as a --tune option to play around.
-            if ((any_merge or not evset.isdisjoint(g.evnum)) and
-                  needed_counters(cat_unique(g.evnum, evnum)) <= ectx.counters):
-                obj_debug_print(obj, "add_duplicate %s in %s obj %s to group %d" % (
-                    " ".join(evnum),
-                    " ".join(g.evnum),
-                    obj.name,
-                    g.num))
-                for k in evnum:
-                    if k not in g.evnum:
-                        g.evnum.append(k)
-                    if k not in self.event_to_group:
-                        self.event_to_group[k] = g
-                g.objl.add(obj)
-                update_group_map(g.evnum, obj, g)
-                return True
+            if any_merge or g.evmask & evmask:
+                n = self.merged_counters(g, evnum, mask)
+                if n <= ectx.counters:
+                    if not args.pack_groups:
+                        self.merge(g, evnum, mask, obj)
+                        return True
+                    # best fit: most shared events, then fewest free counters
+                    score = (popcount(g.evmask & mask), n)
+                    if best is None or score > best[0]:
+                        best = (score, g)
+                    continue
 
             # memorize already full groups
-            elif num_generic_counters(set(g.evnum)) >= ectx.counters:
+            if popcount(g.evmask & self.generic_mask) >= ectx.counters:
                 full.add(g)
         if full:
             self.evgroups_nf = [g for g in self.evgroups_nf if g not in full]
+        if best:
+            self.merge(best[1], evnum, mask, obj)
+            return True
 
         return False
 
@@ -3262,7 +4015,7 @@ class Scheduler(object):
             return
         evnum = dedup(evnum)
         if not self.add_duplicate(evnum, obj):
-            g = Group(evnum, [obj], self.nextgnum)
+            g = Group(evnum, [obj], self.nextgnum, evmask=self.evmask(evnum))
             obj_debug_print(obj, "add %s to group %d" % (evnum, g.num))
             for k in evnum:
                 if k not in self.event_to_group:
@@ -3305,9 +4058,12 @@ class Scheduler(object):
             len(olist),
             self.evnum.count("dummy")),
               file=sys.stderr)
+        print("scheduled in %.3fs%s" % (self.sched_time, " with --pack-groups" if args.pack_groups else ""),
+              file=sys.stderr)
 
     # fit events into available counters
     def schedule(self, olist):
+        start = time.time()
         # sort objects by level and inside each level by num-counters
         solist = sorted(olist, key=lambda x: (x.level, x.nc))
         # try to fit each objects events into groups
@@ -3337,13 +4093,13 @@ class Scheduler(object):
         if not KEEP_UNREF:
             self.dummy_unreferenced(olist)
         self.allocate_bases()
+        gen_res_map(olist)
+        self.plans_checked = False
+        self.sched_time = time.time() - start
 
         if args.print_group:
             for g in self.evgroups:
                 print_group(g)
-
-        gen_res_map(olist)
-        if args.print_group:
             self.print_group_summary(olist)
 
 def should_print_obj(obj, match, thresh_mg, bn):
@@ -3398,7 +4154,7 @@ class Printer(object):
         if bn:
             self.bottlenecks.add(bn)
 
-        out.logf.flush()
+        out.sync()
 
         # determine all objects to print
         thresh_mg = set() # type: Set[str]
@@ -3469,6 +4225,62 @@ def check_nodes(runner_list, nodesarg):
         sys.exit("Unknown node(s) in --nodes: " +
                  " ".join([o for o, v in zip(options, valid) if not v]))
 
+MEMO_UNSET = object()
+
+def memo_state(obj, deps):
+    state = [obj.thresh, obj.errcount]
+    for n in deps:
+        state.append(n.__dict__.get('thresh'))
+        state.append(n.errcount)
+    return state
+
+class ComputeMemo(object):
+    """Result of computing a node in a compute slot and what it depended on."""
+    __slots__ = ('gen', 'ref', 'envkeys', 'envvals', 'state', 'val', 'thresh', 'errcount',
+                 'bad_ratio', 'touched')
+
+    def __init__(self, gen, ref, envkeys, envvals, state, val, thresh, errcount, bad_ratio, touched):
+        self.gen = gen
+        self.ref = ref
+        self.envkeys = envkeys
+        self.envvals = envvals
+        self.state = state
+        self.val = val
+        self.thresh = thresh
+        self.errcount = errcount
+        self.bad_ratio = bad_ratio
+        self.touched = touched
+
+class ComputeSlot(object):
+    """Inputs of the last compute of a slot and the node results computed from them."""
+    __slots__ = ('gen', 'rev', 'res', 'stddev', 'multiplex', 'nodes')
+
+    def __init__(self):
+        self.gen = 0
+        self.rev = None # type: Any
+        self.res = None # type: Any
+        self.stddev = None # type: Any
+        self.multiplex = None # type: Any
+        self.nodes = {} # type: Dict[Any, ComputeMemo]
+
+    def update(self, res, rev, st):
+        """Remember new inputs. Return the set of changed event indexes,
+           or None if everything changed."""
+        dirty = None # type: Any
+        if (self.res is not None and len(res) == len(self.res) and
+                len(st) == len(self.stddev) and rev == self.rev):
+            dirty = set()
+            for new, old in ((res, self.res), (st.stddev, self.stddev),
+                             (st.multiplex, self.multiplex)):
+                if new != old:
+                    dirty.update([i for i, (a, b) in enumerate(zip(new, old)) if a != b])
+        self.gen += 1
+        self.rev = rev[:]
+        self.res = res[:]
+        self.stddev = st.stddev[:]
+        self.multiplex = st.multiplex[:]
+        return dirty
+
 class Runner(object):
     """Handle measurements of event groups. Map events to groups."""
 
@@ -3478,8 +4290,8 @@ class Runner(object):
         self.idle_keys = set()
         self.sched = Scheduler()
         self.printer = Printer(self.metricgroups)
-        self._compute_cache = OrderedDict()
-        self._compute_cache_capacity = 1024
+        self._compute_memo = {} # type: Dict[Any, ComputeSlot]
+        self._memo_deps = {} # type: Dict[Any, Tuple[Any, ...]]
 
     def __init__(self, max_level, idle_threshold, kernel_version, pmu=None):
         # always needs to be filtered by olist:
@@ -3508,6 +4320,7 @@ class Runner(object):
     def do_run(self, obj):
         obj.res = None
         obj.res_map = {}
+        obj.eval_plan = {}
         obj.group_map = {}
         self.olist.append(obj)
         self.full_olist.append(obj)
@@ -3576,8 +4389,7 @@ class Runner(object):
         # now keep what is both in fmatch and sibmatch and mgroups
         # assume that mgroups matches do not need propagation
         self.olist = [obj for obj, fil in zip(self.olist, fmatch) if fil or select_node(obj)]
-        self._compute_cache_clear()
-        self._update_compute_cache_capacity()
+        self._compute_memo_clear()
 
     def setup_children(self):
         for obj in self.olist:
@@ -3618,6 +4430,7 @@ class Runner(object):
         min_kernel = [] # type: List[int]
         for obj in self.olist:
             obj.evlevels = []
+            obj.evrefs = set()
             obj.compute(lambda ev, level: ev_collect(ev, level, obj))
             obj.val = None
             obj.evlist = [x[0] for x in obj.evlevels]
@@ -3661,8 +4474,7 @@ class Runner(object):
         if errata_warn_nodes and not args.ignore_errata:
             pwrap_not_quiet("Nodes " + " ".join(x.name for x in errata_warn_nodes) + " have errata " +
                         " ".join(errata_warn_names))
-        self._compute_cache_clear()
-        self._update_compute_cache_capacity()
+        self._compute_memo_clear()
         self.clear_ectx()
 
     def propagate_siblings(self):
@@ -3686,56 +4498,56 @@ class Runner(object):
                     propagate(obj.sibling, changed, obj)
         return changed[0]
 
-    def _compute_digest(self, res, rev, valstats, env):
-        if not isinstance(res, dict) or not isinstance(rev, dict) or not isinstance(valstats, dict):
-            return None
-        try:
-            env_key = tuple(sorted(env.items()))
-        except TypeError:
-            return None
-        return (tuple((k, tuple(v)) for k, v in sorted(res.items())),
-                tuple((k, tuple(v)) for k, v in sorted(rev.items())),
-                tuple((k, tuple(v)) for k, v in sorted(valstats.items())),
-                env_key)
-
-    def _compute_cache_put(self, key, entry):
-        self._compute_cache[key] = entry
-        self._compute_cache.move_to_end(key)
-        if len(self._compute_cache) > self._compute_cache_capacity:
-            self._compute_cache.popitem(last=False)
-
-    def _compute_cache_clear(self):
-        self._compute_cache.clear()
-
-    def _update_compute_cache_capacity(self):
-        self._compute_cache_capacity = max(1024, len(self.olist) * 8)
-
-    def _restore_cached(self, obj, cache_key, stat):
-        oldthresh = obj.thresh
-        e = self._compute_cache[cache_key]
-        obj.val = e.val
-        obj.thresh = e.thresh
-        obj.errcount = e.errcount
-
-        if obj.thresh != oldthresh and oldthresh != Undef:
-            changed = 1
-        else:
-            changed = 0
-
-        if stat:
-            stat.referenced |= e.ref
-            if e.bad_ratio:
-                stat.mismeasured.add(obj.name)
-            if obj.errcount > 0 and obj.name not in stat.errors:
-                stat.errcount += obj.errcount
-                stat.errors.add(obj.name)
-                stat.referenced |= set(obj.res_map.values())
-        return changed
-
-    def compute(self, res, rev, valstats, env, match, stat, runner_list):
+    def _compute_memo_clear(self):
+        self._compute_memo.clear()
+        self._memo_deps.clear()
+
+    def _node_deps(self, obj):
+        """Other nodes that computing obj can read or compute: the nodes
+           referenced from obj's attributes, transitively."""
+        deps = self._memo_deps.get(obj)
+        if deps is None:
+            nodes = {id(o): o for o in self.full_olist}
+            seen = {id(obj)}
+            found = []
+            todo = [obj]
+            while todo:
+                o = todo.pop()
+                for k, v in o.__dict__.items():
+                    # siblings are only used after compute
+                    if k != 'sibling' and id(v) in nodes and id(v) not in seen:
+                        seen.add(id(v))
+                        found.append(v)
+                        todo.append(v)
+            deps = self._memo_deps[obj] = tuple(found)
+        return deps
+
+    def _memo_hit(self, e, memo, dirty, ceval, state):
+        return (e.gen == memo.gen - 1 and
+                dirty is not None and
+                e.ref.isdisjoint(dirty) and
+                e.envvals == ceval.track_values(e.envkeys) and
+                all(map(operator.is_, e.state, state)))
+
+    def compute(self, res, rev, valstats, env, match, stat, runner_list, slot=None):
+        """Compute all nodes selected by match. slot names the print pass
+           when the same pass is computed again later with updated inputs.
+           Then only nodes that read changed events, or saw different
+           thresholds of the nodes they depend on, are computed again."""
         self.set_ectx()
         changed = 0
-        digest = self._compute_digest(res, rev, valstats, env)
+        ceval = None if interpret_metrics else CompiledEval(res, rev, env, valstats, runner_list)
+        if ceval and not self.sched.plans_checked:
+            check_plans(self.olist, rev, env, runner_list)
+            self.sched.plans_checked = True
+        memo = None
+        dirty = None # type: Any
+        if ceval and slot is not None and not DISABLE_COMPUTE_CACHE:
+            memo = self._compute_memo.get(slot)
+            if memo is None:
+                memo = self._compute_memo[slot] = ComputeSlot()
+            dirty = memo.update(res, rev, valstats)
+        olist = set(self.olist)
 
         # step 1: compute
         for obj in self.olist:
@@ -3745,38 +4557,81 @@ class Runner(object):
                 continue
 
             # parent-missing behavior must be applied before any key or compute
-            if 'parent' in obj.__dict__ and obj.parent and obj.parent not in self.olist:
+            if 'parent' in obj.__dict__ and obj.parent and obj.parent not in olist:
                 obj.parent.thresh = True
 
-            parent = safe_ref(obj, 'parent')
-            parent_thresh = UVal.hashable_thresh(parent.thresh) if parent else 0
-            cache_key = (id(obj), digest, parent_thresh)
-            if not DISABLE_COMPUTE_CACHE and digest is not None and cache_key in self._compute_cache:
-                self._compute_cache.move_to_end(cache_key)
-                changed += self._restore_cached(obj, cache_key, stat)
-                continue
-
-            ref = set() # type: Set[int]
             oldthresh = obj.thresh
-            obj.compute(lambda e, level:
-                            lookup_res(res, rev, e, obj, env, level, ref, -1, valstats, runner_list))
-            # compatibility for models that don't set thresh for metrics
-            if isinstance(obj.thresh, UVal) and obj.name == "Undef":
-                obj.thresh = True
-            if args.force_bn and obj.name in args.force_bn:
-                obj.thresh = True
+            e = None
+            if memo:
+                deps = self._node_deps(obj)
+                state = memo_state(obj, deps)
+                e = memo.nodes.get(obj)
+                if e is not None and not self._memo_hit(e, memo, dirty, ceval, state):
+                    e = None
+            if e is not None:
+                obj.val = e.val
+                obj.thresh = e.thresh
+                obj.errcount = e.errcount
+                for n, val, thresh, errcount in e.touched:
+                    n.val = val
+                    n.thresh = thresh
+                    n.errcount = errcount
+                assert memo is not None
+                e.gen = memo.gen
+                ref = e.ref
+                bad_ratio = e.bad_ratio
+            else:
+                cref = set() # type: Set[int]
+                if memo:
+                    assert ceval is not None
+                    # find the nodes computed as part of obj
+                    depvals = [n.__dict__.get('val', MEMO_UNSET) for n in deps]
+                    for n in deps:
+                        n.val = MEMO_UNSET
+                    ceval.track.clear()
+                if ceval:
+                    obj.compute(lambda e, level:
+                                    ceval.lookup(obj, e, level, cref, -1))
+                else:
+                    obj.compute(lambda e, level:
+                                    lookup_res(res, rev, e, obj, env, level, cref, -1, valstats, runner_list))
+                ref = cref
+                touched = []
+                if memo:
+                    for n, val in zip(deps, depvals):
+                        if n.val is MEMO_UNSET:
+                            if val is MEMO_UNSET:
+                                del n.val
+                            else:
+                                n.val = val
+                        else:
+                            touched.append((n, n.val, n.thresh, n.errcount))
+                # compatibility for models that don't set thresh for metrics
+                if isinstance(obj.thresh, UVal) and obj.name == "Undef":
+                    obj.thresh = True
+                if args.force_bn and obj.name in args.force_bn:
+                    obj.thresh = True
+
+                bad_ratio = False
+                if not obj.metric and not check_ratio(obj.val):
+                    obj.thresh = False
+                    bad_ratio = True
+
+                if memo:
+                    assert ceval is not None
+                    if None in ceval.track:
+                        memo.nodes.pop(obj, None)
+                    else:
+                        envkeys = tuple(ceval.track)
+                        memo.nodes[obj] = ComputeMemo(memo.gen, frozenset(ref), envkeys,
+                                ceval.track_values(envkeys), state,
+                                obj.val, obj.thresh, obj.errcount, bad_ratio, tuple(touched))
 
-            bad_ratio = False
-            if not obj.metric and not check_ratio(obj.val):
-                obj.thresh = False
-                bad_ratio = True
-                if stat:
-                    stat.mismeasured.add(obj.name)
+            if bad_ratio and stat:
+                stat.mismeasured.add(obj.name)
 
-            not_measured = False
             if not obj.res_map and not all([x in env for x in obj.evnum]) and not args.quiet:
                 print("%s not measured" % (obj.__class__.__name__,), file=sys.stderr)
-                not_measured = True
 
             if obj.thresh != oldthresh and oldthresh != Undef:
                 changed += 1
@@ -3788,17 +4643,84 @@ class Runner(object):
                 stat.errors.add(obj.name)
                 stat.referenced |= set(obj.res_map.values())
 
-            if not DISABLE_COMPUTE_CACHE and digest is not None:
-                self._compute_cache_put(
-                    cache_key,
-                    ComputeCacheEntry(obj.val, obj.thresh, obj.errcount,
-                                      frozenset(ref), bad_ratio, not_measured))
-
         # step 2: propagate siblings
         changed += self.propagate_siblings()
         self.clear_ectx()
         return changed
 
+    def vector_propagate_siblings(self):
+        import tl_vec
+        changed = 0 # type: Any
+        for obj in self.olist:
+            if obj in self.sibmatch:
+                changed += tl_vec.vnot(obj.thresh)
+                obj.thresh = True
+            if not obj.sibling:
+                continue
+            t = tl_vec.truth(obj.thresh)
+            if not tl_vec.isvec(t) and not t:
+                continue
+            for k in obj.sibling if isinstance(obj.sibling, (list, tuple)) else (obj.sibling,):
+                if k not in self.olist:
+                    # keeps the threshold over all keys. Leave the first
+                    # setting to the scalar path to get the same changes.
+                    if not k.thresh:
+                        tl_vec.state.fallback |= t
+                    continue
+                kt = tl_vec.truth(k.thresh)
+                changed += tl_vec.vand(t, lambda: tl_vec.vnot(kt))
+                k.thresh = tl_vec.vor(kt, lambda: t)
+        return changed
+
+    def vector_compute(self, vev, src, env, match, vstat):
+        """compute() for all lanes of a --vector-compute pass.
+           Returns the number of changes per lane."""
+        import tl_vec
+        self.set_ectx()
+        if not self.sched.plans_checked:
+            check_plans(self.olist, vev.rev, env, vev.runner_list)
+            self.sched.plans_checked = True
+        changed = tl_vec.zeros(tl_vec.state.lanes)
+
+        for obj in self.olist:
+            obj.errcount = 0
+
+            if not match(obj):
+                continue
+
+            if 'parent' in obj.__dict__ and obj.parent and obj.parent not in self.olist:
+                obj.parent.thresh = True
+
+            ref = set() # type: Set[int]
+            oldthresh = obj.thresh
+            tl_vec.resolve(obj)
+            tl_vec.compute_func(obj)(obj, lambda e, level:
+                            vev.lookup(src, obj, e, level, ref, -1))
+            if isinstance(obj.thresh, UVal) and obj.name == "Undef":
+                obj.thresh = True
+            if args.force_bn and obj.name in args.force_bn:
+                obj.thresh = True
+
+            if not obj.metric and not args.verbose:
+                bad = tl_vec.vnot(tl_vec.in_range(obj.val, 0 - MAX_ERROR, 1 + MAX_ERROR))
+                obj.thresh = tl_vec.mask_false(obj.thresh, bad)
+                vstat.mismeasured(obj.name, bad)
+
+            if not obj.res_map and not all([x in env for x in obj.evnum]) and not args.quiet:
+                for _ in range(vstat.num_active()):
+                    print("%s not measured" % (obj.__class__.__name__,), file=sys.stderr)
+
+            # same as obj.thresh != oldthresh and oldthresh != Undef
+            changed += tl_vec.vand(tl_vec.truth(oldthresh), lambda: tl_vec.vnot(obj.thresh))
+            vstat.referenced |= ref
+            if obj.errcount > 0:
+                vstat.errors.append((obj.name, obj.errcount, set(obj.res_map.values())))
+
+        tl_vec.state.fallback |= tl_vec.unresolved()
+        changed += self.vector_propagate_siblings()
+        self.clear_ectx()
+        return changed
+
     def list_metric_groups(self):
         if not args.quiet:
             print("MetricGroups:")
@@ -3840,8 +4762,7 @@ class Runner(object):
                 self.olist = filternot(lambda obj:
                         safe_ref(obj, 'domain') in self.ectx.core_domains,
                         self.olist)
-                self._compute_cache_clear()
-                self._update_compute_cache_capacity()
+                self._compute_memo_clear()
             else:
                 rest = add_args(rest, "--percore-show-thread")
         return rest
@@ -3854,6 +4775,7 @@ def runner_restart(runner, offset):
     for o in runner.olist:
         o.group_map = {}
         o.res_map = {}
+        o.eval_plan = {}
     runner.filter_nodes()
     runner.collect()
     runner.set_ectx()
@@ -4151,6 +5073,12 @@ def handle_more_options(args):
             args.no_desc = True
         args.no_util = True
 
+    if args.summary_every is not None:
+        if args.summary_every <= 0:
+            sys.exit("--summary-every needs a positive number of intervals")
+        if not args.interval:
+            sys.exit("--summary-every needs -I")
+
 def tune_model(model):
     if args.tune_model:
         for t in args.tune_model:
@@ -4380,6 +5308,7 @@ def runner_emaps(pe, runner_list):
         else:
             typ = None
         emap = ocperf.find_emap(pmu=runner.pmu if runner.pmu else "cpu", typ=typ)
+        startup_phase("event list")
         if not emap:
             ocperf.ocverbose = True
             ocperf.find_emap()
@@ -4390,6 +5319,7 @@ def runner_emaps(pe, runner_list):
         if version:
             version += ", "
         version += model_setup(runner, cpu.cpu, pe, runner.kernel_version)
+        startup_phase("model setup")
         runner.clear_ectx()
     return version
 
@@ -4412,6 +5342,12 @@ def handle_misc_options(args, version):
     if args.gen_script:
         args.quiet = True
 
+    if args.vector_compute:
+        try:
+            import tl_vec # noqa
+        except ImportError:
+            sys.exit("--vector-compute needs numpy (pip install numpy)")
+
     if args.subset:
         if not args.import_:
             sys.exit("--subset requires --import mode")
@@ -4603,12 +5539,20 @@ def setup_cpus(args, rest, cpu, runner_list):
     return rest
 
 def init_output(args, version):
-    if args.json:
+    if args.json_compact and not args.json:
+        sys.exit("--json-compact needs --json")
+    if args.binary:
+        if args.csv or args.json or args.columns:
+            sys.exit("Cannot combine --binary with --csv, --json or --columns")
+        if not isinstance(args.output, str):
+            sys.exit("--binary needs an output file with -o")
+        out = tl_output.OutputBinary(args.output, args, version, cpu) # type: tl_output.Output
+    elif args.json:
         if args.csv:
             sys.exit("Cannot combine --csv with --json")
         if args.columns:
             sys.exit("Cannot combine --columns with --json")
-        out = tl_output.OutputJSON(args.output, args.csv, args, version, cpu) # type: tl_output.Output
+        out = tl_output.OutputJSON(args.output, args.csv, args, version, cpu)
     elif args.csv:
         if args.columns:
             out = tl_output.OutputColumnsCSV(args.output, args.csv, args, version, cpu)
@@ -4746,14 +5690,32 @@ def idle_range_list(l):
         l = [get_range(g) for k, g in groupby(enumerate(sorted([int(x) for x in l])), lambda x: x[0] - x[1])]
     return ",".join(l)
 
+startup_phases = [] # type: List[Tuple[str, float]]
+
+def startup_phase(name):
+    startup_phases.append((name, time.time()))
+
+def print_startup_profile():
+    if not args.startup_profile:
+        return
+    times = OrderedDict() # type: Dict[str, float]
+    prev = startup_begin
+    for name, t in startup_phases:
+        times[name] = times.get(name, 0.0) + t - prev
+        prev = t
+    print("startup profile:", file=sys.stderr)
+    for name, t in times.items():
+        print("%-25s %8.1fms" % (name, t * 1000.), file=sys.stderr)
+    print("%-25s %8.1fms" % ("total", (prev - startup_begin) * 1000.), file=sys.stderr)
+
 def finish_graph(graphp):
     if args.graph:
         args.output.close()
         graphp.wait()
 
 def main(args, rest, feat, env, cpu):
-    pversion = ocperf.PerfVersion()
-    handle_parallel(args, env)
+    pversion = ocperf.version
+    handle_parallel(args)
     rest = handle_rest(args, rest)
     open_output_files(args)
     update_args2(args)
@@ -4772,6 +5734,7 @@ def main(args, rest, feat, env, cpu):
     if len(runner_list) > 1 and (INAME or FUZZYINPUT):
         sys.exit("INAME and FUZZYINPUT do not support hybrid")
     handle_more_options(args)
+    startup_phase("option setup")
     version = runner_emaps(setup_pe(), runner_list)
     handle_misc_options(args, version)
     handle_cmd(args, runner_list, rest)
@@ -4779,6 +5742,7 @@ def main(args, rest, feat, env, cpu):
     rest = runner_filter(args, rest, runner_list)
     rest = update_smt(args, rest)
     runner_node_filter(runner_list)
+    startup_phase("node filter")
     global smt_mode
     orig_smt_mode = smt_mode
     smt_mode = update_smt_mode(runner_list)
@@ -4789,7 +5753,10 @@ def main(args, rest, feat, env, cpu):
         run_l1_parallel = True
     out = init_output(args, version)
     init_valcsv(out, args)
+    startup_phase("output setup")
     runner_first_init(args, runner_list)
+    startup_phase("scheduling")
+    print_startup_profile()
     if args.repl:
         import code
         code.interact(banner='toplev repl', local=locals())
@@ -4807,8 +5774,11 @@ def main(args, rest, feat, env, cpu):
 if __name__ == '__main__':
     # these are top level to avoid globals, which break the type checker
     # alternative would be to pass them everywhere, but that would be tedious
+    startup_phase("imports")
     args, rest_ = init_args()
+    startup_phase("argument parsing")
     feat = PerfFeatures(args)
+    startup_phase("perf features")
     ectx = EventContextBase() # only for type checker
     # allow tune to override toplevel without global
     if args.tune:
@@ -4818,4 +5788,5 @@ if __name__ == '__main__':
     update_args(args, env_)
     # XXX move into ectx
     cpu = tl_cpu.CPU(known_cpus, nocheck=event_nocheck(), env=env_)
+    startup_phase("cpu detection")
     main(args, rest_, feat, env_, cpu)